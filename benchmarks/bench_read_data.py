@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+"""
+bench_read_data.py
+==================
+
+Benchmarks the cost of ``NAFile.readData()`` as the data section grows.
+
+Synthetic FFI 1001 files are written with an increasing number of data lines
+and the time taken to read each one is reported per line. Reading should be
+linear in the number of lines so the per-line cost should stay roughly
+constant across sizes.
+
+Usage:
+
+    python benchmarks/bench_read_data.py
+    python benchmarks/bench_read_data.py --sizes 1000 100000 10000000 --engine numpy
+
+"""
+
+# Imports from python standard library
+import argparse
+import os
+import tempfile
+import time
+
+# Imports from nappy package
+import nappy
+import nappy.na_file.na_file
+
+
+default_sizes = (1000, 10000, 100000, 1000000)
+
+header_template = """%(nlhead)d 1001
+Benchmark
+Benchmark
+Benchmark
+Benchmark
+1 1
+2020 1 1 2020 1 1
+1.0
+Time (seconds)
+%(nv)d
+%(vscal)s
+%(vmiss)s
+%(vname)s
+0
+0
+"""
+
+
+def writeSyntheticFile(path, nlines, nv=3):
+    """
+    Writes a FFI 1001 file with ``nlines`` lines of data and ``nv`` variables.
+    """
+    vname = "\n".join(["Variable %d (units)" % n for n in range(nv)])
+    header = header_template % {"nlhead": 14 + nv, "nv": nv,
+                                "vscal": " ".join(["1"] * nv),
+                                "vmiss": " ".join(["-9999"] * nv),
+                                "vname": vname}
+
+    row_format = "%d" + " %.3f" * nv + "\n"
+    block = 100000
+
+    with open(path, "w") as fout:
+        fout.write(header)
+
+        for start in range(0, nlines, block):
+            end = min(start + block, nlines)
+            fout.write("".join([row_format % ((m,) + (m * 0.5,) * nv) for m in range(start, end)]))
+
+
+def timeReadData(path, engine, repeats):
+    """
+    Returns the best time (in seconds) taken to read the data section of ``path``.
+    """
+    best = None
+
+    for i in range(repeats):
+        fin = nappy.openNAFile(path)
+        start = time.perf_counter()
+        fin.readData(engine=engine)
+        elapsed = time.perf_counter() - start
+        fin.close()
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=default_sizes,
+                        help="Numbers of data lines to benchmark.")
+    parser.add_argument("--engine", default="python", choices=nappy.na_file.na_file.data_engines,
+                        help="Data engine passed to readData().")
+    parser.add_argument("--repeats", type=int, default=3, help="Number of timed reads per size.")
+    args = parser.parse_args()
+
+    print("%12s %12s %16s" % ("lines", "seconds", "microsec/line"))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for nlines in args.sizes:
+            path = os.path.join(tmpdir, "bench_%d.na" % nlines)
+            writeSyntheticFile(path, nlines)
+            elapsed = timeReadData(path, args.engine, args.repeats)
+            print("%12d %12.3f %16.3f" % (nlines, elapsed, elapsed / nlines * 1e6))
+            os.remove(path)
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+
+"""
+bench_write_data.py
+===================
+
+Benchmarks the formatting of data values written to NASA Ames files.
+
+Compares formatting values one at a time with ``self.format % value`` (as
+``NAFile1001.writeData`` and ``RecursiveListManipulator.writeLines`` used to)
+against the bulk formatting in ``nappy.utils.text_writer``, with the default
+float format, with "%.17g" (which, like the "shortest" float format, reads
+back exactly) and with the "shortest" float format. It reports the time
+taken and the size of the text written.
+
+Usage:
+
+    python benchmarks/bench_write_data.py
+    python benchmarks/bench_write_data.py --rows 5000000 --values rounded
+
+"""
+
+# Imports from python standard library
+import argparse
+import time
+
+# Imports from nappy package
+import nappy.utils.common_utils
+import nappy.utils.text_writer
+
+default_delimiter = nappy.utils.common_utils.getDefault("default_delimiter")
+default_float_format = nappy.utils.common_utils.getDefault("default_float_format")
+exact_float_format = "%.17g"
+
+
+def makeValues(nrows, ncolumns, values):
+    """
+    Returns ``ncolumns`` lists of ``nrows`` values: "random" full precision
+    floats, floats "rounded" to 2 decimal places or "whole" numbers.
+    """
+    # Import numpy here so that pip install works without error
+    import numpy as np
+
+    rng = np.random.RandomState(0)
+    columns = [np.arange(nrows, dtype=float)]
+
+    for n in range(ncolumns - 1):
+        column = rng.rand(nrows) * 1000
+        if values == "rounded":
+            column = column.round(2)
+        elif values == "whole":
+            column = column.round()
+        columns.append(column)
+
+    return [column.tolist() for column in columns]
+
+
+def formatRowsOneByOne(columns, float_format, delimiter):
+    """
+    Formats rows one value at a time as NAFile1001.writeData used to.
+    """
+    fmt = float_format + delimiter
+    lines = []
+
+    for m in range(len(columns[0])):
+        var_string = fmt % columns[0][m]
+        for column in columns[1:]:
+            var_string = var_string + (fmt % column[m])
+        lines.append("%s\n" % var_string.rstrip(" ,"))
+
+    return "".join(lines)
+
+
+def formatRowsInBlocks(columns, float_format, delimiter):
+    """
+    Formats rows a block at a time as NAFile1001.writeData now does.
+    """
+    line_formats = [(nappy.utils.text_writer.getValueFormat(float_format) + delimiter) * len(columns)]
+    return "".join([nappy.utils.text_writer.formatRecords(block, line_formats, delimiter, float_format=float_format)
+                    for block in nappy.utils.text_writer.getRowBlocks(columns)])
+
+
+def formatGridOneByOne(columns, float_format, delimiter):
+    """
+    Formats each column as a line of values one at a time as
+    RecursiveListManipulator.writeLines used to.
+    """
+    fmt = float_format + delimiter
+    lines = []
+
+    for column in columns:
+        var_string = ""
+        for value in column:
+            var_string = var_string + (fmt % value)
+        lines.append("%s\n" % var_string.rstrip(" ,"))
+
+    return "".join(lines)
+
+
+def formatGridInBulk(columns, float_format, delimiter):
+    """
+    Formats each column as a line of values in one go as
+    RecursiveListManipulator.writeLines now does.
+    """
+    return "".join([nappy.utils.text_writer.formatValues(column, float_format, delimiter) for column in columns])
+
+
+def timeFormatter(formatter, columns, float_format, delimiter, repeats):
+    """
+    Returns the best time (in seconds) taken by ``formatter`` and the length of its output.
+    """
+    best = None
+
+    for i in range(repeats):
+        start = time.perf_counter()
+        text = formatter(columns, float_format, delimiter)
+        elapsed = time.perf_counter() - start
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best, len(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000, help="Number of data rows to format.")
+    parser.add_argument("--columns", type=int, default=4, help="Number of values in each row.")
+    parser.add_argument("--values", default="random", choices=("random", "rounded", "whole"),
+                        help="Kind of values to format.")
+    parser.add_argument("--repeats", type=int, default=3, help="Number of timed runs of each formatter.")
+    args = parser.parse_args()
+
+    columns = makeValues(args.rows, args.columns, args.values)
+    nvalues = args.rows * args.columns
+
+    cases = (("rows one by one", formatRowsOneByOne, default_float_format),
+             ("rows in blocks", formatRowsInBlocks, default_float_format),
+             ("rows in blocks", formatRowsInBlocks, exact_float_format),
+             ("rows in blocks", formatRowsInBlocks, nappy.utils.text_writer.shortest_float_format),
+             ("grid one by one", formatGridOneByOne, default_float_format),
+             ("grid in bulk", formatGridInBulk, default_float_format),
+             ("grid in bulk", formatGridInBulk, exact_float_format),
+             ("grid in bulk", formatGridInBulk, nappy.utils.text_writer.shortest_float_format))
+
+    print("%-16s %-10s %10s %14s %10s" % ("formatter", "format", "seconds", "nanosec/value", "MB"))
+
+    for (name, formatter, float_format) in cases:
+        elapsed, size = timeFormatter(formatter, columns, float_format, default_delimiter, args.repeats)
+        print("%-16s %-10s %10.3f %14.1f %10.1f" % (name, float_format, elapsed,
+                                                    elapsed / nvalues * 1e9, size / 1e6))
+
+
+if __name__ == "__main__":
+
+    main()
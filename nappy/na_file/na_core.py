@@ -17,6 +17,9 @@ for accessing metadata within the file.
 import copy
 import re
 
+# Imports from local package
+import nappy.utils.data_array
+
 
 class NACore:
     """
@@ -93,14 +96,20 @@ class NACore:
         self._var_and_units_pattern = new_pattern
 
 
-    def getNADict(self):
+    def getNADict(self, as_lists=True):
         """
-        Returns a dictionary of the contents of a NASA Ames file.
+        Returns a dictionary of the contents of a NASA Ames file. Any data
+        held in FloatArrays or numpy arrays are converted to lists in the
+        dictionary (but not in the NACore) so that it only holds standard
+        python types, unless 'as_lists' is False.
         """
         dct = {}
         for key in NACore.na_dictionary_keys:
             dct[key] = getattr(self, key)
 
+            if as_lists and key in ("X", "V", "A"):
+                dct[key] = nappy.utils.data_array.asLists(dct[key])
+
         self.na_dict = {}
 
         for key in dct:
@@ -189,6 +198,42 @@ class NACore:
         return avars
 
 
+    def getVariableValues(self, var_number, in_place=False):
+        """
+        Returns the values of a variable as a NumPy array of physical values:
+        the scale factor is applied and missing values are set to NaN, in a
+        single pass over a copy of the data. If 'in_place' is True the stored
+        values are converted where they are (without a copy where possible)
+        and replaced by the result.
+        """
+        (variable, units, miss, scale) = self.getVariable(var_number)
+        values = _getPhysicalValues(self.V[var_number], miss, scale, in_place)
+
+        if in_place:
+            self.V[var_number] = values
+        return values
+
+
+    def getAuxVariableValues(self, avar_number, in_place=False):
+        """
+        Returns the values of an auxiliary variable as a NumPy array of physical
+        values (see 'getVariableValues'). The values of character auxiliary
+        variables are returned unchanged.
+        """
+        (variable, units, miss, scale) = self.getAuxVariable(avar_number)
+
+        if scale is None:
+            # Import numpy here so that pip install works without error
+            import numpy as np
+            return np.array(self.A[avar_number])
+
+        values = _getPhysicalValues(self.A[avar_number], miss, scale, in_place)
+
+        if in_place:
+            self.A[avar_number] = values
+        return values
+
+
     def getMissingValue(self, var_number):
         """
         Returns a missing value for a given variable.
@@ -293,3 +338,29 @@ class NACore:
         Returns the Special Comments (SCOM) lines.
         """
         return self.SCOM
+
+
+def _getPhysicalValues(values, miss, scale, in_place=False):
+    """
+    Returns 'values' as a float array multiplied by 'scale' with the items
+    equal to 'miss' (in the unscaled values) set to NaN. The array shares
+    memory with 'values' if 'in_place' is True and it holds floats already.
+    """
+    # Import numpy here so that pip install works without error
+    import numpy as np
+
+    if in_place:
+        array = np.asarray(values, dtype=float)
+    else:
+        array = np.array(values, dtype=float)
+
+    if miss is not None:
+        missing = (array == miss)
+
+    if scale is not None and scale != 1:
+        np.multiply(array, scale, out=array)
+
+    if miss is not None:
+        array[missing] = np.nan
+
+    return array
@@ -14,23 +14,33 @@ for individual FFIs. Each FFI class is held in an individual file.
 # 08/05/04 updated by selatham for bug fixes and new write methods
 
 # Imports from python standard library
+import os
 import sys
 import time
 import re
+import mmap
+import io
+import logging
 from io import StringIO
 
 # Imports from nappy package
 import nappy.na_file.na_core
+import nappy.na_file.record_index
+import nappy.utils.data_cache
 import nappy.utils.text_parser
+import nappy.utils.text_writer
 import nappy.utils.common_utils
 
 default_delimiter = nappy.utils.getDefault("default_delimiter")
 default_float_format = nappy.utils.getDefault("default_float_format")
+data_engines = ("python", "numpy")
 getAnnotation = nappy.utils.common_utils.getAnnotation
 wrapLine = nappy.utils.common_utils.annotateLine
 wrapLines = nappy.utils.common_utils.annotateLines
 stripQuotes = nappy.utils.common_utils.stripQuotes
 
+log = logging.getLogger(__name__)
+
 
 class NAFile(nappy.na_file.na_core.NACore):
     """
@@ -53,24 +63,71 @@ class NAFile(nappy.na_file.na_core.NACore):
     """
 
     def __init__(self, filename, ignore_header_lines=0, mode="r", na_dict=None,
-                 var_and_units_callback=None):
+                 var_and_units_callback=None, use_mmap=False, file_handle=None,
+                 cache_dir=None, cache_size=None, compression=None, atomic=False):
         """
         Initialization of class, decides if user wishes to read or write
         NASA Ames file.
+        If use_mmap is True then the data section is read through a memory map.
+        If 'file_handle' is given it is used instead of opening 'filename' again.
+        If 'cache_dir' is given then the parsed header and data are kept in a
+        cache in that directory (limited to 'cache_size' bytes) and read from
+        it the next time the file is opened, as long as it has not changed.
+        In read mode 'filename' can also be a binary or text file-like object
+        (e.g. io.BytesIO or a pipe). Its content is read once into memory and
+        'self.filename' is set to None.
+        In write mode the output is compressed if 'compression' is "gzip", "bz2"
+        or "xz", or if 'filename' ends with ".gz", ".bz2" or ".xz". If 'atomic'
+        is True the output is written to a temporary file that only replaces
+        'filename' when the file is closed after all of it has been written.
         """
         nappy.na_file.na_core.NACore.__init__(self)
+
+        # Content of a file-like object that the file is read from
+        self._data_buffer = None
+        if mode == "r" and hasattr(filename, "read"):
+            self._data_buffer = nappy.utils.common_utils.readStream(filename)
+            filename = None
+        elif filename is not None:
+            # Allow paths such as pathlib.Path objects
+            filename = os.fspath(filename)
+
         self.filename = filename
-        self._open(mode)
+        self.compression = None
+
+        # Path that is written to in write mode (a temporary file if writing atomically)
+        self.output_path = None
+        if mode == "w":
+            self.compression = nappy.utils.common_utils.getOutputCompression(filename, compression)
+            self.output_path = filename
+            if atomic:
+                self.output_path = nappy.utils.common_utils.getTempFileName(filename)
+
+        self._open(mode, file_handle)
 
         self.mode = mode
         self.ignore_header_lines = ignore_header_lines
         self.ignored_header_lines = []
         self.na_dict = na_dict or {}
         self.var_and_units_callback = var_and_units_callback
+        self.use_mmap = use_mmap
+        self.record_index = None
+        self.data_cache = None
+        self._header_items = None
+
+        # Position reached by the last full read of the data section (see readNewData)
+        self._data_end_offset = None
+        self._data_record_count = 0
+        self._data_selection = (None, None)
+
+        if cache_dir is not None and self.filename is not None:
+            self.data_cache = nappy.utils.data_cache.NADataCache(cache_dir, cache_size)
 
         if self.mode == "r":
+            self.compression = nappy.utils.common_utils.getStreamCompression(self.file)
             self._normalized_X = True
-            self.readHeader()
+            self._readHeaderWithCache()
+            self._loadRecordIndex()
         elif self.mode == "w":
             # Self flag to check if data written
             self.data_written = False
@@ -84,11 +141,34 @@ class NAFile(nappy.na_file.na_core.NACore):
         self.close()
 
     def __del__(self):
-        self.close()
+        # The file is not open if the instance could not be set up
+        if getattr(self, "is_open", False):
+            self.close()
+
+    def _readHeaderWithCache(self):
+        """
+        Reads the header from the data cache if it holds an entry for this file,
+        otherwise reads it from the file.
+        """
+        if self.data_cache is not None:
+            self._header_items = self.data_cache.loadHeader(self)
+
+            if self._header_items is not None:
+                return
+
+        self.readHeader()
+
+        if self.data_cache is not None:
+            self._header_items = self.data_cache.getHeaderItems(self)
 
-    def _open(self, mode):
-        "Wrapper to builtin open file function."
-        self.file = open(self.filename, mode)
+    def _open(self, mode, file_handle=None):
+        "Wrapper to builtin open file function (unless 'file_handle' is already open)."
+        if file_handle is None and self._data_buffer is not None:
+            file_handle = io.TextIOWrapper(io.BytesIO(self._data_buffer),
+                                           encoding=nappy.utils.text_parser.default_encoding)
+
+        self.file = file_handle or nappy.utils.common_utils.openFile(self.output_path or self.filename,
+                                                                     mode, self.compression)
         self.is_open = True
 
     def write(self, delimiter=default_delimiter, float_format=default_float_format,
@@ -98,10 +178,28 @@ class NAFile(nappy.na_file.na_core.NACore):
         being buffered.
         If annotation is True then add annotation column to left of file.
         If no_header is True then suppress writing the header and only write the data section. 
+        If float_format is "shortest" then each value is written with the fewest digits
+        that read back as exactly the same value.
         """ 
+        self._prepareToWrite(delimiter, float_format, annotation)
+
+        if not no_header:
+            self.writeHeader()
+
+        self.writeData()
+        self.file.flush()
+        
+        # Set flag to make sure cannot try and write more data
+        self.data_written = True
+         
+    def _prepareToWrite(self, delimiter, float_format, annotation):
+        """
+        Sets the output format, checks that the file can be written to and
+        parses the na_dict ready to write the header and data.
+        """
         self.delimiter = delimiter
         self.float_format = float_format
-        self.format = float_format + delimiter
+        self.format = nappy.utils.text_writer.getValueFormat(float_format) + delimiter
         self.annotation = annotation
         
         # Raise errors if dangerous behaviour
@@ -114,24 +212,27 @@ class NAFile(nappy.na_file.na_core.NACore):
         if not self.is_open:
             raise Exception("WARNING: NASA Ames file instance is closed and cannot be written to.")
    
-        # Parse na_dict then write header and data
+        # Parse na_dict ready to write header and data
         self._parseDictionary()
         self.header = StringIO()
 
-        if not no_header:
-            self.writeHeader()
-
-        self.writeData()
-        self.file.flush()
-        
-        # Set flag to make sure cannot try and write more data
-        self.data_written = True
-         
     def close(self):
-        "Wrapper to builtin close file function."
+        """
+        Wrapper to builtin close file function. When writing atomically, the
+        temporary file replaces the output file if all the data has been
+        written, otherwise it is deleted.
+        """
         self.file.close()
         self.is_open = False
 
+        if self.output_path is not None and self.output_path != self.filename:
+            if self.data_written:
+                os.replace(self.output_path, self.filename)
+            elif os.path.exists(self.output_path):
+                os.remove(self.output_path)
+
+            self.output_path = self.filename
+
     def _parseDictionary(self):
         """
         Parser for the optional na_dict argument containing a dictionary
@@ -325,25 +426,604 @@ class NAFile(nappy.na_file.na_core.NACore):
         self.NCOM = self._readLines(self.NNCOML)
         return self.NCOM
 
-    def readData(self):
+    def readData(self, engine="python", variables=None, aux_variables=None, x_range=None,
+                 cache_dir=None):
         """
         Reads the data section of the file. This method actually calls a number
         of FFI specific methods to setup the data arrays (lists of lists) and
         read the various data sections.
 
+        The 'engine' argument selects the parser used for the data section:
+        "python" (default) reads each record item by item; "numpy" reads the
+        whole data section into a 2-D float array in one pass and sets X, V
+        and A as NumPy columns of that array (FFIs 1001, 1010, 1020, 2010, 3010
+        and 4010 only).
+
+        The 'variables' and 'aux_variables' arguments can be lists of variable
+        numbers or names (from VNAME and ANAME) to read. Only the values of these
+        variables are converted and stored, the lists for all other variables
+        in V and A are left empty. By default all variables are read.
+
+        The 'x_range' argument can be a (start, end) tuple to only read the
+        records whose value of the unbounded independent variable lies between
+        start and end (inclusive). The records are found with a binary search
+        if a record index is available, otherwise the file is scanned up to the
+        end of the range (the independent variable must be monotonic).
+
+        If 'cache_dir' is given (or was given when the file was opened) then
+        the data are read from the cache in that directory when it holds the
+        selected variables, and are added to it otherwise. The cache is only
+        used by the "python" engine when 'x_range' is not set.
+
         This method can be called directly by the user.
         """
+        if engine not in data_engines:
+            raise Exception("Unknown data engine '%s'. Must be one of: %s." % (engine, ", ".join(data_engines)))
+
+        if cache_dir is not None:
+            self.data_cache = nappy.utils.data_cache.NADataCache(cache_dir)
+
+        use_cache = self.data_cache is not None and engine == "python" and x_range is None
+
+        if use_cache and self._header_items is None:
+            self._header_items = self.data_cache.getHeaderItems(self)
+
+        (start_offset, end_offset, nrecords) = (None, None, None)
+        if x_range is not None:
+            (start_offset, end_offset, nrecords) = self._findRecordRange(x_range)
+
+        self._selectVariables(variables, aux_variables)
+        self._data_selection = (self._variable_numbers, self._aux_variable_numbers)
+        self._data_end_offset = None
+
+        if use_cache and self.data_cache.loadData(self):
+            return
+
         self._setupArrays()
 
-        with open(self.filename) as fh:
-            datalines = fh.readlines()[self.NLHEAD:]
+        if nrecords == 0:
+            return
+
+        (fh, offset) = self._openDataSection(start_offset)
+
+        with fh:
+            if engine == "numpy":
+                if end_offset is None:
+                    data = fh.read()
+                else:
+                    data = fh.read(end_offset - offset)
+
+                datalines = data.decode(nappy.utils.text_parser.default_encoding).splitlines(True)
+                self._readDataArray(self._checkForBlankLines(datalines))
+
+                if x_range is None:
+                    self._data_end_offset = offset + len(data)
+                    self._data_record_count = len(self._getUnboundedX())
+                return
+
+            # Read records one at a time through a cursor that moves along the lines
+            datalines = nappy.utils.text_parser.StreamCursor(fh, offset)
+            nrecords = self._readRecords(datalines, nrecords=nrecords)
+
+        self._finishRecordArrays()
+
+        if x_range is None:
+            self._data_end_offset = datalines.offset
+            self._data_record_count = nrecords
+
+        if use_cache:
+            self.data_cache.save(self, self._header_items)
+
+    def readNewData(self):
+        """
+        Reads the records that have been appended to the file since the data
+        section was last read by 'readData' or 'readNewData' and adds them to
+        the end of the data arrays, so only the new part of the file is parsed.
+
+        Only complete records are read: a record (or line) that is still being
+        written at the end of the file is left to be read by a later call.
+        If the data were last read up to a line without a line ending, the line
+        ending added after it is skipped. The variables selected in the last
+        call to 'readData' are read. If the data section has not been read in
+        full before (e.g. it was read with 'x_range' or from the cache) then
+        all the records are read again.
+
+        Returns the number of new records.
+
+        This method can be called directly by the user.
+        """
+        self._selectVariables(*self._data_selection)
+
+        if self._data_end_offset is None:
+            # Start again from the beginning of the data section
+            (saved, self._data_record_count) = (None, 0)
+        else:
+            saved = self._saveRecordArrays()
+
+        try:
+            self._setupArrays()
+            resume_offset = self._data_end_offset
+
+            if resume_offset is not None:
+                # Start on the last byte read to check that it ended a line
+                resume_offset = resume_offset - 1
+
+            (fh, offset) = self._openDataSection(resume_offset)
+
+            with fh:
+                if resume_offset is not None:
+                    # A last line read without a line ending can only have been completed by one since
+                    if fh.read(1) != b"\n" and fh.readline().strip():
+                        raise Exception("The last line read from the data section has been extended since: "
+                                        "use 'readData' to read the data section again.")
+                    offset = fh.tell()
+
+                datalines = nappy.utils.text_parser.StreamCursor(fh, offset, complete_lines=True)
+                offsets = []
+
+                try:
+                    self._readRecords(datalines, offsets=offsets)
+                    end_offset = datalines.offset
+                except EOFError:
+                    # The last record is incomplete so read again up to the start of it
+                    end_offset = offsets.pop()
+                    self._setupArrays()
+                    fh.seek(offset)
+                    self._readRecords(nappy.utils.text_parser.StreamCursor(fh, offset), nrecords=len(offsets))
+
+            self._finishRecordArrays()
+        except Exception:
+            # Leave the records that were already read as they were
+            if saved is not None:
+                self._restoreRecordArrays(saved)
+            raise
+
+        if saved is not None:
+            self._appendRecordArrays(saved)
+
+        if offsets:
+            # An index built earlier does not include the new records
+            self.record_index = None
+
+        self._data_end_offset = end_offset
+        self._data_record_count = self._data_record_count + len(offsets)
+        return len(offsets)
+
+    def iterRecords(self, chunk_size=1000, variables=None, aux_variables=None):
+        """
+        Generator that reads the data section and yields batches of up to
+        'chunk_size' records. Each batch is a dictionary of the "X", "V" and "A"
+        items laid out as they would be in the na_dict after 'readData', but
+        only holding the records in the batch.
+
+        The file is read line by line so memory use depends on 'chunk_size'
+        rather than the size of the file. The X, V and A attributes of this
+        object are restored when the iteration finishes.
+
+        The 'variables' and 'aux_variables' arguments select variables as for 'readData'.
+        """
+        if chunk_size < 1:
+            raise Exception("The 'chunk_size' argument must be a positive integer.")
+
+        self._selectVariables(variables, aux_variables)
+        saved = self._saveRecordArrays()
+
+        try:
+            (fh, offset) = self._openDataSection()
+
+            with fh:
+                datalines = nappy.utils.text_parser.StreamCursor(fh, offset)
+
+                while not datalines.atEnd():
+                    self._setupArrays()
+                    self._readRecords(datalines, nrecords=chunk_size)
+                    self._finishRecordArrays()
+                    yield {"X": self.X, "V": self.V, "A": self.A}
+        finally:
+            self._restoreRecordArrays(saved)
+
+    def buildRecordIndex(self, chunk_size=1000, save=False):
+        """
+        Scans the data section once and records the byte offset at which each
+        record starts, and its value of the unbounded independent variable.
+        The RecordIndex is stored as 'self.record_index' and returned. Records
+        are parsed in batches of 'chunk_size' so memory use stays bounded.
+
+        If 'save' is True the index is also written to a sidecar file (the file
+        name plus ".naidx") which is loaded automatically when the file is next
+        opened, as long as the file has not changed since.
+        """
+        if save and self.filename is None:
+            raise Exception("Cannot save the record index of a file that was not read from a path.")
+
+        index = nappy.na_file.record_index.RecordIndex(nlhead=self.NLHEAD)
+        if self.filename is not None:
+            index.setFileStats(self.filename)
+
+        # Only the independent variable is needed so no variables are converted
+        self._selectVariables([], [])
+        saved = self._saveRecordArrays()
+
+        try:
+            (fh, offset) = self._openDataSection()
+
+            with fh:
+                datalines = nappy.utils.text_parser.StreamCursor(fh, offset)
+
+                while not datalines.atEnd():
+                    self._setupArrays()
+                    offsets = []
+                    self._readRecords(datalines, nrecords=chunk_size, offsets=offsets)
+
+                    for offset, x in zip(offsets, self._getUnboundedX()):
+                        index.append(offset, x)
+
+                index.end_offset = datalines.offset
+        finally:
+            self._restoreRecordArrays(saved)
+
+        if save:
+            index.write(nappy.na_file.record_index.getIndexFileName(self.filename))
+
+        self.record_index = index
+        return index
+
+    def _loadRecordIndex(self):
+        """
+        Loads the record index from the sidecar file if one exists and is still
+        valid for this file. Otherwise the record index is left unset.
+        """
+        if self.filename is None:
+            return
+
+        index_file = nappy.na_file.record_index.getIndexFileName(self.filename)
 
-        datalines = self._checkForBlankLines(datalines)
+        if not os.path.isfile(index_file):
+            return
 
+        try:
+            index = nappy.na_file.record_index.readRecordIndex(index_file)
+        except Exception as err:
+            log.debug("Could not read record index file '%s': %s" % (index_file, err))
+            return
+
+        if index.isValidFor(self.filename, self.NLHEAD):
+            self.record_index = index
+        else:
+            log.debug("Ignoring out of date record index file: %s" % index_file)
+
+    def readRecords(self, start, end=None, variables=None, aux_variables=None):
+        """
+        Reads the records from number 'start' up to (but not including) 'end'
+        and returns them in a dictionary of "X", "V" and "A" items, laid out
+        as for 'iterRecords'. If 'end' is not given only record 'start' is read.
+
+        The record index (built on first use) is used to go straight to the
+        first record so earlier records are not parsed again. The X, V and A
+        attributes of this object are left unchanged.
+
+        The 'variables' and 'aux_variables' arguments select variables as for 'readData'.
+        """
+        if self.record_index is None:
+            self.buildRecordIndex()
+
+        self._selectVariables(variables, aux_variables)
+
+        if end is None:
+            end = start + 1
+
+        nrecords = len(self.record_index)
+        if not 0 <= start <= end <= nrecords:
+            raise Exception("Record range (%s, %s) is outside the %s records in the file." % (start, end, nrecords))
+
+        saved = self._saveRecordArrays()
+
+        try:
+            self._readRecordsAt(self.record_index.getOffset(start), end - start)
+            return {"X": self.X, "V": self.V, "A": self.A}
+        finally:
+            self._restoreRecordArrays(saved)
+
+    def readDataAt(self, offset, nrecords, variables=None, aux_variables=None):
+        """
+        Reads 'nrecords' records starting at byte 'offset' of the file (which
+        must be the start of a record, e.g. from the offsets of the record index)
+        into the data arrays, replacing any records read before. This allows a
+        part of the file to be read without scanning the records before it.
+
+        The 'variables' and 'aux_variables' arguments select variables as for 'readData'.
+
+        This method can be called directly by the user.
+        """
+        self._selectVariables(variables, aux_variables)
+        self._data_selection = (self._variable_numbers, self._aux_variable_numbers)
+        self._data_end_offset = None
+        self._readRecordsAt(offset, nrecords)
+
+    def _readRecordsAt(self, offset, nrecords):
+        """
+        Sets up the data arrays and reads 'nrecords' records into them starting
+        at byte 'offset' of the file.
+        """
+        self._setupArrays()
+
+        if nrecords > 0:
+            (fh, offset) = self._openDataSection(offset)
+
+            with fh:
+                datalines = nappy.utils.text_parser.StreamCursor(fh, offset)
+                self._readRecords(datalines, nrecords=nrecords)
+
+        self._finishRecordArrays()
+
+    def readRecord(self, record, variables=None, aux_variables=None):
+        """
+        Reads a single record and returns it as a dictionary (see 'readRecords').
+        """
+        return self.readRecords(record, record + 1, variables=variables, aux_variables=aux_variables)
+
+    def scanDataSection(self, sample_size=10):
+        """
+        Returns a dictionary describing the data section without reading all of
+        it. The "data_size" item is its size in bytes and "record_count" is the
+        number of records. The count comes from the record index if there is
+        one, otherwise it is estimated from the size of the first 'sample_size'
+        records, or counted by reading all of them if 'sample_size' is None
+        ("record_count_exact" is False if the count is an estimate).
+        The sizes of compressed files are uncompressed sizes: the rest of the
+        file is decompressed, but not parsed, to find the size of the data section.
+        """
+        if self.record_index is not None:
+            nrecords = len(self.record_index)
+            data_end = self.record_index.getOffset(nrecords)
+            if self.compression is None:
+                data_end = self._getDataSize()
+
+            data_size = data_end - self.record_index.getOffset(0)
+            return {"data_size": data_size, "record_count": nrecords, "record_count_exact": True}
+
+        self._selectVariables([], [])
+        saved = self._saveRecordArrays()
+
+        try:
+            (fh, start_offset) = self._openDataSection()
+
+            with fh:
+                datalines = nappy.utils.text_parser.StreamCursor(fh, start_offset)
+                self._setupArrays()
+                nrecords = self._readRecords(datalines, nrecords=sample_size)
+                exact = datalines.atEnd()
+                sample_bytes = datalines.offset - start_offset
+
+                if self.compression is not None:
+                    while fh.read(1024 * 1024):
+                        pass
+                    data_end = fh.tell()
+        finally:
+            self._restoreRecordArrays(saved)
+
+        if self.compression is None:
+            data_end = self._getDataSize()
+
+        data_size = data_end - start_offset
+
+        if not exact and sample_bytes > 0:
+            nrecords = int(round(nrecords * data_size / float(sample_bytes)))
+
+        return {"data_size": data_size, "record_count": nrecords, "record_count_exact": exact}
+
+    def _readRecords(self, datalines, nrecords=None, offsets=None):
+        """
+        Reads up to 'nrecords' records (or all remaining records if None) from
+        the 'datalines' cursor into the data arrays. If an 'offsets' list is
+        given then the byte offset of the start of each record is appended to it.
+        Returns the number of records read.
+        """
         # Set up loop over unbounded indpendent variable
         m = 0   # Unbounded independent variable mark        
-        while len(datalines) > 0:
+        while not datalines.atEnd() and (nrecords is None or m < nrecords):
+            if offsets is not None:
+                offsets.append(datalines.offset)
+
             datalines = self._readData1(datalines, m)
             datalines = self._readData2(datalines, m)
             m = m + 1
 
+        return m
+
+    def _findRecordRange(self, x_range, chunk_size=100):
+        """
+        Returns a tuple of (start_offset, end_offset, nrecords) giving the byte
+        offsets of the first record whose value of the unbounded independent
+        variable is inside 'x_range' and of the end of the last one, and the
+        number of records in between. The record index is used if it exists,
+        otherwise records are scanned (in batches of 'chunk_size', without
+        converting any variables) until the values pass the end of the range.
+        """
+        if self.record_index is not None:
+            (start, end) = self.record_index.findRecordRange(x_range)
+            return (self.record_index.getOffset(start), self.record_index.getOffset(end), end - start)
+
+        (low, high) = (min(x_range), max(x_range))
+        (start_offset, end_offset, nrecords) = (None, None, 0)
+        previous_x = None
+
+        self._selectVariables([], [])
+        saved = self._saveRecordArrays()
+
+        try:
+            (fh, offset) = self._openDataSection()
+
+            with fh:
+                datalines = nappy.utils.text_parser.StreamCursor(fh, offset)
+
+                while end_offset is None and not datalines.atEnd():
+                    self._setupArrays()
+                    offsets = []
+                    self._readRecords(datalines, nrecords=chunk_size, offsets=offsets)
+
+                    for (offset, x) in zip(offsets, self._getUnboundedX()):
+                        if low <= x <= high:
+                            if start_offset is None:
+                                start_offset = offset
+                            nrecords = nrecords + 1
+                        elif start_offset is not None:
+                            # Monotonic values cannot come back into the range
+                            end_offset = offset
+                        elif previous_x is not None and (x > high >= previous_x or x < low <= previous_x):
+                            # Stepped over the range without any records inside it
+                            end_offset = offset
+
+                        if end_offset is not None:
+                            break
+                        previous_x = x
+
+                if end_offset is None:
+                    end_offset = datalines.offset
+        finally:
+            self._restoreRecordArrays(saved)
+
+        if start_offset is None:
+            start_offset = end_offset
+        return (start_offset, end_offset, nrecords)
+
+    def _selectVariables(self, variables=None, aux_variables=None):
+        """
+        Sets the numbers of the variables and auxiliary variables whose values
+        are stored when records are read. Each selection is either None (all
+        variables) or a list of variable numbers or names.
+        """
+        self._variable_numbers = self._getVariableNumbers(variables, self.VNAME, self.NV)
+        self._aux_variable_numbers = self._getVariableNumbers(aux_variables, self.ANAME, self.NAUXV or 0)
+
+    def _getVariableNumbers(self, selection, names, count):
+        """
+        Returns a sorted list of the variable numbers in 'selection', where each
+        item is a variable number or a name in 'names'. All 'count' variables
+        are returned if 'selection' is None or "all".
+        """
+        if selection is None or selection == "all":
+            return list(range(count))
+
+        numbers = set()
+
+        for item in selection:
+            if isinstance(item, int) or re.match(r"^\d+$", str(item)):
+                number = int(item)
+            elif names and item in names:
+                number = names.index(item)
+            else:
+                raise Exception("Variable name not known: %s" % item)
+
+            if not 0 <= number < count:
+                raise Exception("Variable number out of range: %s" % number)
+            numbers.add(number)
+
+        return sorted(numbers)
+
+    def _getUnboundedX(self):
+        """
+        Returns the list of values of the unbounded independent variable that
+        have been read into the data arrays (one per record).
+        """
+        return self.X
+
+    def _finishRecordArrays(self):
+        """
+        Converts the data arrays into their final form once all the records
+        have been read. Does nothing by default.
+        """
+        pass
+
+    def _appendRecordArrays(self, saved):
+        """
+        Adds the records held in the data arrays to the end of the arrays in
+        'saved' (as returned by '_saveRecordArrays') and sets the results as
+        the data arrays.
+        """
+        self.X = self._joinRecords(saved["X"], self.X)
+        self.V = [self._joinRecords(old, new) for (old, new) in zip(saved["V"], self.V)]
+
+        if self.A is not saved["A"]:
+            self.A = [self._joinRecords(old, new) for (old, new) in zip(saved["A"], self.A)]
+
+        for key in ("NX", "DX"):
+            setattr(self, key, self._joinRecords(saved[key], getattr(self, key)))
+
+    def _joinRecords(self, old, new):
+        """
+        Returns the records in 'new' added to the end of those in 'old'. Lists
+        and FloatArrays are extended in place and NumPy arrays are joined along
+        their first axis.
+        """
+        if new is old:
+            return old
+
+        if hasattr(old, "extend"):
+            old.extend(new)
+            return old
+
+        # Import numpy here so that pip install works without error
+        import numpy as np
+
+        new = np.asarray(new, dtype=old.dtype).reshape((-1,) + old.shape[1:])
+        return np.concatenate([old, new])
+
+    def _saveRecordArrays(self):
+        """
+        Returns a dictionary of the attributes that are filled as records are read.
+        """
+        saved = {}
+        for key in ("X", "V", "A", "NX", "DX"):
+            saved[key] = getattr(self, key)
+        return saved
+
+    def _restoreRecordArrays(self, saved):
+        """
+        Restores attributes from a dictionary returned by '_saveRecordArrays'.
+        """
+        for key, value in saved.items():
+            setattr(self, key, value)
+
+    def _openDataSection(self, offset=None):
+        """
+        Opens the file in binary mode (or as a read-only memory map if
+        'self.use_mmap' is set) and moves to byte 'offset' or, by default,
+        reads past the header. Compressed files are decompressed as they are
+        read (they are never memory mapped and offsets are in uncompressed bytes).
+        Returns a tuple of (file handle, byte offset of the current position).
+        """
+        if self._data_buffer is not None:
+            fh = io.BytesIO(self._data_buffer)
+        elif self.compression is not None:
+            fh = nappy.utils.common_utils.openFile(self.filename, "rb", self.compression)
+        else:
+            fh = open(self.filename, "rb")
+
+        if self.use_mmap and self.compression is None and self._data_buffer is None:
+            with fh:
+                fh = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if offset is None:
+            for i in range(self.NLHEAD):
+                fh.readline()
+        else:
+            fh.seek(offset)
+
+        return (fh, fh.tell())
+
+    def _getDataSize(self):
+        """
+        Returns the size in bytes of the file (or of the content read from a
+        file-like object).
+        """
+        if self._data_buffer is not None:
+            return len(self._data_buffer)
+        return os.path.getsize(self.filename)
+
+    def _readDataArray(self, datalines):
+        """
+        Reads the whole data section into arrays in one pass. Only implemented
+        for FFIs with a fixed number of items in every record.
+        """
+        raise Exception("The 'numpy' data engine is not supported for FFI %s." % self.FFI)
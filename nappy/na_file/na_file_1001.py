@@ -14,11 +14,16 @@ Container module for NAFile1001 class.
 
 # Imports from local package
 import nappy.utils.text_parser
+import nappy.utils.data_array
 import nappy.na_file.na_file
 import nappy.utils.common_utils
+import nappy.utils.text_writer
 getAnnotation = nappy.utils.common_utils.getAnnotation
 wrapLine = nappy.utils.common_utils.annotateLine
 wrapLines = nappy.utils.common_utils.annotateLines
+getColumnValues = nappy.utils.text_writer.getColumnValues
+getRowBlocks = nappy.utils.text_writer.getRowBlocks
+formatRecords = nappy.utils.text_writer.formatRecords
 
 
 class NAFile1001(nappy.na_file.na_file.NAFile):
@@ -53,27 +58,25 @@ class NAFile1001(nappy.na_file.na_file.NAFile):
 
     def _setupArrays(self):
         """
-        Sets up FFI-specific arrays to fill with data (lists of lists).
+        Sets up FFI-specific arrays to fill with data (a FloatArray per variable).
         """
-        self.X = []
+        self.X = nappy.utils.data_array.FloatArray()
         self.V = []
         # Set up the variables list
         for n in range(self.NV):
-            self.V.append([])
+            self.V.append(nappy.utils.data_array.FloatArray())
 
     def _readData1(self, datalines, ivar_count):
         """
         Reads first line/section of current block of data.
         """
-        (x_and_v, rtlines) = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, 1 + self.NV, float)
-        (x, v) = (x_and_v[0], x_and_v[1:])
-        self.X.append(x)
-        count = 0
-        # Set up mth list in self.V
-        for n in range(self.NV):
-            self.V[n].append(v[count])
-            count = count + 1
-        return rtlines    
+        x_and_v = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, 1 + self.NV, str)
+        self.X.append(float(x_and_v[0]))
+
+        # Only convert the selected variables
+        for n in self._variable_numbers:
+            self.V[n].append(float(x_and_v[1 + n]))
+        return datalines
 
     def _readData2(self, datalines, ivar_count):
         """
@@ -81,16 +84,34 @@ class NAFile1001(nappy.na_file.na_file.NAFile):
         """
         return datalines  
 
-    def writeData(self):
+    def _readDataArray(self, datalines):
         """
-        Writes the data section of the file.
-        This method can be called directly by the user.
+        Reads the whole data section into a 2-D array and sets X and V as its columns.
         """
-        for m in range(len(self.X)):
+        columns = [0] + [1 + n for n in self._variable_numbers]
+        array = nappy.utils.text_parser.readArrayFromLines(datalines, 1 + self.NV, columns)
+        self.X = array[:, 0]
+        self.V = [[] for n in range(self.NV)]
 
-            var_string = self.format % self.X[m]
+        for (i, n) in enumerate(self._variable_numbers):
+            self.V[n] = array[:, 1 + i]
 
-            for n in range(self.NV):
-                var_string = var_string + (self.format % self.V[n][m])
+    def _getRecordLineCounts(self):
+        """
+        Returns the number of lines that writeData writes for each record.
+        """
+        return [1] * len(self.X)
 
-            self.file.write(wrapLine("Data", self.annotation, self.delimiter, "%s\n" % var_string.rstrip(" ,")))
+    def writeData(self):
+        """
+        Writes the data section of the file.
+        This method can be called directly by the user.
+        """
+        prefix = getAnnotation("Data", self.annotation, delimiter=self.delimiter)
+        line_formats = [self.format * (self.NV + 1)]
+        columns = [getColumnValues(self.X)] + [getColumnValues(self.V[n]) for n in range(self.NV)]
+
+        # Format and write each block of rows in one go
+        for block in getRowBlocks(columns):
+            self.file.write(formatRecords(block, line_formats, self.delimiter, prefix,
+                                          float_format=self.float_format))
@@ -16,10 +16,16 @@ Container module for NAFile1010 class.
 
 # Imports from local package
 import nappy.utils.text_parser
+import nappy.utils.data_array
 import nappy.na_file.na_file_1001
 import nappy.utils.common_utils
+import nappy.utils.text_writer
+getAnnotation = nappy.utils.common_utils.getAnnotation
 wrapLine = nappy.utils.common_utils.annotateLine
 wrapLines = nappy.utils.common_utils.annotateLines
+getColumnValues = nappy.utils.text_writer.getColumnValues
+getRowBlocks = nappy.utils.text_writer.getRowBlocks
+formatRecords = nappy.utils.text_writer.formatRecords
 
 class NAFile1010(nappy.na_file.na_file.NAFile):
     """
@@ -53,63 +59,78 @@ class NAFile1010(nappy.na_file.na_file.NAFile):
 
     def _setupArrays(self):
         """
-        Sets up FFI-specific arrays to fill with data (lists of lists).
+        Sets up FFI-specific arrays to fill with data (a FloatArray per variable).
         """        
-        self.X = []
+        self.X = nappy.utils.data_array.FloatArray()
         self.V = []
         self.A = []
 
         for n in range(self.NV):
-            self.V.append([])
+            self.V.append(nappy.utils.data_array.FloatArray())
         for a in range(self.NAUXV):
-            self.A.append([])
+            self.A.append(nappy.utils.data_array.FloatArray())
 
     def _readData1(self, datalines, ivar_count): 
         """
         Reads first line/section of current block of data.
         """
         # Start with independent and Auxilliary vars
-        (x2_and_a, rtlines) = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, 1 + self.NAUXV, float)
-        (x, aux) = (x2_and_a[0], x2_and_a[1:])
-        self.X.append(x)
+        x2_and_a = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, 1 + self.NAUXV, str)
+        self.X.append(float(x2_and_a[0]))
 
-        count = 0
-        for a in range(self.NAUXV):
-            self.A[a].append(aux[count])
-            count = count + 1
-        return rtlines
+        for a in self._aux_variable_numbers:
+            self.A[a].append(float(x2_and_a[1 + a]))
+        return datalines
    
     def _readData2(self, datalines, ivar_count):
         """
         Reads second line/section (if used) of current block of data.
         """        
         # Now get the dependent variables
-        (v, rtlines) = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, self.NV, float)              
-					
-        count = 0
-        for n in range(self.NV):				
-            self.V[n].append(v[count])							
-            count = count + 1
-
-        return rtlines
-
-    def writeData(self):									
-         """   											
-         Writes the data section of the file.   					
-         This method can be called directly by the user.   			
-         """   											
-         for m in range(len(self.X)):   						
-             # Write Independent variable mark and auxiliary variables   	
-             var_string = self.format % self.X[m]   
-					
-             for a in range(self.NAUXV):   						
-                 var_string = var_string + (self.format % self.A[a][m])
-	
-             self.file.write(wrapLine("Data", self.annotation, self.delimiter, "%s\n" % var_string.rstrip(" ,")))	
-			
-             # Write dependant variables   						
-             var_string = ""   								
-             for n in range(self.NV):							
-                  var_string = var_string + (self.format % self.V[n][m])   	
-	
-             self.file.write(wrapLine("Data", self.annotation, self.delimiter, "%s\n" % var_string.rstrip(' ,'))) 					
+        v = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, self.NV, str)
+
+        for n in self._variable_numbers:
+            self.V[n].append(float(v[n]))
+
+        return datalines
+
+    def _readDataArray(self, datalines):
+        """
+        Reads the whole data section into a 2-D array and sets X, A and V as its columns.
+        """
+        start = 1 + self.NAUXV
+        columns = ([0] + [1 + a for a in self._aux_variable_numbers] +
+                   [start + n for n in self._variable_numbers])
+        array = nappy.utils.text_parser.readArrayFromLines(datalines, start + self.NV, columns)
+        self.X = array[:, 0]
+        self.A = [[] for a in range(self.NAUXV)]
+        self.V = [[] for n in range(self.NV)]
+
+        for (i, a) in enumerate(self._aux_variable_numbers):
+            self.A[a] = array[:, 1 + i]
+
+        start = 1 + len(self._aux_variable_numbers)
+        for (i, n) in enumerate(self._variable_numbers):
+            self.V[n] = array[:, start + i]
+
+    def _getRecordLineCounts(self):
+        """
+        Returns the number of lines that writeData writes for each record.
+        """
+        return [2] * len(self.X)
+
+    def writeData(self):
+        """
+        Writes the data section of the file.
+        This method can be called directly by the user.
+        """
+        prefix = getAnnotation("Data", self.annotation, delimiter=self.delimiter)
+        line_formats = [self.format * (self.NAUXV + 1), self.format * self.NV]
+
+        # Independent variable mark and auxiliary variables, then dependent variables
+        columns = [getColumnValues(self.X)] + [getColumnValues(self.A[a]) for a in range(self.NAUXV)] + \
+                  [getColumnValues(self.V[n]) for n in range(self.NV)]
+
+        for block in getRowBlocks(columns):
+            self.file.write(formatRecords(block, line_formats, self.delimiter, prefix,
+                                          float_format=self.float_format))
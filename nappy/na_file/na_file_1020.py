@@ -61,13 +61,36 @@ class NAFile1020(nappy.na_file.na_file_1010.NAFile1010):
         Reads second line/section (if used) of current block of data.
         """
         # Now get the dependent variables
-        (v, rtlines) = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, self.NV * self.NVPM, float)              
-        count = 0
-        for n in range(self.NV):
-            for i in range(self.NVPM):   # Number of steps where independent variable is implied
-                self.V[n].append(v[count])
-                count = count + 1
-        return rtlines
+        v = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, self.NV * self.NVPM, str)
+
+        for n in self._variable_numbers:
+            # NVPM steps where the independent variable is implied
+            start = n * self.NVPM
+            self.V[n].extend([float(item) for item in v[start:start + self.NVPM]])
+        return datalines
+
+    def _readDataArray(self, datalines):
+        """
+        Reads the whole data section into a 2-D array and sets X, A and V from its
+        columns. Each variable holds NVPM columns per record so these are flattened.
+        """
+        start = 1 + self.NAUXV
+        columns = [0] + [1 + a for a in self._aux_variable_numbers]
+        for n in self._variable_numbers:
+            columns.extend(range(start + n * self.NVPM, start + (n + 1) * self.NVPM))
+
+        array = nappy.utils.text_parser.readArrayFromLines(datalines, start + self.NV * self.NVPM, columns)
+        self.X = array[:, 0]
+        self.A = [[] for a in range(self.NAUXV)]
+        self.V = [[] for n in range(self.NV)]
+
+        for (i, a) in enumerate(self._aux_variable_numbers):
+            self.A[a] = array[:, 1 + i]
+
+        start = 1 + len(self._aux_variable_numbers)
+        for (i, n) in enumerate(self._variable_numbers):
+            column = start + i * self.NVPM
+            self.V[n] = array[:, column:column + self.NVPM].reshape(-1)
 
     def _normalizeIndVars(self):
         """
@@ -83,6 +106,12 @@ class NAFile1020(nappy.na_file.na_file_1010.NAFile1010):
         self.X[0] = newX
         self._normalized_X = True
 
+    def _getRecordLineCounts(self):
+        """
+        Returns the number of lines that writeData writes for each record.
+        """
+        return [1 + self.NV] * len(self.X)
+
     def writeData(self):										
          """   													
          Writes the data section of the file.   							
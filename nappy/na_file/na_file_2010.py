@@ -14,11 +14,16 @@ Container module for NAFile2010 class.
 
 # Imports from local package
 import nappy.utils.text_parser
-import nappy.utils.list_manipulator
+import nappy.utils.data_array
 import nappy.na_file.na_file
 import nappy.utils.common_utils
+import nappy.utils.text_writer
+getAnnotation = nappy.utils.common_utils.getAnnotation
 wrapLine = nappy.utils.common_utils.annotateLine
 wrapLines = nappy.utils.common_utils.annotateLines
+getColumnValues = nappy.utils.text_writer.getColumnValues
+formatRecordValues = nappy.utils.text_writer.formatRecordValues
+formatValues = nappy.utils.text_writer.formatValues
 
 
 class NAFile2010(nappy.na_file.na_file.NAFile):
@@ -56,27 +61,24 @@ class NAFile2010(nappy.na_file.na_file.NAFile):
         Writes FFI-specific header section.
         """        
         self._writeCommonHeader()
-        DX = self.DX
-        DX.reverse()
+        # Write reversed copies because C-type array is least-changing first
+        DX = self.DX[::-1]
         self.header.write(wrapLine("DX", self.annotation, self.delimiter, (("%s" + self.delimiter) * (self.NIV - 1) + "%s\n") % tuple(DX)))
-        NX = self.NX
-        NX.reverse()
+        NX = self.NX[::-1]
         self.header.write(wrapLine("NX", self.annotation, self.delimiter, (("%s" + self.delimiter) * (self.NIV - 2) + "%s\n") % tuple(NX)))
-        NXDEF = self.NXDEF[:]
-        NXDEF.reverse()
+        NXDEF = self.NXDEF[::-1]
         self.header.write(wrapLine("NXDEF", self.annotation, self.delimiter, (("%s" + self.delimiter) * (self.NIV - 2) + "%s\n") % tuple(NXDEF)))
 
         X_lines = []
 
         for i in range(self.NIV - 1):
-            X_lines.append((self.format * self.NXDEF[i] % tuple(self.X[i + 1][0:self.NXDEF[i]])).rstrip(" ,") + "\n")
+            X_lines.append(formatValues(self.X[i + 1][0:self.NXDEF[i]], self.float_format, self.delimiter))
 
         X_lines.reverse()
         for line in X_lines:
             self.header.write(wrapLine("X", self.annotation, self.delimiter, line.lstrip()))
 
-        XNAME = self.XNAME[:]
-        XNAME.reverse()
+        XNAME = self.XNAME[::-1]
         self.header.write(wrapLines("XNAME", self.annotation, self.delimiter, "%s\n" * self.NIV % tuple(XNAME)))
         self._writeVariablesHeaderSection()
         self._writeAuxVariablesHeaderSection()
@@ -92,6 +94,9 @@ class NAFile2010(nappy.na_file.na_file.NAFile):
         self.V = []
         self.A = []
 
+        # Start a new list for the unbounded independent variable (others are in the header)
+        self.X = [nappy.utils.data_array.FloatArray()] + self.X[1:]
+
         # Create an array size to request using read routines
         self.arraySize = 1
         for i in self.NX:
@@ -99,55 +104,139 @@ class NAFile2010(nappy.na_file.na_file.NAFile):
         for n in range(self.NV):
             self.V.append([])
         for a in range(self.NAUXV):
-            self.A.append([])
+            self.A.append(nappy.utils.data_array.FloatArray())
             
     def _readData1(self, datalines, ivar_count):
         """
         Reads first line/section of current block of data.
         """        
         # Start with independent and Auxilliary vars
-        (x2_and_a, rtlines) = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, 1 + self.NAUXV, float)
-        (x, aux) = (x2_and_a[0], x2_and_a[1:])
-        self.X[0].append(x)
-        count = 0
-        for a in range(self.NAUXV):
-            self.A[a].append(aux[count])
-            count = count + 1
-        return rtlines
+        x2_and_a = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, 1 + self.NAUXV, str)
+        self.X[0].append(float(x2_and_a[0]))
+
+        for a in self._aux_variable_numbers:
+            self.A[a].append(float(x2_and_a[1 + a]))
+        return datalines
 
     def _readData2(self, datalines, ivar_count):
         """
         Reads second line/section (if used) of current block of data.
         """
+        # Import numpy here so that pip install works without error
+        import numpy as np
+
         # Now get the dependent variables
         for n in range(self.NV):
-            (v, rtlines) = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, self.arraySize, float)
-            self.V[n].append([])
-            nappy.utils.list_manipulator.recursiveListPopulator(self.V[n][ivar_count], v, self.NX)
-            datalines = rtlines
-        return rtlines
+            v = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, self.arraySize, str)
+
+            # Skip over the values of variables that were not selected
+            if n not in self._variable_numbers:
+                continue
+
+            # Convert the whole block in one go and shape it by the bounded dimensions
+            self.V[n].append(np.array(v, dtype=float).reshape(self.NX))
+        return datalines
+
+    def _finishRecordArrays(self):
+        """
+        Stacks the blocks read for each selected variable into a single array
+        of shape (number of records, NX[0], NX[1], ...).
+        """
+        # Import numpy here so that pip install works without error
+        import numpy as np
+
+        for n in self._variable_numbers:
+            if isinstance(self.V[n], list):
+                self.V[n] = np.array(self.V[n], dtype=float).reshape([len(self.V[n])] + list(self.NX))
+
+    def _appendRecordArrays(self, saved):
+        """
+        Adds the records held in the data arrays to the end of the arrays in
+        'saved'. Only the unbounded independent variable (X[0]) has records.
+        """
+        self.X = [self._joinRecords(saved["X"][0], self.X[0])] + self.X[1:]
+        nappy.na_file.na_file.NAFile._appendRecordArrays(self, dict(saved, X=self.X))
+
+    def _readDataArray(self, datalines):
+        """
+        Reads the whole data section into a 2-D array with one row per record
+        and sets X[0] and A from its first columns. Each variable is a slice of
+        the rest of the row, reshaped to (number of records, NX[0], NX[1], ...).
+        """
+        nitems = 1 + self.NAUXV + self.NV * self.arraySize
+        columns = [0] + [1 + a for a in self._aux_variable_numbers]
+        for n in self._variable_numbers:
+            start = 1 + self.NAUXV + n * self.arraySize
+            columns.extend(range(start, start + self.arraySize))
+
+        array = nappy.utils.text_parser.readArrayFromLines(datalines, nitems, columns)
+        nrecords = array.shape[0]
+
+        self.X[0] = array[:, 0]
+        self.A = [[] for a in range(self.NAUXV)]
+        self.V = [[] for n in range(self.NV)]
+
+        for (i, a) in enumerate(self._aux_variable_numbers):
+            self.A[a] = array[:, 1 + i]
+
+        start = 1 + len(self._aux_variable_numbers)
+        for n in self._variable_numbers:
+            self.V[n] = array[:, start:start + self.arraySize].reshape([nrecords] + list(self.NX))
+            start = start + self.arraySize
+
+    def _getUnboundedX(self):
+        """
+        Returns the list of values of the unbounded independent variable that
+        have been read into the data arrays (one per record).
+        """
+        return self.X[0]
+
+    def _getRecordLineCounts(self):
+        """
+        Returns the number of lines that writeData writes for each record.
+        """
+        nlines = self.NV
+        for nx in self.NX[:-1]:
+            nlines = nlines * nx
+
+        return [1 + nlines] * len(self.X[0])
 
     def writeData(self):
         """
         Writes the data section of the file.
         This method can be called directly by the user.
         """        
-        # Set up unbounded IV loop
-        self.NX.reverse()
-        for m in range(len(self.X[0])):
+        # Import numpy here so that pip install works without error
+        import numpy as np
 
-            # Write unbounded independent variable mark and auxiliary variables
-            var_string = self.format % self.X[0][m]
+        # Each record is a line of the unbounded independent variable mark and auxiliary
+        # variables, then each variable's values as lines along its last dimension
+        nrows = self.NV
+        for nx in self.NX[:-1]:
+            nrows = nrows * nx
 
-            for a in range(self.NAUXV):
-                var_string = var_string + (self.format % self.A[a][m])
-            self.file.write(wrapLine("Data", self.annotation, self.delimiter, "%s\n" % var_string.rstrip(" ,")))
-            
-            # Write Variables
-            for n in range(self.NV):
-                outlines = nappy.utils.list_manipulator.recursiveListWriter(self.V[n][m], self.NX, delimiter = self.delimiter, float_format = self.float_format)
-                for line in outlines:
-                    self.file.write(wrapLine("Data", self.annotation, self.delimiter, line))
+        prefix = getAnnotation("Data", self.annotation, delimiter=self.delimiter)
+        line_formats = [self.format * (self.NAUXV + 1)] + [self.format * self.NX[-1]] * nrows
+        nrecords = len(self.X[0])
+        block_records = max(1, nappy.utils.text_writer.default_block_size // len(line_formats))
+
+        for start in range(0, nrecords, block_records):
+            end = min(start + block_records, nrecords)
+            X = getColumnValues(self.X[0][start:end])
+            A = [getColumnValues(self.A[a][start:end]) for a in range(self.NAUXV)]
+
+            # Reshape the block of records of each variable to one row of values per record
+            V = [np.asarray(self.V[n][start:end]).reshape(end - start, -1).tolist() for n in range(self.NV)]
+
+            values = []
+            for m in range(end - start):
+                values.append(X[m])
+                values.extend([a[m] for a in A])
+                for v in V:
+                    values.extend(v[m])
+
+            self.file.write(formatRecordValues(values, end - start, line_formats, self.delimiter, prefix,
+                                               float_format=self.float_format))
 
     def _normalizeIndVars(self):
         """
@@ -14,10 +14,16 @@ Container module for NAFile2110 class.
 
 # Imports from local package
 import nappy.utils.text_parser
+import nappy.utils.data_array
+import nappy.na_file.na_file
 import nappy.na_file.na_file_2010
 import nappy.utils.common_utils
+import nappy.utils.text_writer
+getAnnotation = nappy.utils.common_utils.getAnnotation
 wrapLine = nappy.utils.common_utils.annotateLine
 wrapLines = nappy.utils.common_utils.annotateLines
+getColumnValues = nappy.utils.text_writer.getColumnValues
+formatRecords = nappy.utils.text_writer.formatRecords
 
 class NAFile2110(nappy.na_file.na_file_2010.NAFile2010):
     """
@@ -43,11 +49,9 @@ class NAFile2110(nappy.na_file.na_file_2010.NAFile2010):
         Writes FFI-specific header section.
         """
         self._writeCommonHeader()
-        DX = self.DX
-        DX.reverse()
+        DX = self.DX[::-1]
         self.header.write(wrapLine("DX", self.annotation, self.delimiter, (("%s" + self.delimiter) * (self.NIV - 1) + "%s\n") % tuple(DX)))
-        XNAME = self.XNAME
-        XNAME.reverse()
+        XNAME = self.XNAME[::-1]
         self.header.write(wrapLines("XNAME", self.annotation, self.delimiter, "%s\n" * self.NIV % tuple(XNAME)))
         self._writeVariablesHeaderSection()
         self._writeAuxVariablesHeaderSection()
@@ -68,71 +72,106 @@ class NAFile2110(nappy.na_file.na_file_2010.NAFile2010):
         for n in range(self.NV):
             self.V.append([])
         for i in range(self.NAUXV):
-           self.A.append([])
+           self.A.append(nappy.utils.data_array.FloatArray())
 
     def _readData1(self, datalines, ivar_count): 
         """
         Reads first line/section of current block of data.
         """    
         # Start with independent and Auxilliary vars
-        (x_and_a, rtlines) = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, self.NAUXV + 1, float)
-        (x, aux) = (x_and_a[0], x_and_a[1:])
-        count = 0
-        for a in range(self.NAUXV):
-            self.A[a].append(aux[count])
-            count = count + 1
-        #for a in range(self.NAUXV):
-            #self.A.append(aux[a])
+        x_and_a = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, self.NAUXV + 1, str)
+        (x, aux) = (float(x_and_a[0]), x_and_a[1:])
+
+        for a in self._aux_variable_numbers:
+            self.A[a].append(float(aux[a]))
+
         self.X.append([])
         self.X[ivar_count].append(x)
         # Set up list to take second changing independent variable
-        self.X[ivar_count].append([])  
-        self.NX.append(int(aux[0]))
-        return rtlines
+        self.X[ivar_count].append([])
+        # NX is always the first auxiliary variable so is needed even if not selected
+        self.NX.append(int(float(aux[0])))
+        return datalines
 
     def _readData2(self, datalines, ivar_count):
         """
         Reads second line/section (if used) of current block of data.
         """
         # Now get the dependent variables
-        for n in range(self.NV):
-            self.V[n].append([])
+        for n in self._variable_numbers:
+            self.V[n].append(nappy.utils.data_array.FloatArray())
 
         for c in range(self.NX[ivar_count]):
-            (x_and_v, datalines) = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, self.NV + 1, float)
-            (x, v) = (x_and_v[0], x_and_v[1:])
-            self.X[ivar_count][1].append(x)
+            x_and_v = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, self.NV + 1, str)
+            self.X[ivar_count][1].append(float(x_and_v[0]))
 
-            count = 0
-            for n in range(self.NV):
-                self.V[n][ivar_count].append(v[count])
-                count = count + 1
+            for n in self._variable_numbers:
+                self.V[n][ivar_count].append(float(x_and_v[1 + n]))
 
-        rtlines = datalines
-        return rtlines
+        return datalines
 
-    def writeData(self):
+    def _finishRecordArrays(self):
         """
-        Writes the data section of the file.
-        This method can be called directly by the user.
+        Leaves the data arrays as lists of records because their sizes can vary.
         """
-        # Set up unbounded IV loop
+        pass
 
-        for m in range(len(self.X)):
+    def _appendRecordArrays(self, saved):
+        """
+        Adds the records held in the data arrays to the end of the arrays in
+        'saved'. X, NX and the data arrays all hold one item per record.
+        """
+        nappy.na_file.na_file.NAFile._appendRecordArrays(self, saved)
 
-            # Write unbounded independent variable mark and auxiliary variables
-            var_string = self.format % self.X[m][0]
+    def _readDataArray(self, datalines):
+        """
+        Not implemented because the number of items in each record can vary.
+        """
+        nappy.na_file.na_file.NAFile._readDataArray(self, datalines)
 
-            # Loop through aux vars which includes NX as first aux var
-            for a in range(self.NAUXV): 
-                var_string = var_string + (self.format % self.A[a][m])
-            self.file.write(wrapLine("Data", self.annotation, self.delimiter, "%s\n" % var_string.rstrip(" ,")))
+    def _getUnboundedX(self):
+        """
+        Returns the list of values of the unbounded independent variable that
+        have been read into the data arrays (one per record).
+        """
+        return [x[0] for x in self.X]
+
+    def _getRecordLineCounts(self):
+        """
+        Returns the number of lines that writeData writes for each record.
+        """
+        return [1 + nx for nx in self.NX[:len(self.X)]]
 
-            # Write second independant variable and dependant variables
-            for p in range(self.NX[m]):
-                var_string = self.format % self.X[m][1][p]
+    def writeData(self):
+        """
+        Writes the data section of the file.
+        This method can be called directly by the user.
+        """
+        prefix = getAnnotation("Data", self.annotation, delimiter=self.delimiter)
+        aux_formats = [self.format * (self.NAUXV + 1)]
+        var_formats = [self.format * (self.NV + 1)]
 
-                for n in range(self.NV):
-                    var_string = var_string + (self.format %self.V[n][m][p])
+        V = [getColumnValues(self.V[n]) for n in range(self.NV)]
+        A = [getColumnValues(self.A[a]) for a in range(self.NAUXV)]
+        (texts, nlines) = ([], 0)
 
-                self.file.write(wrapLine("Data", self.annotation, self.delimiter, "%s\n" %var_string.rstrip(" ,")))
+        for m in range(len(self.X)):
+            # Write unbounded independent variable mark and auxiliary variables
+            # (which includes NX as first aux var)
+            columns = [[self.X[m][0]]] + [[A[a][m]] for a in range(self.NAUXV)]
+            texts.append(formatRecords(columns, aux_formats, self.delimiter, prefix,
+                                          float_format=self.float_format))
+
+            # Write second independent variable and dependent variables
+            nx = self.NX[m]
+            columns = [getColumnValues(self.X[m][1])[:nx]] + [getColumnValues(V[n][m])[:nx] for n in range(self.NV)]
+            texts.append(formatRecords(columns, var_formats, self.delimiter, prefix,
+                                          float_format=self.float_format))
+
+            # Write the lines in blocks rather than record by record
+            nlines += 1 + nx
+            if nlines >= nappy.utils.text_writer.default_block_size:
+                self.file.write("".join(texts))
+                (texts, nlines) = ([], 0)
+
+        self.file.write("".join(texts))
@@ -14,6 +14,7 @@ Container module for NAFile2160 class.
 
 # Imports from local package
 import nappy.utils.text_parser
+import nappy.utils.data_array
 import nappy.na_file.na_file_2110
 import nappy.utils.common_utils
 wrapLine = nappy.utils.common_utils.annotateLine
@@ -49,12 +50,10 @@ class NAFile2160(nappy.na_file.na_file_2110.NAFile2110):
             self.file.write("\n")
         
         self._writeCommonHeader()
-        DX = self.DX
-        DX.reverse()
+        DX = self.DX[::-1]
         self.header.write(wrapLine("DX", self.annotation, self.delimiter, "%s\n" % tuple(DX)))
         self.header.write(wrapLine("LENX", self.annotation, self.delimiter, "%s\n" % self.LENX))
-        XNAME = self.XNAME
-        XNAME.reverse()
+        XNAME = self.XNAME[::-1]
         self.header.write(wrapLines("XNAME", self.annotation, self.delimiter, "%s\n" * self.NIV % tuple(XNAME)))
         self._writeVariablesHeaderSection()
         self._writeAuxVariablesHeaderSection()
@@ -92,7 +91,10 @@ class NAFile2160(nappy.na_file.na_file_2110.NAFile2110):
         
         for n in range(self.NV):
             self.V.append([])
-        for i in range(self.NAUXV):
+        # Numeric auxiliary variables come first, then the character ones
+        for i in range(self.NAUXV - self.NAUXC):
+            self.A.append(nappy.utils.data_array.FloatArray())
+        for i in range(self.NAUXC):
             self.A.append([])
 
     def _readData1(self, datalines, ivar_count):
@@ -101,31 +103,34 @@ class NAFile2160(nappy.na_file.na_file_2110.NAFile2110):
         """      
         # Start with independent and Auxilliary vars
         # Get character string independent variable
-        (x1, datalines) = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, 1, str)
+        x1 = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, 1, str)
         self.X.append([])
         self.X[ivar_count].append(x1[0])
         # Set up list to take second changing independent variable
         self.X[ivar_count].append([])  
         
         # Get NX and Non-character AUX vars
-        (aux, datalines) = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, (self.NAUXV - self.NAUXC), float)
-        self.NX.append(int(aux[0]))
-
-        count = 0
-        for a in range(self.NAUXV - self.NAUXC):
-            self.A[a].append(aux[count])
-            count = count + 1
+        nauxn = self.NAUXV - self.NAUXC
+        aux = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, nauxn, str)
+        self.NX.append(int(float(aux[0])))
 
         # Get character AUX vars
-        (auxc) = nappy.utils.text_parser.readItemsFromLines(datalines[:self.NAUXC], self.NAUXC, str)
-        rtlines = datalines[self.NAUXC:]
-        count = 0
-        for a in range(self.NAUXC):
-            self.A[(self.NAUXV - self.NAUXC) + a].append(auxc[count])
-            count = count + 1
-
-        return rtlines
+        auxc = nappy.utils.text_parser.readItemsFromLines(datalines.readlines(self.NAUXC), self.NAUXC, str)
+
+        for a in self._aux_variable_numbers:
+            if a < nauxn:
+                self.A[a].append(float(aux[a]))
+            else:
+                self.A[a].append(auxc[a - nauxn])
+
+        return datalines
     
+    def _getRecordLineCounts(self):
+        """
+        Returns the number of lines that writeData writes for each record.
+        """
+        return [2 + self.NAUXC + nx for nx in self.NX[:len(self.X)]]
+
     def writeData(self):
         """
         Writes the data section of the file.
@@ -14,6 +14,7 @@ Container module for NAFile2310 class.
 
 # Imports from local package
 import nappy.utils.text_parser
+import nappy.utils.data_array
 import nappy.na_file.na_file_2110
 import nappy.utils.common_utils
 wrapLine = nappy.utils.common_utils.annotateLine
@@ -44,50 +45,71 @@ class NAFile2310(nappy.na_file.na_file_2110.NAFile2110):
         """
         self._writeCommonHeader()
         self.header.write(wrapLine("DX", self.annotation, self.delimiter, "%s\n" % self.DX[0]))
-        XNAME = self.XNAME
-        XNAME.reverse()
-        self.header.write(wrapLines("XNAME", self.annotation, self.delimiter, "%s\n" * self.NIV % tuple(self.XNAME)))
+        XNAME = self.XNAME[::-1]
+        self.header.write(wrapLines("XNAME", self.annotation, self.delimiter, "%s\n" * self.NIV % tuple(XNAME)))
         self._writeVariablesHeaderSection()
         self._writeAuxVariablesHeaderSection()
         self._writeComments()
         self._fixHeaderLength()
         self.file.write(self.header.read())
 
+    def _setupArrays(self):
+        """
+        Sets up FFI-specific arrays to fill with data (lists of lists).
+        """
+        nappy.na_file.na_file_2110.NAFile2110._setupArrays(self)
+        # DX is extended with the interval of each record as it is read
+        self.DX = self.DX[:1]
+
+    def _appendRecordArrays(self, saved):
+        """
+        Adds the records held in the data arrays to the end of the arrays in
+        'saved'. DX starts with the header value so only the intervals of the
+        new records are added to it.
+        """
+        new_DX = self.DX[1:]
+        self.DX = saved["DX"]
+        nappy.na_file.na_file_2110.NAFile2110._appendRecordArrays(self, saved)
+        self.DX.extend(new_DX)
+
     def _readData1(self, datalines, ivar_count):
         """
         Reads first line/section of current block of data.
         """        
         # Start with independent and Auxilliary vars
-        (x_and_a, rtlines) = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, self.NAUXV + 1, float)
-        (x, aux) = (x_and_a[0], x_and_a[1:])
+        x_and_a = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, self.NAUXV + 1, str)
+        (x, aux) = (float(x_and_a[0]), x_and_a[1:])
 
-        count = 0
-        for a in range(self.NAUXV):
-            self.A[a].append(aux[count])
-            count = count + 1
+        for a in self._aux_variable_numbers:
+            self.A[a].append(float(aux[a]))
 
         self.X.append([])
         self.X[ivar_count].append(x)
 
+        # NX, X and DX are always the first three auxiliary variables so are needed even if not selected
         # Set up list to take second changing independent variable
-        self.X[ivar_count].append([aux[1]])
-        self.NX.append(int(aux[0]))
-        self.DX.append(int(aux[2]))
-        return rtlines
+        self.X[ivar_count].append([float(aux[1])])
+        self.NX.append(int(float(aux[0])))
+        self.DX.append(int(float(aux[2])))
+        return datalines
    
     def _readData2(self, datalines, ivar_count):
         """
         Reads second line/section (if used) of current block of data.
         """
         # Now get the dependent variables
-        (v, rtlines) = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, self.NV * self.NX[ivar_count], float)
-        count = 0
-        for n in range(self.NV):
-            self.V[n].append([])
-            for i in range(self.NX[ivar_count]):
-                self.V[n][ivar_count].append(v[count])
-                count = count + 1
-        return rtlines
+        nx = self.NX[ivar_count]
+        v = nappy.utils.text_parser.readItemsFromUnknownLines(datalines, self.NV * nx, str)
+
+        for n in self._variable_numbers:
+            self.V[n].append(nappy.utils.data_array.FloatArray([float(item) for item in v[n * nx:(n + 1) * nx]]))
+        return datalines
+
+    def _getRecordLineCounts(self):
+        """
+        Returns the number of lines that writeData writes for each record.
+        """
+        return [2] * len(self.X)
 
     def writeData(self):
         """
@@ -0,0 +1,206 @@
+#   Copyright (C) 2004 CCLRC & NERC( Natural Environment Research Council ).
+#   This software may be distributed under the terms of the
+#   Q Public License, version 1.0 or later. http://ndg.nerc.ac.uk/public_docs/QPublic_license.txt
+
+"""
+na_stream_writer.py
+===================
+
+Container module for NAStreamWriter class that writes a NASA Ames file from
+records that are appended as they become available, so that the whole data
+set never needs to be held in memory.
+
+"""
+
+# Imports from python standard library
+
+# Imports from local package
+import nappy
+import nappy.utils.common_utils
+import nappy.utils.text_parser
+import nappy.utils.text_writer
+
+default_delimiter = nappy.utils.common_utils.getDefault("default_delimiter")
+default_float_format = nappy.utils.common_utils.getDefault("default_float_format")
+
+
+class NAStreamWriter:
+    """
+    Writes the header of a NASA Ames file when it is opened and then writes the
+    records given to 'append()' as they arrive. The header items that depend on
+    all the records are written into the header when the writer is closed.
+
+    Usage:
+
+        >>>    with NAStreamWriter("out.na", na_dict) as writer:
+        >>>        for (X, V) in batches:
+        >>>            writer.append(X, V)
+    """
+
+    # Number of characters kept in the header for a DX value that is set on close
+    dx_width = 24
+
+    def __init__(self, filename, na_dict, delimiter=default_delimiter,
+                 float_format=default_float_format, annotation=False,
+                 compression=None, atomic=False):
+        """
+        Opens 'filename' and writes the header defined by the items in 'na_dict'
+        (which must include the "FFI"). Any data in 'na_dict' is ignored, apart
+        from the values of the bounded independent variables of FFIs 2010, 3010
+        and 4010.
+
+        If 'na_dict' has no "DX" item, or its first item is None, then DX for the
+        unbounded independent variable is worked out from the values appended: the
+        interval between them if it is constant, otherwise 0. The intervals are
+        compared exactly, so values with rounding errors in their intervals (such
+        as numpy.arange(0, 1, 0.1)) get a DX of 0. The DX value is padded with
+        leading spaces to the width reserved for it. This cannot be done when
+        the output is compressed.
+
+        The 'compression' and 'atomic' arguments are passed to nappy.openNAFile.
+        If 'atomic' is True the file only appears once the writer has been closed
+        (and not at all if the "with" block that uses it raises an exception).
+        """
+        if "FFI" not in na_dict:
+            raise Exception("The na_dict must include the 'FFI' to write a NASA Ames file as a stream.")
+
+        self.filename = filename
+        self.FFI = na_dict["FFI"]
+        self.record_count = 0
+
+        # Copy DX so that a placeholder can be set without changing 'na_dict'
+        header_dict = dict(na_dict)
+        DX = header_dict["DX"] = list(na_dict.get("DX") or [None])
+        placeholder = None
+
+        if DX[0] is None:
+            if self.FFI == 1020:
+                raise Exception("DX must be given to write FFI 1020 as a stream.")
+
+            if nappy.utils.common_utils.getOutputCompression(filename, compression) is not None:
+                raise Exception("DX must be given to write a compressed NASA Ames file as a stream.")
+
+            placeholder = "#" * self.dx_width
+            DX[0] = placeholder
+
+        if self.FFI in (2010, 3010, 4010):
+            self._bounded_x = list(header_dict["X"][1:])
+            header_dict["X"] = [[]] + self._bounded_x
+
+        self.na_file = nappy.openNAFile(filename, mode="w", na_dict=header_dict,
+                                        compression=compression, atomic=atomic)
+        self.na_file._prepareToWrite(delimiter, float_format, annotation)
+        self.na_file.writeHeader()
+
+        self._dx_offset = None
+        (self._last_x, self._interval, self._uniform) = (None, None, True)
+
+        if placeholder is not None:
+            header = self.na_file.header.getvalue()
+            encoding = getattr(self.na_file.file, "encoding", None) or nappy.utils.text_parser.default_encoding
+            self._dx_offset = len(header[:header.index(placeholder)].encode(encoding))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Close without completing the header (an atomic output is discarded)
+            self.na_file.close()
+
+    def append(self, X, V, A=None):
+        """
+        Writes a batch of records. 'X', 'V' and 'A' hold the values for the new
+        records laid out as in an na_dict, except that for FFIs 2010, 3010 and
+        4010 'X' only holds the values of the unbounded independent variable.
+        Arrays (such as numpy arrays) can be used instead of lists.
+        """
+        if not self.na_file.is_open:
+            raise Exception("WARNING: NASA Ames stream writer is closed and cannot be written to.")
+
+        na_file = self.na_file
+        na_file.V = V
+        na_file.A = A if A is not None else []
+
+        if self.FFI in (2010, 3010, 4010):
+            na_file.X = [X] + self._bounded_x
+            unbounded_x = X
+        elif self.FFI in (2110, 2160, 2310):
+            na_file.X = X
+            na_file.NX = [len(values) for values in V[0]]
+            unbounded_x = [x[0] for x in X]
+        else:
+            na_file.X = X
+            unbounded_x = X
+
+        na_file.writeData()
+        self._updateInterval(nappy.utils.text_writer.getColumnValues(unbounded_x))
+        self.record_count += len(unbounded_x)
+
+    def appendRecord(self, x, v, a=None):
+        """
+        Writes a single record, where 'x' is its independent variable value
+        (as an item of an na_dict "X"), 'v' holds the values of each variable and
+        'a' the value of each auxiliary variable.
+        """
+        if self.FFI == 1020:
+            V = [list(values) for values in v]
+        else:
+            V = [[values] for values in v]
+
+        A = None if a is None else [[value] for value in a]
+        self.append([x], V, A)
+
+    def _updateInterval(self, values):
+        """
+        Updates the interval between the unbounded independent variable values
+        with the appended 'values', noting if it is no longer constant.
+        """
+        # Import numpy here so that pip install works without error
+        import numpy as np
+
+        values = np.asarray(values)
+        if not self._uniform or values.size == 0:
+            return
+
+        if values.dtype.kind not in "iuf":
+            self._uniform = False
+            return
+
+        if self._last_x is not None:
+            values = np.concatenate([[self._last_x], values])
+
+        intervals = np.diff(values)
+        self._last_x = values[-1]
+
+        if intervals.size:
+            if self._interval is None:
+                self._interval = intervals[0].item()
+            self._uniform = bool(np.all(intervals == self._interval))
+
+    def close(self):
+        """
+        Closes the file and writes any header values that depend on all the records.
+        """
+        if not self.na_file.is_open:
+            return
+
+        self.na_file.file.close()
+
+        if self._dx_offset is not None:
+            dx = self._interval if self._uniform and self._interval is not None else 0
+            text = ("%s" % dx).rjust(self.dx_width)
+
+            if len(text) > self.dx_width:
+                self.na_file.close()
+                raise Exception("Cannot write DX value '%s' into the header of: %s" % (dx, self.filename))
+
+            # Write into the temporary file before it is renamed if writing atomically
+            with open(self.na_file.output_path, "r+b") as fh:
+                fh.seek(self._dx_offset)
+                fh.write(text.encode("ascii"))
+
+        self.na_file.data_written = True
+        self.na_file.close()
@@ -0,0 +1,187 @@
+#   Copyright (C) 2004 CCLRC & NERC( Natural Environment Research Council ).
+#   This software may be distributed under the terms of the
+#   Q Public License, version 1.0 or later. http://ndg.nerc.ac.uk/public_docs/QPublic_license.txt
+
+"""
+record_index.py
+===============
+
+Holds the RecordIndex class that stores where each record starts in the
+data section of a NASA Ames file.
+
+"""
+
+# Imports from python standard library
+import array
+import json
+import logging
+import os
+import sys
+
+log = logging.getLogger(__name__)
+
+# Define global variables
+index_file_extension = ".naidx"
+index_file_version = 1
+
+
+def getIndexFileName(na_file):
+    """
+    Returns the name of the sidecar index file for the NASA Ames file 'na_file'.
+    """
+    return os.fspath(na_file) + index_file_extension
+
+
+def readRecordIndex(index_file):
+    """
+    Reads a RecordIndex from the sidecar file 'index_file' and returns it.
+    """
+    with open(index_file, "rb") as fin:
+        meta = json.loads(fin.readline().decode("utf-8"))
+
+        if meta["version"] != index_file_version:
+            raise Exception("Unsupported record index file version: %s" % meta["version"])
+
+        nrecords = meta["nrecords"]
+        swap_bytes = meta["byteorder"] != sys.byteorder
+
+        offsets = array.array("q")
+        offsets.fromfile(fin, nrecords)
+        if swap_bytes:
+            offsets.byteswap()
+
+        if meta["x_type"] == "d":
+            x_values = array.array("d")
+            x_values.fromfile(fin, nrecords)
+            if swap_bytes:
+                x_values.byteswap()
+        else:
+            x_values = json.loads(fin.read().decode("utf-8"))
+
+    return RecordIndex(offsets, x_values, end_offset=meta["end_offset"], nlhead=meta["nlhead"],
+                       file_size=meta["file_size"], file_mtime=meta["file_mtime"])
+
+
+class RecordIndex:
+    """
+    Holds the byte offset of the start of each record in the data section of
+    a NASA Ames file, along with the value of the unbounded independent
+    variable for that record. A record is one step (m) of the loop over the
+    unbounded independent variable in NAFile.readData().
+    """
+
+    def __init__(self, offsets=None, x_values=None, end_offset=None, nlhead=None,
+                 file_size=None, file_mtime=None):
+        """
+        Sets up the index. 'end_offset' is the byte offset just after the
+        last record in the data section. 'nlhead', 'file_size' and 'file_mtime'
+        describe the file that was indexed so the index can be validated.
+        """
+        self.offsets = array.array("q", offsets or [])
+        self.x_values = list(x_values or [])
+        self.end_offset = end_offset
+        self.nlhead = nlhead
+        self.file_size = file_size
+        self.file_mtime = file_mtime
+
+    def __len__(self):
+        "Returns the number of records in the index."
+        return len(self.offsets)
+
+    def append(self, offset, x_value):
+        "Adds a record to the end of the index."
+        self.offsets.append(offset)
+        self.x_values.append(x_value)
+
+    def getOffset(self, record):
+        """
+        Returns the byte offset at which 'record' starts. The number of records
+        can be used to get the offset of the end of the data section.
+        """
+        if record == len(self.offsets):
+            return self.end_offset
+        return self.offsets[record]
+
+    def findRecordRange(self, x_range):
+        """
+        Returns the (start, end) record numbers of the records whose X values
+        lie inside 'x_range' (a (start, end) tuple, both ends included), found
+        by a binary search. The X values must be monotonic (increasing or decreasing).
+        """
+        (low, high) = (min(x_range), max(x_range))
+        x_values = self.x_values
+        descending = len(x_values) > 1 and x_values[0] > x_values[-1]
+
+        if descending:
+            (low, high) = (high, low)
+
+        start = self._countRecordsBefore(low, descending, inclusive=False)
+        end = self._countRecordsBefore(high, descending, inclusive=True)
+        return (start, max(start, end))
+
+    def _countRecordsBefore(self, value, descending, inclusive):
+        """
+        Returns the number of leading records whose X values come before 'value'
+        (or are equal to it if 'inclusive') in the order of the file.
+        """
+        (lo, hi) = (0, len(self.x_values))
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            x = self.x_values[mid]
+
+            if (x > value if descending else x < value) or (inclusive and x == value):
+                lo = mid + 1
+            else:
+                hi = mid
+
+        return lo
+
+    def setFileStats(self, na_file):
+        """
+        Records the size and modification time of 'na_file' in the index.
+        """
+        stat = os.stat(na_file)
+        self.file_size = stat.st_size
+        self.file_mtime = stat.st_mtime_ns
+
+    def isValidFor(self, na_file, nlhead):
+        """
+        Returns True if the index matches the current size and modification
+        time of 'na_file' and its number of header lines 'nlhead'.
+        """
+        try:
+            stat = os.stat(na_file)
+        except OSError:
+            return False
+
+        return (self.file_size == stat.st_size and self.file_mtime == stat.st_mtime_ns
+                and self.nlhead == nlhead)
+
+    def write(self, index_file):
+        """
+        Writes the index to the sidecar file 'index_file'. The file holds a line
+        of JSON metadata followed by the offsets and X values as binary arrays
+        (X values that are not numbers are written as JSON).
+        """
+        try:
+            x_values = array.array("d", self.x_values)
+            x_type = "d"
+        except TypeError:
+            x_values = None
+            x_type = "json"
+
+        meta = {"version": index_file_version, "nrecords": len(self), "end_offset": self.end_offset,
+                "nlhead": self.nlhead, "file_size": self.file_size, "file_mtime": self.file_mtime,
+                "byteorder": sys.byteorder, "x_type": x_type}
+
+        with open(index_file, "wb") as fout:
+            fout.write((json.dumps(meta) + "\n").encode("utf-8"))
+            self.offsets.tofile(fout)
+
+            if x_values is not None:
+                x_values.tofile(fout)
+            else:
+                fout.write(json.dumps(self.x_values).encode("utf-8"))
+
+        log.debug("Record index written to: %s" % index_file)
@@ -52,6 +52,12 @@ fout = openNAFile("test_outputs/mytest.na", mode="w", na_dict=na_dict)
 fout.write()
 fout.close()
 
+# Or write the records as they are produced, without holding them all in memory.
+# The na_dict only needs the header items here.
+with nappy.openNAStreamWriter("test_outputs/mystream.na", header_dict) as writer:
+    for (X, V) in batches:
+        writer.append(X, V)
+
  2. Converting between formats (NASA Ames, NetCDF and CSV)
 
 # Let's convert a NASA Ames file into a NetCDF file, and add some of our own global attributes
@@ -118,16 +124,26 @@ ffi = nappy.readFFI(na_file)
 # Given a NASA Ames dictionary (na_dict) get an appropriate FFI.
 ffi = nappy.chooseFFI(na_dict)
 
+# Scan the headers of many files in parallel (e.g. to catalogue an archive).
+headers = nappy.scanHeaders(na_files, workers=8)
+
+# Read many files in parallel, each result holds an "na_dict" or an "error".
+results = nappy.readMany(na_files, workers=8, variables=["temperature"])
+
 
 """
 
 # Import standard library modules
+import io
 import logging
 log = logging.getLogger(__name__)
 
 # Import local modules
+import nappy.na_file.na_stream_writer
 import nappy.utils.common_utils
 import nappy.utils.compare_na
+import nappy.utils.header_scanner
+import nappy.utils.multi_reader
 import nappy.utils.text_parser
 
 # Bring some utils into the API
@@ -136,6 +152,8 @@ readFFI = nappy.utils.common_utils.readFFI
 chooseFFI = nappy.utils.common_utils.chooseFFI
 getNAFileClass = nappy.utils.common_utils.getNAFileClass
 getFileNameWithNewExtension = nappy.utils.common_utils.getFileNameWithNewExtension
+scanHeaders = nappy.utils.header_scanner.scanHeaders
+readMany = nappy.utils.multi_reader.readMany
 
 __version__ = nappy.utils.common_utils.getVersion()
 default_delimiter = nappy.utils.common_utils.getDefault("default_delimiter")
@@ -143,18 +161,53 @@ default_float_format = nappy.utils.common_utils.getDefault("default_float_format
 
 
 def openNAFile(filename, mode="r", na_dict=None, ignore_header_lines=0,
-               var_and_units_callback=None):
+               var_and_units_callback=None, use_mmap=False, cache_dir=None, cache_size=None,
+               compression=None, atomic=False):
     """
     Function wrapper around the NASA Ames File classes. Any NASA Ames
     file can be opened through this function and the appropriate read or
     write NASA Ames File class instance is returned.
+
+    If use_mmap is True (read mode only) the data section is read through a memory
+    map, which suits random access to records with 'readRecords()'.
+
+    If cache_dir is set (read mode only) the parsed header and data are kept in
+    that directory (up to cache_size bytes) and are read from there when the
+    same unchanged file is opened again.
+
+    In read mode 'filename' can also be any binary or text file-like object,
+    such as an io.BytesIO buffer or a pipe. It is read once, in a single pass,
+    and the file is then parsed from memory.
+
+    In write mode the output is compressed if compression is "gzip", "bz2" or "xz"
+    (or if filename ends with ".gz", ".bz2" or ".xz"). If atomic is True the file
+    is written to a temporary file that replaces filename when it is closed, so
+    that a failed write never leaves a partly written file in its place.
     """
-    if mode == "r":
-        ffi = readFFI(filename, ignore_header_lines)
-        na_class = getNAFileClass(ffi)
-        return na_class(filename, ignore_header_lines, mode,
+    if mode == "r" and hasattr(filename, "read"):
+        # Read the stream once and parse both the FFI and the file from memory
+        buffer = io.BytesIO(nappy.utils.common_utils.readStream(filename))
+        na_class = getNAFileClass(readFFI(buffer, ignore_header_lines))
+
+        return na_class(buffer, ignore_header_lines, mode,
                         var_and_units_callback=var_and_units_callback)
 
+    elif mode == "r":
+        # Open the file once to read both the FFI and the header
+        fin = nappy.utils.common_utils.openFile(filename)
+
+        try:
+            ffi = readFFI(fin, ignore_header_lines)
+            na_class = getNAFileClass(ffi)
+        except Exception:
+            fin.close()
+            raise
+
+        return na_class(filename, ignore_header_lines, mode,
+                        var_and_units_callback=var_and_units_callback,
+                        use_mmap=use_mmap, file_handle=fin,
+                        cache_dir=cache_dir, cache_size=cache_size)
+
     elif mode == "w":
         if 'FFI' in na_dict and type(na_dict['FFI']) == type(3):
             ffi = na_dict['FFI']
@@ -164,21 +217,34 @@ def openNAFile(filename, mode="r", na_dict=None, ignore_header_lines=0,
             log.info("\nFormat identified as: %s" % ffi)
 
         na_class = getNAFileClass(ffi)
-        return na_class(filename, mode=mode, na_dict=na_dict)
+        return na_class(filename, mode=mode, na_dict=na_dict, compression=compression, atomic=atomic)
     else:
         raise Exception("File mode not recognised '" + mode + "'.")
 
 
+def openNAStreamWriter(filename, na_dict, delimiter=default_delimiter,
+                       float_format=default_float_format, annotation=False,
+                       compression=None, atomic=False):
+    """
+    Opens 'filename' for writing, writes the header defined by 'na_dict' and
+    returns an NAStreamWriter to which records can be appended as they arrive.
+    The compression and atomic arguments are as for openNAFile.
+    """
+    return nappy.na_file.na_stream_writer.NAStreamWriter(filename, na_dict, delimiter=delimiter,
+                                                         float_format=float_format, annotation=annotation,
+                                                         compression=compression, atomic=atomic)
+
+
 def convertNAToNC(na_file, nc_file=None, mode="w", variables=None, aux_variables=None,
                  global_attributes=None,
                  time_units=None, time_warning=True,
-                 rename_variables=None):
+                 rename_variables=None, x_range=None, chunk_size=None):
     """
     Takes a NASA Ames file and converts to a NetCDF file. Options are:
 
-    na_file - the input NASA Ames file.
+    na_file - the input NASA Ames file (a file name or a file-like object).
     nc_file - name for the output NetCDF file (default is to replace ".na" from NASA Ames 
-              file with ".nc").
+              file with ".nc"; required if na_file is a file-like object).
     mode - is the file mode, either "w" for write or "a" for append
     variables - is a list of variable names that you wish to be converted. If not set then 
               nappy will attempt to convert all files.
@@ -191,7 +257,14 @@ def convertNAToNC(na_file, nc_file=None, mode="w", variables=None, aux_variables
     time_units - is a valid time units string such as "hours since 2003-04-30 10:00:00" to 
               use for time units if there is a valid time axis.
     time_warning - suppresses the time units warning for invalid time units if set to False.
+    x_range - is a (start, end) tuple to only convert the records whose unbounded independent
+              variable value lies between start and end (inclusive).
+    chunk_size - if set, the data are read and written in chunks of up to this many records
+              through dask arrays so memory use is bounded (requires dask).
     """
+    if nc_file is None and hasattr(na_file, "read"):
+        raise Exception("The nc_file argument must be given when na_file is a file-like object.")
+
     global_attributes = global_attributes or []
     rename_variables = rename_variables or {}
 
@@ -239,8 +312,8 @@ def convertNAToCSV(na_file, csv_file=None, annotation=False, no_header=False):
 def convertNCToNA(nc_file, na_file=None, var_ids=None, na_items_to_override=None,
             only_return_file_names=False, exclude_vars=None,
             requested_ffi=None, delimiter=default_delimiter, float_format=default_float_format, 
-            size_limit=None, annotation=False, no_header=False,
-            ):
+            size_limit=None, annotation=False, no_header=False, workers=1,
+            compression=None, atomic=False, max_records=None, max_bytes=None):
     """
     Takes a NetCDF file and converts the contents to one or more NASA Ames files. 
     Arguments are:
@@ -262,18 +335,30 @@ def convertNCToNA(nc_file, na_file=None, var_ids=None, na_items_to_override=None
     delimiter - the delimiter you wish to use between data items in the output file such 
               as "   ", "\t" or ",".
     float_format - a python formatting string such as "%s", "%.10g" or "%5.2f" used for 
-              formatting floats when written to file.
+              formatting floats when written to file, or "shortest" to write each value
+              with the fewest digits that read back as exactly the same value.
     size_limit - if format FFI is 1001 then chop files up into size_limit rows of data.
     annotation - if set to True write the output file with an additional left-hand column 
               describing the contents of each header line.
     no_header - if set to True then only the data blocks are written to file.
+    workers - the number of processes used to write the files split by size_limit 
+              (default 1: written in this process; None for one per CPU).
+    compression - "gzip", "bz2" or "xz" to compress the output files (default is to 
+              compress them if na_file ends with ".gz", ".bz2" or ".xz").
+    atomic - if set to True each output file is written to a temporary file that is 
+              renamed to the output file name once it has been written completely.
+    max_records - split each output into files (volumes) of at most max_records records 
+              along the unbounded independent variable (for any FFI).
+    max_bytes - split each output into files (volumes) of at most max_bytes bytes (before 
+              any compression), judged from the exact size of the header and of each record.
     """
     na_items_to_override = na_items_to_override or {}
     exclude_vars = exclude_vars or []
 
     arg_dict = vars()
     for arg_out in ("na_file", "only_return_file_names", "delimiter", "float_format", 
-                    "size_limit", "annotation", "no_header"):
+                    "size_limit", "annotation", "no_header", "workers", "compression", "atomic",
+                    "max_records", "max_bytes"):
         del arg_dict[arg_out]
 
     if na_file == None:
@@ -288,7 +373,9 @@ def convertNCToNA(nc_file, na_file=None, var_ids=None, na_items_to_override=None
         return convertor.constructNAFileNames(na_file)
     else:
         convertor.writeNAFiles(na_file, delimiter=delimiter, float_format=float_format, 
-                               size_limit=size_limit, annotation=annotation, no_header=no_header)
+                               size_limit=size_limit, annotation=annotation, no_header=no_header,
+                               workers=workers, compression=compression, atomic=atomic,
+                               max_records=max_records, max_bytes=max_bytes)
         log.info(convertor.output_message)
         output_files_written = convertor.output_files_written
         log.info(output_files_written)
@@ -311,7 +398,7 @@ def convertNCToCSV(nc_file, csv_file=None, **arg_dict):
 def convertXarrayObjectsToNA(xr_vars, global_attributes, na_file, 
               na_items_to_override=None, requested_ffi=None, delimiter=default_delimiter, 
               float_format=default_float_format, size_limit=None, annotation=False, no_header=False,
-              ):
+              workers=1, compression=None, atomic=False, max_records=None, max_bytes=None):
     """
     Takes a list of Xarray variables and a list of global attributes and
     writes them to one or more NASA Ames files. Arguments are:
@@ -329,11 +416,22 @@ def convertXarrayObjectsToNA(xr_vars, global_attributes, na_file,
     delimiter - the delimiter you wish to use between data items in the output file 
                 such as "   ", "\t" or ",".
     float_format - a python formatting string such as "%s", "%.10g" or "%5.2f" used for 
-                formatting floats when written to file.
+                formatting floats when written to file, or "shortest" to write each value
+                with the fewest digits that read back as exactly the same value.
     size_limit - if format FFI is 1001 then chop files up into size_limit rows of data.
     annotation - if set to True write the output file with an additional left-hand 
                 column describing the contents of each header line.
     no_header - if set to True then only the data blocks are written to file.
+    workers - the number of processes used to write the files split by size_limit 
+                (default 1: written in this process; None for one per CPU).
+    compression - "gzip", "bz2" or "xz" to compress the output files (default is to 
+                compress them if na_file ends with ".gz", ".bz2" or ".xz").
+    atomic - if set to True each output file is written to a temporary file that is 
+                renamed to the output file name once it has been written completely.
+    max_records - split each output into files (volumes) of at most max_records records 
+                along the unbounded independent variable (for any FFI).
+    max_bytes - split each output into files (volumes) of at most max_bytes bytes (before 
+                any compression), judged from the exact size of the header and of each record.
     """
     na_items_to_override = na_items_to_override or {}
 
@@ -344,7 +442,9 @@ def convertXarrayObjectsToNA(xr_vars, global_attributes, na_file,
     convertor.convert()
 
     na_files = convertor.writeNAFiles(na_file, delimiter=delimiter, float_format=float_format, 
-                                      annotation=annotation, no_header=no_header)
+                                      size_limit=size_limit, annotation=annotation, no_header=no_header,
+                                      workers=workers, compression=compression, atomic=atomic,
+                                      max_records=max_records, max_bytes=max_bytes)
 
     return convertor.output_files_written 
 
@@ -370,7 +470,7 @@ def writeNADictToNC(na_dict, nc_file, mode="w"):
     na_file_obj.setNADict(na_dict)
 
     # Fake up some required methods
-    def fakeCaller():pass
+    def fakeCaller(**kwargs):pass
     na_file_obj.readData = fakeCaller
 
     import nappy.nc_interface.na_to_xarray
@@ -393,13 +493,15 @@ def writeNADictToNC(na_dict, nc_file, mode="w"):
     return True
 
 
-def readXarrayObjectsFromNA(na_file):
+def readXarrayObjectsFromNA(na_file, chunk_size=None):
     """
     Reads the NASA Ames file and converts to Xarray objects.
     Returns a tuple containing:
       * a list of primary NASA Ames variables as Xarray variables
       * a list of auxiliary NASA Ames variables as Xarray variables,
       * a list of global attributes
+    If 'chunk_size' is set then the variables are backed by dask arrays with
+    chunks of up to that many records, which are read when they are computed.
     """
     xr_var_list = []
     global_attributes = {}
@@ -408,7 +510,7 @@ def readXarrayObjectsFromNA(na_file):
     na_file_obj = openNAFile(na_file)
 
     import nappy.nc_interface.na_to_xarray
-    convertor = nappy.nc_interface.na_to_xarray.NADictToXarrayObjects(na_file_obj)
+    convertor = nappy.nc_interface.na_to_xarray.NADictToXarrayObjects(na_file_obj, chunk_size=chunk_size)
     (xr_vars_primary, xr_vars_aux, global_attributes) = convertor.convert()
 
     return (xr_vars_primary, xr_vars_aux, global_attributes)
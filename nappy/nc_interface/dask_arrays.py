@@ -0,0 +1,97 @@
+#   Copyright (C) 2004 CCLRC & NERC( Natural Environment Research Council ).
+#   This software may be distributed under the terms of the
+#   Q Public License, version 1.0 or later. http://ndg.nerc.ac.uk/public_docs/QPublic_license.txt
+
+"""
+dask_arrays.py
+==============
+
+Functions to build dask arrays of the variables in a NASA Ames file. Each
+chunk of a dask array is a range of records that is only read (by seeking
+straight to its first record) when the chunk is computed.
+
+Dask is an optional dependency that is only imported when these arrays are used.
+
+"""
+
+# Imports from nappy package
+import nappy
+
+
+def getRecordChunks(na_file_obj, chunk_size, x_range=None):
+    """
+    Returns a list of (offset, nrecords) tuples that split the records of
+    'na_file_obj' (or only those in 'x_range') into chunks of up to 'chunk_size'
+    records, where 'offset' is the byte offset of the first record in the file.
+    The record index is built if the file does not have one yet.
+    """
+    if chunk_size < 1:
+        raise Exception("The 'chunk_size' argument must be a positive integer.")
+
+    index = na_file_obj.record_index or na_file_obj.buildRecordIndex()
+
+    if x_range is None:
+        (start, end) = (0, len(index))
+    else:
+        (start, end) = index.findRecordRange(x_range)
+
+    return [(index.getOffset(first), min(chunk_size, end - first))
+            for first in range(start, end, chunk_size)]
+
+
+def createDaskArray(na_file_obj, chunks, var_number, is_aux=False):
+    """
+    Returns a dask array of the physical values (see NACore.getVariableValues)
+    of variable 'var_number' (or auxiliary variable if 'is_aux' is True) with
+    one block per item of 'chunks' (as returned by 'getRecordChunks').
+    """
+    try:
+        import dask
+        import dask.array
+    except ImportError:
+        raise Exception("Reading NASA Ames data as dask arrays requires dask to be installed.")
+
+    if na_file_obj.filename is None:
+        raise Exception("Dask arrays can only be read from NASA Ames files opened from a path.")
+
+    shape = getRecordShape(na_file_obj, is_aux=is_aux)
+    blocks = []
+    for (offset, nrecords) in chunks:
+        block = dask.delayed(readChunk, pure=True)(na_file_obj.filename, na_file_obj.ignore_header_lines,
+                                                   offset, nrecords, var_number, is_aux)
+        blocks.append(dask.array.from_delayed(block, shape=(nrecords,) + shape, dtype=float))
+
+    if not blocks:
+        return dask.array.empty((0,) + shape, dtype=float)
+
+    return dask.array.concatenate(blocks)
+
+
+def getRecordShape(na_file_obj, is_aux=False):
+    """
+    Returns the shape of the values of a variable (or auxiliary variable if
+    'is_aux' is True) in a single record of 'na_file_obj'.
+    """
+    # Variables of FFIs 2010, 3010 and 4010 have a block of NX values per record
+    if not is_aux and na_file_obj.NIV > 1:
+        return tuple(na_file_obj.NX)
+    return ()
+
+
+def readChunk(filename, ignore_header_lines, offset, nrecords, var_number, is_aux=False):
+    """
+    Opens 'filename' and returns the physical values of variable 'var_number'
+    (or auxiliary variable if 'is_aux' is True) in the 'nrecords' records
+    starting at byte 'offset'.
+    """
+    na_file_obj = nappy.openNAFile(filename, ignore_header_lines=ignore_header_lines)
+
+    try:
+        if is_aux:
+            na_file_obj.readDataAt(offset, nrecords, variables=[], aux_variables=[var_number])
+            return na_file_obj.getAuxVariableValues(var_number, in_place=True)
+
+        na_file_obj.readDataAt(offset, nrecords, variables=[var_number], aux_variables=[])
+        return na_file_obj.getVariableValues(var_number, in_place=True)
+    finally:
+        na_file_obj.close()
@@ -32,7 +32,7 @@ class NAToNC(nappy.nc_interface.na_to_xarray.NADictToXarrayObjects):
     def __init__(self, na_file, variables=None, aux_variables=None,
                  global_attributes=None,
                  time_units=None, time_warning=True, 
-                 rename_variables=None):
+                 rename_variables=None, x_range=None, chunk_size=None):
         """
         Sets up instance variables. Note that the argument 'na_file' has a relaxes definition
         and can be either a NASA Ames file object or the name of a NASA AMES file.
@@ -50,14 +50,18 @@ class NAToNC(nappy.nc_interface.na_to_xarray.NADictToXarrayObjects):
 
         # First open na_file if it is a file rather than an na_file object
         na_file_obj = na_file
-        if type(na_file_obj) == type("string"):
+        values_in_place = False
+        if type(na_file_obj) == type("string") or hasattr(na_file_obj, "read"):
             na_file_obj = nappy.openNAFile(na_file_obj)
+            # The file object is only used here so its data can be converted in place
+            values_in_place = True
 
         nappy.nc_interface.na_to_xarray.NADictToXarrayObjects.__init__(self, na_file_obj, variables=variables, 
                  aux_variables=aux_variables,
                  global_attributes=global_attributes,
                  time_units=time_units, time_warning=time_warning, 
-                 rename_variables=rename_variables)
+                 rename_variables=rename_variables, x_range=x_range,
+                 values_in_place=values_in_place, chunk_size=chunk_size)
 
 
     def fix_ints(self, dct, key):
@@ -18,7 +18,6 @@ import time
 import logging
 
 # Third-party libraries
-import numpy as np
 import xarray as xr
 
 # Import from nappy package
@@ -26,6 +25,7 @@ import nappy.utils
 import nappy.utils.common_utils
 
 from . import xarray_utils
+from . import dask_arrays
 
 
 config_dict = nappy.utils.getConfigDict()
@@ -68,9 +68,17 @@ class NADictToXarrayObjects:
     def __init__(self, na_file_obj, variables="all", aux_variables="all",
                  global_attributes=None,
                  time_units=None, time_warning=True, 
-                 rename_variables=None):
+                 rename_variables=None, x_range=None, values_in_place=False,
+                 chunk_size=None):
         """
-        Sets up instance variables.
+        Sets up instance variables. If 'x_range' is a (start, end) tuple then only
+        the records with unbounded independent variable values in that range are converted.
+        If 'values_in_place' is True then the data arrays of 'na_file_obj' are
+        replaced by their physical (scaled and masked) values as they are
+        converted, rather than copied, to save memory.
+        If 'chunk_size' is set then the variables are backed by dask arrays
+        with chunks of up to 'chunk_size' records that are only read from the
+        file when they are computed (this requires dask).
         """
         if global_attributes is None:
             global_attributes = []
@@ -85,6 +93,9 @@ class NADictToXarrayObjects:
         self.time_units = time_units
         self.time_warning = time_warning
         self.rename_variables = {key.lower(): value for key, value in rename_variables.items()}
+        self.x_range = x_range
+        self.values_in_place = values_in_place
+        self.chunk_size = chunk_size
 
         # Check if we have capability to convert this FFI
         if self.na_file_obj.FFI in (2110, 2160, 2310): 
@@ -105,7 +116,7 @@ class NADictToXarrayObjects:
             log.info("Already converted to Xarray objects so not re-doing.")
             return (self.xr_variables, self.xr_aux_variables, self.global_attributes)
 
-        self.na_file_obj.readData()
+        self._readData()
 
         # Convert global attribute
         self._mapNACommentsToGlobalAttributes()
@@ -129,6 +140,45 @@ class NADictToXarrayObjects:
         self.converted = True
         return (self.xr_variables, self.xr_aux_variables, self.global_attributes)
 
+    def _readData(self):
+        """
+        Reads the data needed for the conversion from the NASA Ames file object.
+        """
+        if self.chunk_size:
+            # Only read the independent variables now, the rest is read by dask chunk by chunk
+            self.na_file_obj.readData(variables=[], aux_variables=[], x_range=self.x_range)
+            self._record_chunks = dask_arrays.getRecordChunks(self.na_file_obj, self.chunk_size,
+                                                              x_range=self.x_range)
+        else:
+            # Only read the data for the variables that will be converted
+            self.na_file_obj.readData(variables=self.variables, aux_variables=self._getKnownAuxVariables(),
+                                      x_range=self.x_range)
+
+    def _getVariableArray(self, var_number, is_aux=False):
+        """
+        Returns the array of physical values of a variable (or auxiliary variable
+        if 'is_aux' is True) to use as the data of its Xarray variable.
+        """
+        if self.chunk_size:
+            return dask_arrays.createDaskArray(self.na_file_obj, self._record_chunks, var_number, is_aux=is_aux)
+
+        if is_aux:
+            return self.na_file_obj.getAuxVariableValues(var_number, in_place=self.values_in_place)
+        return self.na_file_obj.getVariableValues(var_number, in_place=self.values_in_place)
+
+    def _getKnownAuxVariables(self):
+        """
+        Returns the auxiliary variable selection with any names (or numbers) that
+        are not in the file removed, since these are ignored when converting.
+        """
+        if self.aux_variables in (None, "all"):
+            return self.aux_variables
+
+        anames = self.na_file_obj.ANAME or []
+        nauxv = self.na_file_obj.NAUXV or 0
+        return [avar for avar in self.aux_variables
+                if (isinstance(avar, int) and avar < nauxv) or avar in anames]
+
     def _mapNACommentsToGlobalAttributes(self):
         """
         Maps the NASA Ames comments section to global attributes and append them to the 
@@ -256,12 +306,7 @@ class NADictToXarrayObjects:
         log.debug(msg)
         self.output_message.append(msg)
 
-        array = np.array(self.na_file_obj.V[var_number])
-
-        if miss:
-            array = np.ma.masked_array(array, fill_value=miss)
-
-        array = array * scal
+        array = self._getVariableArray(var_number)
 
         # Set up axes
         if not hasattr(self, 'xr_axes'):
@@ -326,11 +371,7 @@ class NADictToXarrayObjects:
              
         (var_name, units, miss, scal) = self.na_file_obj.getAuxVariable(avar_number)
 
-        array = np.array(self.na_file_obj.A[avar_number])
-        if miss:
-            array = np.ma.masked_array(array, fill_value=miss)
-
-        array = array * scal
+        array = self._getVariableArray(avar_number, is_aux=True)
 
         msg="\nAdding auxiliary variable: %s" % self.na_file_obj.ANAME[avar_number]
         log.debug(msg)
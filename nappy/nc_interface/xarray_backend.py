@@ -0,0 +1,155 @@
+#   Copyright (C) 2004 CCLRC & NERC( Natural Environment Research Council ).
+#   This software may be distributed under the terms of the
+#   Q Public License, version 1.0 or later. http://ndg.nerc.ac.uk/public_docs/QPublic_license.txt
+
+"""
+xarray_backend.py
+=================
+
+Xarray backend that opens NASA Ames files with:
+
+    xr.open_dataset("file.na", engine="nasaames")
+
+The dataset is built by NADictToXarrayObjects but only the independent
+variables are read when it is opened. The values of each variable are read
+from the file, for the records requested, when they are indexed or loaded.
+
+"""
+
+# Imports from python standard library
+import os
+
+# Third-party libraries
+import numpy as np
+import xarray as xr
+from xarray.backends import BackendArray, BackendEntrypoint
+from xarray.core import indexing
+
+# Import from nappy package
+import nappy
+import nappy.nc_interface.na_to_xarray
+
+from . import dask_arrays
+
+
+na_file_extensions = (".na", ".nas")
+
+
+class NASAAmesBackendArray(BackendArray):
+    """
+    Lazily read array of the physical values of a NASA Ames variable. Indexing
+    it only parses the range of records that holds the requested values.
+    """
+
+    def __init__(self, na_file_obj, start, nrecords, var_number, is_aux=False):
+        """
+        Sets up the array for variable 'var_number' (or auxiliary variable if
+        'is_aux' is True) over the 'nrecords' records from record 'start'.
+        Uses the record index of 'na_file_obj' to find the records.
+        """
+        self.filename = na_file_obj.filename
+        self.ignore_header_lines = na_file_obj.ignore_header_lines
+        self.record_index = na_file_obj.record_index
+        self.start = start
+        self.var_number = var_number
+        self.is_aux = is_aux
+        self.shape = (nrecords,) + dask_arrays.getRecordShape(na_file_obj, is_aux=is_aux)
+        self.dtype = np.dtype(float)
+
+    def __getitem__(self, key):
+        return indexing.explicit_indexing_adapter(key, self.shape, indexing.IndexingSupport.BASIC,
+                                                  self._getItems)
+
+    def _getItems(self, key):
+        """
+        Returns the values for a tuple of integers and slices by reading the
+        records from the first to the last one selected by its first item.
+        """
+        records = range(self.shape[0])[key[0]]
+
+        if isinstance(records, int):
+            (first, last, local) = (records, records, 0)
+        elif len(records) == 0:
+            (first, last, local) = (0, -1, slice(0, 0))
+        else:
+            (first, last) = (min(records), max(records))
+            stop = records.stop - first
+            local = slice(records.start - first, stop if stop >= 0 else None, records.step)
+
+        values = dask_arrays.readChunk(self.filename, self.ignore_header_lines,
+                                       self.record_index.getOffset(self.start + first),
+                                       last - first + 1, self.var_number, self.is_aux)
+        return values[(local,) + tuple(key[1:])]
+
+
+class NADictToLazyXarrayObjects(nappy.nc_interface.na_to_xarray.NADictToXarrayObjects):
+    """
+    Converts a NA File instance to Xarray objects whose variables are backed by
+    NASAAmesBackendArray objects, so their values are only read when needed.
+    """
+
+    def _readData(self):
+        """
+        Reads the independent variables and finds the range of records to convert.
+        """
+        self.na_file_obj.readData(variables=[], aux_variables=[], x_range=self.x_range)
+        index = self.na_file_obj.record_index or self.na_file_obj.buildRecordIndex()
+
+        if self.x_range is None:
+            self._record_range = (0, len(index))
+        else:
+            self._record_range = index.findRecordRange(self.x_range)
+
+    def _getVariableArray(self, var_number, is_aux=False):
+        """
+        Returns a lazily indexed array of the physical values of a variable.
+        """
+        (start, end) = self._record_range
+        array = NASAAmesBackendArray(self.na_file_obj, start, end - start, var_number, is_aux=is_aux)
+        return indexing.LazilyIndexedArray(array)
+
+
+class NASAAmesBackendEntrypoint(BackendEntrypoint):
+    """
+    Xarray backend entrypoint for NASA Ames files (engine="nasaames").
+    """
+    description = "Open NASA Ames files in Xarray using nappy"
+    url = "https://github.com/cedadev/nappy"
+    open_dataset_parameters = ("filename_or_obj", "drop_variables", "decode_times",
+                               "x_range", "ignore_header_lines")
+
+    def open_dataset(self, filename_or_obj, *, drop_variables=None, decode_times=True,
+                     x_range=None, ignore_header_lines=0):
+        """
+        Returns a Dataset of the NASA Ames file 'filename_or_obj'. The variables
+        named in 'drop_variables' are left out and never read. If 'x_range' is
+        a (start, end) tuple then only the records in that range are included.
+        """
+        na_file_obj = nappy.openNAFile(os.fspath(filename_or_obj), ignore_header_lines=ignore_header_lines)
+
+        convertor = NADictToLazyXarrayObjects(na_file_obj, x_range=x_range, time_warning=False)
+        (xr_vars, xr_aux_vars, global_attributes) = convertor.convert()
+
+        if isinstance(drop_variables, str):
+            drop_variables = [drop_variables]
+        drop_variables = set(drop_variables or [])
+
+        variables = {var.name: var for var in xr_vars + xr_aux_vars if var.name not in drop_variables}
+        ds = xr.Dataset(variables, attrs=dict(global_attributes))
+
+        if decode_times:
+            ds = xr.decode_cf(ds, mask_and_scale=False, decode_times=True)
+
+        ds.set_close(na_file_obj.close)
+        return ds
+
+    def guess_can_open(self, filename_or_obj):
+        """
+        Returns True if 'filename_or_obj' is a path with a NASA Ames file extension.
+        """
+        try:
+            extension = os.path.splitext(os.fspath(filename_or_obj))[1]
+        except TypeError:
+            return False
+
+        return extension.lower() in na_file_extensions
@@ -11,6 +11,7 @@ Holds the class XarrayToNA that converts a set of Xarray variables (DataArrays)
 """
 
 # Imports from python standard library
+import io
 import sys
 import logging
 
@@ -20,9 +21,12 @@ import numpy as np
 # Import from nappy package
 import nappy
 import nappy.utils
-from nappy.utils.common_utils import modifyNADictCopy, get_rank_zero_array_value
+from nappy.utils.common_utils import get_rank_zero_array_value, getNADictRecordCount, sliceNADictRecords
 
 import nappy.na_file.na_core
+import nappy.utils.common_utils
+import nappy.utils.parallel
+import nappy.utils.text_parser
 
 from . import xarray_utils
 from . import na_content_collector
@@ -227,12 +231,19 @@ class XarrayToNA:
         return file_names
 
     def writeNAFiles(self, na_file=None, delimiter=default_delimiter, annotation=False,
-                     float_format=default_float_format, size_limit=None, no_header=False):
+                     float_format=default_float_format, size_limit=None, no_header=False,
+                     workers=1, compression=None, atomic=False, max_records=None, max_bytes=None):
         """
         Writes the self.na_dict_list content to one or more NASA Ames files.
         Output file names are based on the self.nc_file name unless specified
         in the na_file_name argument in which case that provides the main name
         that is appended to if multiple output file names are required.
+        An output is split into volumes (along the unbounded independent variable)
+        so that each holds no more than 'max_records' records (or 'size_limit'
+        rows for FFI 1001) and is no bigger than 'max_bytes' bytes (uncompressed).
+        The volumes are written in this process unless 'workers' is more than 1
+        (or None for one per CPU), when they are written by worker processes.
+        The 'compression' and 'atomic' arguments are passed to nappy.openNAFile.
         """
         if not self.converted: 
             self.convert()
@@ -308,18 +319,22 @@ class XarrayToNA:
             if add_column_headers:
                 self._updateWithColumnHeaders(this_na_dict, delimiter)
         
-            # Cope with size limits if specified and FFI is 1001
-            # Seems to be writing different chunks of a too long array to different na_dicts to then write to separate files.
-            if size_limit is not None and (this_na_dict["FFI"] == 1001 and len(this_na_dict["V"][0]) > size_limit):
-                files_written = self._writeNAFileSubsetsWithinSizeLimit(this_na_dict, file_name, delimiter=delimiter,
-                                                                        float_format=float_format, size_limit=size_limit,
-                                                                        annotation=annotation)
+            # Cope with size limits if specified by writing chunks of the records to separate files
+            write_options = {"delimiter": delimiter, "float_format": float_format,
+                             "annotation": annotation, "no_header": no_header}
+            volume_bounds = self._getVolumeBounds(this_na_dict, write_options, size_limit=size_limit,
+                                                  max_records=max_records, max_bytes=max_bytes)
+
+            if len(volume_bounds) > 1:
+                files_written = self._writeNAFileSubsetsWithinSizeLimit(this_na_dict, file_name, volume_bounds,
+                                                                        write_options, workers=workers,
+                                                                        compression=compression, atomic=atomic)
                 file_list.extend(files_written)
 
             # If not having to split file into multiple outputs (normal condition)
             else:		
                 log.info("Output NA file name: %s" % file_name)
-                x = nappy.openNAFile(file_name, 'w', this_na_dict)
+                x = nappy.openNAFile(file_name, 'w', this_na_dict, compression=compression, atomic=atomic)
                 x.write(delimiter=delimiter, float_format=float_format,
                         no_header=no_header, annotation=annotation)
 
@@ -364,58 +379,84 @@ class XarrayToNA:
 
         return self.output_message
 
-    def _writeNAFileSubsetsWithinSizeLimit(self, this_na_dict, file_name, delimiter, 
-                      float_format, size_limit, annotation):
+    def _getVolumeBounds(self, na_dict, write_options, size_limit=None, max_records=None, max_bytes=None):
         """
-        If self.size_limit is specified and FFI is 1001 we can chunk the output into 
-        different files in a NASA Ames compliant way. 
+        Returns a list of the (start, end) records of each volume of the output
+        of 'na_dict' so that each holds no more than 'max_records' records (or
+        'size_limit' for FFI 1001) and is no bigger than 'max_bytes' bytes when
+        written with 'write_options'. The volumes are planned, before anything
+        is written, from the exact size of the header and of each record.
+        """
+        nrecords = getNADictRecordCount(na_dict)
+        limits = [nrecords]
+
+        if size_limit is not None and na_dict["FFI"] == 1001:
+            limits.append(size_limit)
+
+        if max_records is not None:
+            limits.append(max_records)
+
+        volume_records = max(1, min(limits))
+
+        if max_bytes is None or nrecords == 0:
+            return [(start, min(start + volume_records, nrecords))
+                    for start in range(0, nrecords, volume_records)] or [(0, 0)]
+
+        (header_bytes, record_sizes) = _getNAFileSizes(na_dict, write_options)
+        bounds = []
+        (start, volume_bytes) = (0, header_bytes)
+
+        for (m, record_bytes) in enumerate(record_sizes):
+            if header_bytes + record_bytes > max_bytes:
+                raise Exception(f"Cannot split output into files of at most {max_bytes} bytes: the header "
+                                f"and record {m + 1} take up to {header_bytes + record_bytes} bytes.")
+
+            # Start a new volume when this record would not fit in the current one
+            if m - start == volume_records or volume_bytes + record_bytes > max_bytes:
+                bounds.append((start, m))
+                (start, volume_bytes) = (m, header_bytes)
+
+            volume_bytes += record_bytes
+
+        bounds.append((start, nrecords))
+        return bounds
+
+    def _writeNAFileSubsetsWithinSizeLimit(self, this_na_dict, file_name, volume_bounds, write_options,
+                                           workers=1, compression=None, atomic=False):
+        """
+        Chunks the output into different files holding the (start, end) records in
+        'volume_bounds' (along the unbounded independent variable) in a NASA Ames
+        compliant way, setting IVOL and NVOL in each. The volumes are written in
+        parallel by 'workers' processes (one per CPU if None) if it is not 1.
         Returns list of file names of outputs written.
         """
-        file_names = []
-        var_list = this_na_dict["V"]
-        array_length = len(var_list[0])
-        nvol_info = divmod(array_length, size_limit)
-        nvol = nvol_info[0]
-
-        # create the number of volumes (files) that need to be written.
-        if nvol_info[1] > 0: nvol = nvol + 1
-
-        start = 0
-        letter_count = 0
-        ivol = 0
-
-        # Loop through until full array length has been written to a set of files.
-        while start < array_length:
-            ivol = ivol + 1
-            end = start + size_limit
-
-            if end > array_length:
-                end = array_length
-
-            current_block = []
-            # Write new V array
-            for v in var_list:
-                current_block.append(v[start:end])
-
-            # Adjust X accordingly in the na dictionary, because independent variable has been reduced in size
-            na_dict_copy = modifyNADictCopy(this_na_dict, current_block, 
-                                                                      start, end, ivol, nvol)
-            # Append a letter to the file name for writing this block to
-            file_name_plus_letter = f"{file_name[:-3]}-{ivol:03d}.na"
-            file_names.append(file_name_plus_letter)
-
-            # Write data to output file
-            x = nappy.openNAFile(file_name_plus_letter, 'w', na_dict_copy)
-            x.write(delimiter=delimiter, float_format=float_format, annotation=annotation)
-            x.close()
-
-            msg = "\nOutput files split on size limit: %s\nFilename used: %s" % (size_limit, file_name_plus_letter)
+        # Take each volume as a view of the arrays rather than a copy of the lists
+        na_dict = _asRecordArrays(this_na_dict)
+        nvol = len(volume_bounds)
+
+        open_options = {"compression": compression, "atomic": atomic}
+        volumes = []
+
+        # Keep the extension of a compressed output file at the end of the volume file names
+        (base_name, compressed_extension) = (file_name, "")
+        for (name, extension, module_name) in nappy.utils.common_utils.output_compressions:
+            if file_name.endswith(extension):
+                (base_name, compressed_extension) = (file_name[:-len(extension)], extension)
+
+        for (ivol, (start, end)) in enumerate(volume_bounds, 1):
+            na_dict_copy = sliceNADictRecords(na_dict, start, end, ivol, nvol)
+
+            # Append the volume number to the file name for writing this block to
+            file_name_plus_number = f"{base_name[:-3]}-{ivol:03d}.na{compressed_extension}"
+            volumes.append((file_name_plus_number, na_dict_copy, open_options, write_options))
+
+        nappy.utils.parallel.mapInProcesses(_writeNAFileVolume, volumes, workers=workers, chunksize=1)
+        file_names = [volume[0] for volume in volumes]
+
+        for (file_name_plus_number, (start, end)) in zip(file_names, volume_bounds):
+            msg = "\nOutput files split on size limit: %s\nFilename used: %s" % (end - start, file_name_plus_number)
             if DEBUG: log.debug(msg)
             self.output_message.append(msg)
-            letter_count = letter_count + 1
-            start = end
-
-            file_names.append(file_name_plus_letter) 
 
         return file_names
 
@@ -534,3 +575,120 @@ class XarrayDatasetToNA(XarrayToNA):
                          only_return_file_names=only_return_file_names,
                          requested_ffi=requested_ffi)
 
+
+def _asArray(values):
+    """
+    Returns a list of numbers as a numpy array, so that it can be sliced
+    without copying. Other values are returned unchanged.
+    """
+    try:
+        array = np.asarray(values)
+    except ValueError:
+        # Lists of lists of different lengths
+        return values
+
+    if array.dtype.kind in "iuf":
+        return array
+    return values
+
+
+def _asRecordArrays(na_dict):
+    """
+    Returns a copy of 'na_dict' in which the data that hold one item per
+    record are numpy arrays (where possible) so that they can be sliced
+    without copying.
+    """
+    new_dict = dict(na_dict, V=[_asArray(v) for v in na_dict["V"]])
+
+    if "A" in na_dict:
+        new_dict["A"] = [_asArray(a) for a in na_dict["A"]]
+
+    if na_dict["FFI"] in (2010, 3010, 4010):
+        new_dict["X"] = [_asArray(na_dict["X"][0])] + list(na_dict["X"][1:])
+    elif na_dict["FFI"] not in (2110, 2160, 2310):
+        new_dict["X"] = _asArray(na_dict["X"])
+
+    return new_dict
+
+
+def _getNAFileSize(na_dict, write_options):
+    """
+    Returns the number of bytes in the NASA Ames file written from 'na_dict'
+    with 'write_options' (the arguments to the write method).
+    """
+    output = io.StringIO()
+    na_class = nappy.utils.common_utils.getNAFileClass(na_dict["FFI"])
+    na_file = na_class(None, mode="w", na_dict=na_dict, file_handle=output)
+    na_file.write(**write_options)
+
+    size = len(output.getvalue().encode(nappy.utils.text_parser.default_encoding))
+    na_file.close()
+    return size
+
+
+def _getNAFileSizes(na_dict, write_options, block_size=1000):
+    """
+    Returns the number of bytes taken by the header and a list of the number
+    of bytes taken by each record when 'na_dict' is written with
+    'write_options'. The header is written with the largest IVOL and NVOL it
+    could have and the data section is formatted in memory 'block_size'
+    records at a time, keeping only the size of each record.
+    """
+    nrecords = getNADictRecordCount(na_dict)
+    data_options = dict(write_options, no_header=True)
+    record_dict = _asRecordArrays(na_dict)
+    record_sizes = []
+
+    for start in range(0, nrecords, block_size):
+        block = sliceNADictRecords(record_dict, start, min(start + block_size, nrecords))
+        record_sizes.extend(_getRecordSizes(block, data_options))
+
+    header_bytes = 0
+    if not write_options.get("no_header"):
+        first_record = sliceNADictRecords(na_dict, 0, 1, nrecords, nrecords)
+        header_bytes = _getNAFileSize(first_record, write_options) - _getNAFileSize(first_record, data_options)
+
+    return (header_bytes, record_sizes)
+
+
+def _getRecordSizes(na_dict, data_options):
+    """
+    Returns a list of the number of bytes taken by each record of 'na_dict'
+    when its data section is written with 'data_options'.
+    """
+    encoding = nappy.utils.text_parser.default_encoding
+
+    output = io.StringIO()
+    na_class = nappy.utils.common_utils.getNAFileClass(na_dict["FFI"])
+    na_file = na_class(None, mode="w", na_dict=na_dict, file_handle=output)
+    na_file.write(**data_options)
+    line_counts = na_file._getRecordLineCounts()
+
+    # Split the lines of the data section into the records they were written from
+    lines = output.getvalue().split("\n")[:-1]
+    na_file.close()
+
+    if sum(line_counts) != len(lines):
+        raise Exception(f"Cannot get the size of each record: expected {sum(line_counts)} lines "
+                        f"of data but {len(lines)} were written.")
+
+    record_sizes = []
+    start = 0
+    for count in line_counts:
+        record_sizes.append(sum([len(line.encode(encoding)) + 1 for line in lines[start:start + count]]))
+        start += count
+
+    return record_sizes
+
+
+def _writeNAFileVolume(volume):
+    """
+    Writes a volume given as a (file_name, na_dict, open_options, write_options)
+    tuple to a NASA Ames file, where the options are the keyword arguments to
+    nappy.openNAFile and to the write method. Defined at module level so that
+    it can be called in a worker process.
+    """
+    (file_name, na_dict, open_options, write_options) = volume
+    x = nappy.openNAFile(file_name, 'w', na_dict, **open_options)
+    x.write(**write_options)
+    x.close()
@@ -17,6 +17,8 @@ Usage
              [-d <delimiter>] [-l <limit_ffi_1001_rows>]
              [-e <exclude_vars>] [--overwrite-metadata=<key1>,<value1>[,<key2>,<value2>[...]]]
              [--names-only] [--no-header] [--annotated]
+             [--compression=<compression>] [--atomic]
+             [--max-records=<max_records>] [--max-bytes=<max_bytes>]
              -i <nc_file> [-o <na_file>]
 Where
 -----
@@ -35,6 +37,11 @@ Where
     --names-only		- only display a list of file names that would be written (i.e. don't convert actual files).
     --no-header			- Do not write NASA Ames header
     --annotated			- add annotation column in first column
+    <compression>		- compress the output files with "gzip", "bz2" or "xz" (by default the output
+                                  is compressed if <na_file> ends with ".gz", ".bz2" or ".xz").
+    --atomic			- write each output file to a temporary file and rename it when it is complete
+    <max_records>		- split the output into files of at most <max_records> records (for any FFI).
+    <max_bytes>			- split the output into files of at most <max_bytes> bytes (before compression).
 
 """
 
@@ -74,11 +81,16 @@ def parseArgs(args):
     a["na_file"] = None
     a["no_header"] = False
     a["annotation"] = False
+    a["compression"] = None
+    a["atomic"] = False
+    a["max_records"] = None
+    a["max_bytes"] = None
 
     try:
         (arg_list, dummy) = getopt.getopt(args, "i:o:v:f:d:l:e:",
                               ["ffi=", "overwrite-metadata=", "names-only",
-                               "no-header", "annotated"])
+                               "no-header", "annotated", "compression=", "atomic",
+                               "max-records=", "max-bytes="])
     except getopt.GetoptError as e:
         exitNicely(str(e))
 
@@ -107,6 +119,14 @@ def parseArgs(args):
             a["no_header"] = True
         elif arg == "--annotated":
             a["annotation"] = True
+        elif arg == "--compression":
+            a["compression"] = value
+        elif arg == "--atomic":
+            a["atomic"] = True
+        elif arg == "--max-records":
+            a["max_records"] = int(value)
+        elif arg == "--max-bytes":
+            a["max_bytes"] = int(value)
         else:
             exitNicely("Argument '" + arg + "' not recognised!")
 
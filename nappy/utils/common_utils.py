@@ -11,8 +11,11 @@ Functions and classes commonly used in nappy.
 """
 
 # Standard library imports
-from io import StringIO
+from io import StringIO, TextIOWrapper
+import importlib
 import logging
+import os
+import uuid
 
 # Imports from local package
 from nappy import __version__
@@ -21,6 +24,19 @@ from nappy.utils import text_parser
 
 log = logging.getLogger(__name__)
 
+# Magic numbers at the start of compressed files and the modules that read them
+compression_types = ((b"\x1f\x8b", "gzip"), (b"BZh", "bz2"), (b"\xfd7zXZ\x00", "lzma"))
+
+# Classes of the file objects that the compression modules open
+compression_classes = (("gzip", "GzipFile"), ("bz2", "BZ2File"), ("lzma", "LZMAFile"))
+
+# Compressions that can be written, their file name extensions and the modules that write them
+output_compressions = (("gzip", ".gz", "gzip"), ("bz2", ".bz2", "bz2"), ("xz", ".xz", "lzma"))
+
+# Options for writing compressed files (gzip level 6 is much quicker than the default 9
+# and the files are only slightly bigger)
+compression_write_options = {"gzip": {"compresslevel": 6}}
+
 
 def getNAFileClass(ffi):
     """
@@ -32,22 +48,162 @@ def getNAFileClass(ffi):
     return eval("%s.%s" % (mod, cls))
    
 
-def readFFI(filename, ignore_header_lines):
+def getCompression(filename):
+    """
+    Returns the name of the module ("gzip", "bz2" or "lzma") that decompresses
+    the file 'filename', or None if it is not compressed.
+    """
+    with open(filename, "rb") as fin:
+        return _getCompressionFromStart(fin.read(6))
+
+
+def getStreamCompression(stream):
+    """
+    Returns the name of the module ("gzip", "bz2" or "lzma") that decompresses
+    the file-like object 'stream' (as returned by openFile), or None if it is
+    not compressed.
+    """
+    stream = getattr(stream, "buffer", stream)
+
+    for (module_name, class_name) in compression_classes:
+        if isinstance(stream, getattr(importlib.import_module(module_name), class_name)):
+            return module_name
+
+    return None
+
+
+def _getCompressionFromStart(start):
+    "Returns the module name for data starting with the bytes 'start' (None if not compressed)."
+    for (magic_number, module_name) in compression_types:
+        if start.startswith(magic_number):
+            return module_name
+
+    return None
+
+
+def getOutputCompression(filename, compression=None):
+    """
+    Returns the name of the module ("gzip", "bz2" or "lzma") that compresses
+    output written to 'filename', or None if it is not compressed. The
+    'compression' can be "gzip", "bz2" or "xz", otherwise it is taken from
+    the file name extension (".gz", ".bz2" or ".xz").
+    """
+    for (name, extension, module_name) in output_compressions:
+        if compression == name:
+            return module_name
+        elif compression is None and str(filename).endswith(extension):
+            return module_name
+
+    if compression is not None:
+        raise Exception("Unknown compression '%s', must be one of: %s." %
+                        (compression, ", ".join([item[0] for item in output_compressions])))
+
+    return None
+
+
+def getTempFileName(filename):
+    """
+    Returns the name of a new hidden file, in the same directory as 'filename',
+    that can be written to and then renamed to 'filename' in one step.
+    """
+    (dir_name, base_name) = os.path.split(os.path.abspath(filename))
+    return os.path.join(dir_name, ".%s.%s.tmp" % (base_name, uuid.uuid4().hex[:12]))
+
+
+def openFile(filename, mode="r", compression=None):
+    """
+    Opens 'filename' like the builtin open function but, when reading, files
+    compressed with gzip, bz2 or xz are detected and decompressed as a stream
+    (or with the module named by 'compression' if it is already known).
+    When writing, the output is compressed with the module named by
+    'compression' (see getOutputCompression), if any.
+    """
+    if "r" not in mode:
+        if compression is None:
+            return open(filename, mode)
+
+        if "b" not in mode:
+            mode = mode + "t"
+
+        return importlib.import_module(compression).open(filename, mode,
+                                                         **compression_write_options.get(compression, {}))
+
+    if compression is None:
+        # Check for compression through the handle that is returned if the file is not compressed
+        fin = open(filename, "rb")
+        try:
+            compression = _getCompressionFromStart(fin.read(6))
+            fin.seek(0)
+        except Exception:
+            fin.close()
+            raise
+
+        if compression is None:
+            return fin if "b" in mode else TextIOWrapper(fin)
+
+        fin.close()
+
+    if "b" not in mode:
+        mode = mode + "t"
+
+    return importlib.import_module(compression).open(filename, mode)
+
+
+def readStream(stream):
+    """
+    Reads the whole of the binary or text file-like object 'stream' in one
+    pass and returns its content as bytes (decompressed if it was compressed
+    with gzip, bz2 or xz).
+    """
+    data = stream.read()
+
+    if isinstance(data, str):
+        data = data.encode(text_parser.default_encoding)
+
+    compression = _getCompressionFromStart(data)
+
+    if compression is not None:
+        return importlib.import_module(compression).decompress(data)
+
+    return data
+
+
+def readFFI(filename, ignore_header_lines=0):
     """
     Function to read the top line of a NASA Ames file to extract
     the File Format Index (FFI) and return it as an integer.
+    The 'filename' argument can also be an open (binary or text) file handle.
+    If it is seekable it is moved back to where it started after the top line
+    is read, otherwise the lines read are used up.
     """
-    with open(filename) as fin:
-        for i in range(ignore_header_lines):
-            fin.readline()
-        topline = fin.readline()
-        nextline = fin.readline()
+    if hasattr(filename, "readline"):
+        fin = filename
+
+        if fin.seekable():
+            position = fin.tell()
+            topline = _readTopLine(fin, ignore_header_lines)
+            fin.seek(position)
+        else:
+            topline = _readTopLine(fin, ignore_header_lines)
+
+        if isinstance(topline, bytes):
+            topline = topline.decode(text_parser.default_encoding)
+    else:
+        with openFile(filename) as fin:
+            topline = _readTopLine(fin, ignore_header_lines)
 
     ffi = text_parser.readItemsFromLine(topline, 2, int)[-1]
 
     return ffi
 
 
+def _readTopLine(fin, ignore_header_lines):
+    "Returns the top line of a NASA Ames file after skipping any ignored lines."
+    for i in range(ignore_header_lines):
+        fin.readline()
+    return fin.readline()
+
+
 def chooseFFI(na_dict):
     """
     Function to choose the appropriate FFI based on the contents of the
@@ -127,6 +283,49 @@ def modifyNADictCopy(indict, v_new, start, end, ivol, nvol):
     return newDict
 
 
+def getNADictRecordCount(na_dict):
+    """
+    Returns the number of records (values of the unbounded independent
+    variable) held in the data of 'na_dict'.
+    """
+    if na_dict["FFI"] in (2010, 3010, 4010):
+        return len(na_dict["X"][0])
+    return len(na_dict["X"])
+
+
+def sliceNADictRecords(na_dict, start, end, ivol=None, nvol=None):
+    """
+    Returns a copy of 'na_dict' that only holds the data of records 'start' to
+    'end' (along the unbounded independent variable), with IVOL and NVOL set
+    to 'ivol' and 'nvol' if given. The data are sliced, not copied.
+    """
+    ffi = na_dict["FFI"]
+    new_dict = dict(na_dict)
+
+    if ffi in (2010, 3010, 4010):
+        new_dict["X"] = [na_dict["X"][0][start:end]] + list(na_dict["X"][1:])
+    else:
+        new_dict["X"] = na_dict["X"][start:end]
+
+    # FFI 1020 holds NVPM values of each variable in each record
+    nvpm = na_dict["NVPM"] if ffi == 1020 else 1
+    new_dict["V"] = [v[start * nvpm:end * nvpm] for v in na_dict["V"]]
+
+    if "A" in na_dict:
+        new_dict["A"] = [a[start:end] for a in na_dict["A"]]
+
+    # These FFIs hold the length of the bounded independent variable of each record
+    if ffi in (2110, 2160, 2310):
+        new_dict["NX"] = na_dict["NX"][start:end]
+
+    if ivol is not None:
+        new_dict["IVOL"] = ivol
+    if nvol is not None:
+        new_dict["NVOL"] = nvol
+
+    return new_dict
+
+
 def getVersion():
     """
     Gets config dict for version.
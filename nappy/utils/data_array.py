@@ -0,0 +1,84 @@
+#   Copyright (C) 2004 CCLRC & NERC( Natural Environment Research Council ).
+#   This software may be distributed under the terms of the
+#   Q Public License, version 1.0 or later. http://ndg.nerc.ac.uk/public_docs/QPublic_license.txt
+
+"""
+data_array.py
+=============
+
+Holds the FloatArray class used to store the values read from the data
+section of a NASA Ames file.
+
+"""
+
+# Imports from python standard library
+import array
+
+
+class FloatArray(array.array):
+    """
+    A contiguous array of C doubles (8 bytes per value, rather than a list of
+    Python floats) that can be used in place of a list of floats. It supports
+    indexing, slicing, iteration, append and extend, converts directly to a
+    NumPy array and compares equal to a list holding the same values. Like a
+    list it can also be sorted, added to a list and assigned a list to a slice.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, values=()):
+        return array.array.__new__(cls, "d", values)
+
+    def __eq__(self, other):
+        if isinstance(other, list):
+            return len(self) == len(other) and self.tolist() == other
+        return array.array.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __getitem__(self, key):
+        item = array.array.__getitem__(self, key)
+
+        if isinstance(key, slice):
+            return FloatArray(item)
+        return item
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice) and not isinstance(value, array.array):
+            value = FloatArray(value)
+        array.array.__setitem__(self, key, value)
+
+    def __add__(self, other):
+        if isinstance(other, list):
+            return self.tolist() + other
+        return FloatArray(array.array.__add__(self, other))
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def sort(self, key=None, reverse=False):
+        "Sorts the values in place, as list.sort does."
+        self[:] = FloatArray(sorted(self, key=key, reverse=reverse))
+
+    def __copy__(self):
+        return FloatArray(self)
+
+    def __deepcopy__(self, memo):
+        return FloatArray(self)
+
+
+def asLists(values):
+    """
+    Returns 'values' with each FloatArray or numpy array in it (at any depth
+    of nested lists) converted to a list (of lists) of floats.
+    """
+    if isinstance(values, list):
+        return [asLists(item) for item in values]
+    # FloatArrays and numpy arrays can both be converted with their tolist method
+    if hasattr(values, "tolist"):
+        return values.tolist()
+    return values
@@ -0,0 +1,293 @@
+#   Copyright (C) 2004 CCLRC & NERC( Natural Environment Research Council ).
+#   This software may be distributed under the terms of the
+#   Q Public License, version 1.0 or later. http://ndg.nerc.ac.uk/public_docs/QPublic_license.txt
+
+"""
+data_cache.py
+=============
+
+Holds the NADataCache class that keeps parsed NASA Ames headers and data
+in a directory of NumPy ".npz" files so that unchanged files do not have
+to be parsed again.
+
+"""
+
+# Imports from python standard library
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+# Imports from nappy package
+import nappy.na_file.na_core
+import nappy.utils.data_array
+
+log = logging.getLogger(__name__)
+
+# Define global variables
+cache_file_extension = ".npz"
+cache_version = 2
+
+
+class NADataCache:
+    """
+    Stores the parsed header and data arrays of NASA Ames files in
+    'cache_dir'. Each entry is named from the path of the file and its size
+    and modification time, so an entry is not used once its file changes.
+    Least recently used entries are removed when the total size of the cache
+    goes over 'max_size' bytes (no limit if None).
+    """
+
+    def __init__(self, cache_dir, max_size=None):
+        """
+        Sets up the cache, creating 'cache_dir' if needed.
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+    def getCacheFileName(self, na_file_obj):
+        """
+        Returns the name of the cache file for the current version of the file
+        read by 'na_file_obj'.
+        """
+        stat = os.stat(na_file_obj.filename)
+        file_key = "%s:%s:%s:%s" % (stat.st_size, stat.st_mtime_ns,
+                                    na_file_obj.ignore_header_lines, cache_version)
+        return os.path.join(self.cache_dir, "%s-%s%s" % (self._getPathKey(na_file_obj),
+                            _hash(file_key), cache_file_extension))
+
+    def _getPathKey(self, na_file_obj):
+        "Returns the part of the cache file name that comes from the path of the file."
+        return _hash(os.path.abspath(na_file_obj.filename))
+
+    def getHeaderItems(self, na_file_obj):
+        """
+        Returns a dictionary of copies of the header items of 'na_file_obj'
+        (all NASA Ames dictionary items apart from the data in V and A).
+        """
+        items = {}
+
+        for key in nappy.na_file.na_core.NACore.na_dictionary_keys:
+            if key not in ("V", "A"):
+                items[key] = getattr(na_file_obj, key)
+
+        items["_normalized_X"] = getattr(na_file_obj, "_normalized_X", True)
+        return json.loads(json.dumps(items, default=list))
+
+    def loadHeader(self, na_file_obj):
+        """
+        Sets the header items of 'na_file_obj' from its cache entry and returns
+        them in a dictionary. Returns None if there is no entry for the file.
+        """
+        meta = self._loadEntry(na_file_obj, keys=())[0]
+
+        if meta is None:
+            return None
+
+        for key, value in json.loads(json.dumps(meta["header"])).items():
+            setattr(na_file_obj, key, value)
+
+        return meta["header"]
+
+    def loadData(self, na_file_obj):
+        """
+        Sets the data arrays of 'na_file_obj' from its cache entry, for the
+        variables selected in 'na_file_obj'. Returns False (and changes nothing)
+        if there is no entry or it does not hold all the selected variables.
+        """
+        (meta, items) = self._loadEntry(na_file_obj, keys=self._getSelectedKeys(na_file_obj))
+
+        if meta is None:
+            return False
+
+        na_file_obj.V = [items.get("V_%d" % n, []) for n in range(na_file_obj.NV)]
+        if na_file_obj.NAUXV is not None:
+            na_file_obj.A = [items.get("A_%d" % a, []) for a in range(na_file_obj.NAUXV)]
+
+        for key in ("X", "NX", "DX"):
+            setattr(na_file_obj, key, items[key])
+
+        log.debug("Read data from cache file: %s" % self.getCacheFileName(na_file_obj))
+        return True
+
+    def save(self, na_file_obj, header):
+        """
+        Writes the 'header' items and the data arrays of the selected variables
+        in 'na_file_obj' to its cache entry. Variables already held in the
+        entry are kept. Older entries for the same file are removed.
+        """
+        # Import numpy here so that pip install works without error
+        import numpy as np
+
+        cache_file = self.getCacheFileName(na_file_obj)
+        (old_meta, items) = self._loadEntry(na_file_obj)
+        if old_meta is None:
+            items = {}
+
+        for key in ("X", "NX", "DX"):
+            items[key] = getattr(na_file_obj, key)
+        for n in na_file_obj._variable_numbers:
+            items["V_%d" % n] = na_file_obj.V[n]
+        for a in na_file_obj._aux_variable_numbers:
+            items["A_%d" % a] = na_file_obj.A[a]
+
+        meta = {"version": cache_version, "header": header, "json_items": {}, "ndarray_items": []}
+        arrays = {}
+
+        for key, value in items.items():
+            array = _toArray(value)
+
+            if array is None:
+                meta["json_items"][key] = value
+            else:
+                arrays[key] = array
+
+                # Items that were read as NumPy arrays are returned as they are
+                if isinstance(value, np.ndarray):
+                    meta["ndarray_items"].append(key)
+
+        arrays["meta"] = np.array(json.dumps(meta, default=list))
+
+        (fd, tmp_file) = tempfile.mkstemp(suffix=cache_file_extension, dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as fout:
+                np.savez(fout, **arrays)
+            os.replace(tmp_file, cache_file)
+        except Exception:
+            os.remove(tmp_file)
+            raise
+
+        # Remove entries for older versions of the file
+        for old_file in glob.glob(os.path.join(self.cache_dir, self._getPathKey(na_file_obj) + "-*" + cache_file_extension)):
+            if old_file != cache_file:
+                _removeFile(old_file)
+
+        log.debug("Data written to cache file: %s" % cache_file)
+        self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the total size of the
+        cache is no more than 'max_size' bytes.
+        """
+        if self.max_size is None:
+            return
+
+        entries = []
+        for cache_file in glob.glob(os.path.join(self.cache_dir, "*" + cache_file_extension)):
+            try:
+                stat = os.stat(cache_file)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, cache_file))
+
+        total_size = sum([entry[1] for entry in entries])
+
+        for (mtime, size, cache_file) in sorted(entries):
+            if total_size <= self.max_size:
+                break
+
+            log.debug("Removing least recently used cache file: %s" % cache_file)
+            _removeFile(cache_file)
+            total_size = total_size - size
+
+    def _getSelectedKeys(self, na_file_obj):
+        "Returns the keys of the cached data items needed for the selected variables."
+        keys = ["X", "NX", "DX"]
+        keys.extend(["V_%d" % n for n in na_file_obj._variable_numbers])
+        keys.extend(["A_%d" % a for a in na_file_obj._aux_variable_numbers])
+        return keys
+
+    def _loadEntry(self, na_file_obj, keys=None):
+        """
+        Returns a tuple of the metadata of the cache entry for 'na_file_obj' and
+        a dictionary of its data items in 'keys' (all items if None).
+        Returns (None, None) if there is no usable entry or it is missing any of 'keys'.
+        """
+        # Import numpy here so that pip install works without error
+        import numpy as np
+
+        try:
+            cache_file = self.getCacheFileName(na_file_obj)
+        except OSError:
+            return (None, None)
+
+        if not os.path.isfile(cache_file):
+            return (None, None)
+
+        try:
+            with np.load(cache_file) as npz:
+                meta = json.loads(str(npz["meta"]))
+
+                if meta["version"] != cache_version:
+                    return (None, None)
+
+                if keys is None:
+                    keys = set(npz.files).union(meta["json_items"]) - set(["meta"])
+
+                items = {}
+                for key in keys:
+                    if key in meta["json_items"]:
+                        items[key] = meta["json_items"][key]
+                    elif key in npz.files:
+                        items[key] = _fromArray(key, npz[key], key in meta["ndarray_items"])
+                    else:
+                        return (None, None)
+
+        except Exception as err:
+            log.debug("Could not read cache file '%s': %s" % (cache_file, err))
+            return (None, None)
+
+        # Mark the entry as recently used
+        os.utime(cache_file)
+        return (meta, items)
+
+
+def _hash(text):
+    "Returns a short hex digest of 'text' for use in cache file names."
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _toArray(value):
+    """
+    Returns 'value' as a NumPy array if it is a (rectangular) list of numbers,
+    otherwise returns None.
+    """
+    # Import numpy here so that pip install works without error
+    import numpy as np
+
+    try:
+        array = np.asarray(value)
+    except ValueError:
+        return None
+
+    if array.dtype.kind not in "biuf":
+        return None
+
+    return array
+
+
+def _fromArray(key, array, is_ndarray=False):
+    """
+    Returns the cached 'array' for item 'key' as it is held when read from a
+    file: the array itself if 'is_ndarray' is set, a FloatArray for the values
+    of X, a variable or an auxiliary variable and lists otherwise.
+    """
+    if is_ndarray:
+        return array
+    if key.split("_")[0] in ("X", "V", "A") and array.ndim == 1 and array.dtype.kind == "f":
+        return nappy.utils.data_array.FloatArray(array.astype("d").tobytes())
+    return array.tolist()
+
+
+def _removeFile(path):
+    "Removes 'path' if it still exists."
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,64 @@
+#   Copyright (C) 2004 CCLRC & NERC( Natural Environment Research Council ).
+#   This software may be distributed under the terms of the
+#   Q Public License, version 1.0 or later. http://ndg.nerc.ac.uk/public_docs/QPublic_license.txt
+
+"""
+header_scanner.py
+=================
+
+Functions to scan the headers of many NASA Ames files (in parallel) and
+return a lightweight summary of each one, for cataloguing archives.
+
+"""
+
+# Imports from python standard library
+import functools
+import logging
+
+# Imports from nappy package
+import nappy
+import nappy.utils.parallel
+
+log = logging.getLogger(__name__)
+
+# Define global variables
+header_record_keys = ("FFI", "NIV", "NV", "VNAME", "DATE", "NLHEAD")
+
+
+def scanHeader(filename, ignore_header_lines=0, sample_size=10):
+    """
+    Reads the header of 'filename' and returns a dictionary holding the
+    "filename", the header items in 'header_record_keys', the "data_size"
+    of the data section in bytes and its "record_count" (estimated from the
+    first 'sample_size' records unless "record_count_exact" is True).
+
+    Any error is caught and returned as a string in the "error" item
+    (which is None if the header was read).
+    """
+    record = {"filename": filename, "error": None}
+
+    try:
+        with nappy.openNAFile(filename, ignore_header_lines=ignore_header_lines) as fin:
+            for key in header_record_keys:
+                record[key] = getattr(fin, key)
+
+            record.update(fin.scanDataSection(sample_size=sample_size))
+
+    except Exception as err:
+        log.debug("Could not scan header of '%s': %s" % (filename, err))
+        record["error"] = "%s: %s" % (type(err).__name__, err)
+
+    return record
+
+
+def scanHeaders(filenames, workers=None, ignore_header_lines=0, sample_size=10, chunksize=None):
+    """
+    Scans the headers of all the files in 'filenames' and returns a list of
+    header records (see 'scanHeader') in the same order. The files are
+    shared between 'workers' processes (one per CPU if None, or scanned in
+    this process if 1).
+    """
+    scanner = functools.partial(scanHeader, ignore_header_lines=ignore_header_lines,
+                                sample_size=sample_size)
+    return nappy.utils.parallel.mapInProcesses(scanner, filenames, workers=workers,
+                                               chunksize=chunksize)
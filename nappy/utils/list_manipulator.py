@@ -15,6 +15,7 @@ provided to call these directly as functions.
 
 # Import local modules
 import nappy.utils
+import nappy.utils.text_writer
 
 # Define module variables
 default_delimiter = nappy.utils.getDefault("default_delimiter")
@@ -96,9 +97,7 @@ class RecursiveListManipulator:
             for i in range(dimlist[0]):
                 self.writeLines(inlist[i], dimlist[1:], delimiter=delimiter, float_format=float_format)
         else:
-            var_string = ""
-            for i in range(dimlist[0]):
-                var_string = var_string + ((float_format+delimiter) % inlist[i])
-            self.rtlines.append("%s\n" % var_string.rstrip(" ,"))
+            # Format the whole row of values in one go
+            self.rtlines.append(nappy.utils.text_writer.formatValues(inlist[:dimlist[0]], float_format, delimiter))
         return self.rtlines
             
@@ -0,0 +1,62 @@
+#   Copyright (C) 2004 CCLRC & NERC( Natural Environment Research Council ).
+#   This software may be distributed under the terms of the
+#   Q Public License, version 1.0 or later. http://ndg.nerc.ac.uk/public_docs/QPublic_license.txt
+
+"""
+multi_reader.py
+===============
+
+Functions to read many NASA Ames files in parallel worker processes.
+
+"""
+
+# Imports from python standard library
+import functools
+import logging
+
+# Imports from nappy package
+import nappy
+import nappy.utils.parallel
+
+log = logging.getLogger(__name__)
+
+
+def readFile(filename, variables=None, aux_variables=None, engine="python",
+             x_range=None, ignore_header_lines=0):
+    """
+    Reads the header and data of 'filename' and returns a dictionary holding
+    the "filename", the "na_dict" of its contents and an "error" item. The
+    'variables', 'aux_variables', 'engine' and 'x_range' arguments are passed
+    to 'readData'. The data are lists, or numpy arrays if 'engine' is "numpy".
+
+    Any error is caught and returned as a string in the "error" item (the
+    "na_dict" item is then None).
+    """
+    result = {"filename": filename, "na_dict": None, "error": None}
+
+    try:
+        with nappy.openNAFile(filename, ignore_header_lines=ignore_header_lines) as fin:
+            fin.readData(engine=engine, variables=variables, aux_variables=aux_variables,
+                         x_range=x_range)
+            result["na_dict"] = fin.getNADict(as_lists=(engine != "numpy"))
+
+    except Exception as err:
+        log.debug("Could not read '%s': %s" % (filename, err))
+        result["error"] = "%s: %s" % (type(err).__name__, err)
+
+    return result
+
+
+def readMany(filenames, workers=None, variables=None, aux_variables=None, engine="python",
+             x_range=None, ignore_header_lines=0, chunksize=None):
+    """
+    Reads all the files in 'filenames' and returns a list of results (see
+    'readFile') in the same order. The files are parsed in 'workers'
+    processes (one per CPU if None, or in this process if 1) so that
+    reading many files can use all the CPUs available.
+    """
+    reader = functools.partial(readFile, variables=variables, aux_variables=aux_variables,
+                               engine=engine, x_range=x_range,
+                               ignore_header_lines=ignore_header_lines)
+    return nappy.utils.parallel.mapInProcesses(reader, filenames, workers=workers,
+                                               chunksize=chunksize)
@@ -0,0 +1,56 @@
+#   Copyright (C) 2004 CCLRC & NERC( Natural Environment Research Council ).
+#   This software may be distributed under the terms of the
+#   Q Public License, version 1.0 or later. http://ndg.nerc.ac.uk/public_docs/QPublic_license.txt
+
+"""
+parallel.py
+===========
+
+Helper for sharing work on many files between worker processes.
+
+"""
+
+# Imports from python standard library
+import concurrent.futures
+import logging
+import os
+
+log = logging.getLogger(__name__)
+
+
+def getWorkerCount(workers=None):
+    """
+    Returns the number of worker processes to use. If 'workers' is None
+    then one worker is used per CPU.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers < 1:
+        raise Exception("The number of workers must be a positive integer.")
+
+    return workers
+
+
+def mapInProcesses(func, items, workers=None, chunksize=None):
+    """
+    Calls 'func' on each of 'items' and returns a list of the results in the
+    same order as 'items'. The calls are shared between 'workers' processes
+    (one per CPU if None) or made in this process if 'workers' is 1.
+    Items are sent to the workers in chunks of 'chunksize' to keep the
+    overhead low when there are many small tasks. 'func' must be a function
+    defined at the top level of a module so that it can be pickled.
+    """
+    items = list(items)
+    workers = min(getWorkerCount(workers), max(len(items), 1))
+
+    if workers == 1:
+        return [func(item) for item in items]
+
+    if chunksize is None:
+        chunksize = max(1, len(items) // (workers * 4))
+
+    log.debug("Sharing %d tasks between %d worker processes." % (len(items), workers))
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
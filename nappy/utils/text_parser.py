@@ -12,6 +12,7 @@ reals, integers etc.
 """
 
 # Standard library imports
+import locale
 import re
 import string
 
@@ -20,6 +21,7 @@ from nappy.utils.right_strip import *
 
 # Global variables
 pattnNoQuotes = re.compile("^[\"'].*\1$")
+default_encoding = locale.getpreferredencoding(False)
 
 
 def readItemFromLine(line, rttype=str):
@@ -62,36 +64,187 @@ def readItemsFromUnknownLines(object, nitems, rttype=str):
     """
     Reads from an unknown number of lines until n items have been collected.
     The 'object' argument can be a filehandle (i.e. obj=open('name.ext', 'r'))
-    or a string wrapped in a StringIO object (i.e. obj=StringIO.StringIO('abc')).
+    or a string wrapped in a StringIO object (i.e. obj=StringIO.StringIO('abc'))
+    or a LineCursor object, in which case the cursor is moved past the lines read.
     The 'object' argument can also be a list, in which case the partially used/read object is
     also returned.
     """
+    is_list = type(object) == type([2,3])
+    if is_list:
+        object = LineCursor(object)
 
     rtitems = []
-    lines = []        
+    lines = []
 
-    if type(object) == type([2,3]): 
+    while len(rtitems) < nitems:
+        line = object.readline()
+        if line == "":
+            raise EOFError("Reached end of input after reading " + str(len(rtitems)) + " of " + str(nitems) + " required items.")
 
-        while len(rtitems) < nitems:   
-            nextitem = object[0]
-            object = object[1:]
-            items = rightStripCurlyBraces(nextitem).strip().split()
-            lines.append(items)
-            (rtitems, extras) = (rtitems + items[:nitems], items[nitems:])
+        items = rightStripCurlyBraces(line).strip().split()
+        lines.append(items)
+        rtitems.extend(items)
 
-    else:
-        while len(rtitems) < nitems:
-            items = rightStripCurlyBraces(object.readline()).strip().split()
-            lines.append(items)
-            (rtitems, extras) = (rtitems + items[:nitems], items[nitems:])
-
-    if len(extras) > 0:
+    if len(rtitems) > nitems:
         raise Exception("Could not split " + str(len(lines)) + " lines exactly into required number (" + str(nitems) + ") of items: \n" + str(lines))
 
     if rttype is not str:
         rtitems = [rttype(x) for x in rtitems]
 
-    if type(object) == type([1,2]):
-        return rtitems, object
+    if is_list:
+        return rtitems, object.lines[object.position:]
     else:
         return rtitems
+
+
+class LineCursor:
+    """
+    Wraps a list of lines with a cursor that moves forward as lines are read.
+    It behaves like a read-only file handle so it can be passed to the functions
+    in this module, but reading never copies the lines that remain. This keeps
+    reading a whole data section linear in the number of lines.
+    """
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.position = 0
+
+    def __len__(self):
+        "Returns the number of lines that have not been read yet."
+        return len(self.lines) - self.position
+
+    def readline(self):
+        "Returns the next line, or an empty string at the end of the lines."
+        if self.position >= len(self.lines):
+            return ""
+
+        line = self.lines[self.position]
+        self.position += 1
+        return line
+
+    def readlines(self, nlines):
+        "Returns the next ``nlines`` lines in a list."
+        if nlines > len(self):
+            raise EOFError("Cannot read " + str(nlines) + " lines, only " + str(len(self)) + " remaining.")
+
+        lines = self.lines[self.position:self.position + nlines]
+        self.position += nlines
+        return lines
+
+    def atEnd(self):
+        "Returns True if all the lines have been read."
+        return self.position >= len(self.lines)
+
+
+class StreamCursor:
+    """
+    Reads lines one at a time from an open file handle so that a data section
+    can be parsed without holding the whole of it in memory. It has the same
+    reading interface as LineCursor.
+
+    Blank lines are only allowed at the end of the input (as for
+    NAFile._checkForBlankLines). If the handle returns bytes then the lines are
+    decoded and, if a starting ``offset`` is given, the ``offset`` attribute
+    holds the byte offset of the next line to be read.
+
+    If ``complete_lines`` is True then a last line without a line ending
+    (e.g. one that is still being written) is treated as the end of the input.
+    """
+
+    def __init__(self, fh, offset=None, encoding=default_encoding, complete_lines=False):
+        self.fh = fh
+        self.encoding = encoding
+        self.complete_lines = complete_lines
+        self.offset = offset
+        self.line_number = 0
+        self._end = offset
+        self._fetch()
+
+    def _fetch(self):
+        """
+        Reads ahead to the next non-blank line and holds it as the next line.
+        Raises an error if a non-blank line follows a blank line.
+        """
+        start = self._end
+        blank_lines = 0
+
+        while True:
+            line = self.fh.readline()
+
+            if isinstance(line, bytes):
+                if self._end is not None:
+                    self._end += len(line)
+                line = line.decode(self.encoding)
+
+            if line == "" or (self.complete_lines and not line.endswith("\n")):
+                break
+            elif line.strip() == "":
+                blank_lines += 1
+            elif blank_lines > 0:
+                raise Exception("Empty line found in data section at line: " + str(self.line_number + blank_lines))
+            else:
+                self.offset = start
+                self._next_line = line
+                return
+
+        # End of input, the offset is at the end of the last non-blank line
+        self.offset = start
+        self._next_line = ""
+
+    def readline(self):
+        "Returns the next line, or an empty string at the end of the input."
+        line = self._next_line
+
+        if line != "":
+            self.line_number += 1
+            self._fetch()
+
+        return line
+
+    def readlines(self, nlines):
+        "Returns the next ``nlines`` lines in a list."
+        lines = []
+
+        for i in range(nlines):
+            line = self.readline()
+            if line == "":
+                raise EOFError("Cannot read " + str(nlines) + " lines, only " + str(i) + " remaining.")
+            lines.append(line)
+
+        return lines
+
+    def atEnd(self):
+        "Returns True if all the lines have been read."
+        return self._next_line == ""
+
+
+def readArrayFromLines(lines, nitems, columns=None):
+    """
+    Reads all the items in ``lines`` into a 2-D float array with ``nitems``
+    columns per row. The lines are tokenised together in a single pass so
+    records may span any number of lines. If ``columns`` is given only those
+    column numbers are converted and returned (in that order).
+    """
+    # Import numpy here so that pip install works without error
+    import numpy as np
+
+    text = "".join(lines)
+    if "{" in text:
+        text = " ".join([rightStripCurlyBraces(line) for line in lines])
+
+    items = text.split()
+
+    if len(items) % nitems != 0:
+        raise Exception("Could not split " + str(len(items)) + " items exactly into rows of required number (" + str(nitems) + ") of items.")
+
+    nrows = len(items) // nitems
+
+    if columns is None or list(columns) == list(range(nitems)):
+        array = np.fromiter(map(float, items), dtype=float, count=len(items))
+        return array.reshape((nrows, nitems))
+
+    array = np.empty((nrows, len(columns)), dtype=float)
+    for (i, column) in enumerate(columns):
+        array[:, i] = np.fromiter(map(float, items[column::nitems]), dtype=float, count=nrows)
+
+    return array
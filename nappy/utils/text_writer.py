@@ -0,0 +1,130 @@
+#   Copyright (C) 2004 CCLRC & NERC( Natural Environment Research Council ).
+#   This software may be distributed under the terms of the
+#   Q Public License, version 1.0 or later. http://ndg.nerc.ac.uk/public_docs/QPublic_license.txt
+
+"""
+text_writer.py
+==============
+
+A set of functions to format columns of data values as lines of text for
+the data section of a NASA Ames file.
+
+Rather than formatting one value at a time, a whole block of records is
+rendered with a single format operation, so that writing large arrays
+needs few string operations and few calls to write().
+
+As well as any %-style format, values can be written with the "shortest"
+float format: each value is written with the fewest digits that read back
+as exactly the same value (e.g. "0.1" and "12" rather than "0.1000000000"
+and "12.0").
+
+"""
+
+# Imports from python standard library
+import itertools
+import re
+
+# Global variables
+default_block_size = 65536
+shortest_float_format = "shortest"
+pattnZeroFraction = re.compile(r"\.0\b")
+
+
+def getValueFormat(float_format):
+    """
+    Returns the %-style format used to write a single value with ``float_format``.
+    """
+    if float_format == shortest_float_format:
+        return "%s"
+    return float_format
+
+
+def stripZeroFractions(text):
+    """
+    Removes the ".0" from the end of each whole number written in ``text``
+    with the shortest float format.
+    """
+    return pattnZeroFraction.sub("", text)
+
+
+def getColumnValues(values):
+    """
+    Returns ``values`` as a list, converting arrays (such as numpy arrays)
+    to lists of python numbers which are much quicker to format.
+    """
+    if hasattr(values, "tolist"):
+        return values.tolist()
+    return values
+
+
+def getRowBlocks(columns, block_size=default_block_size):
+    """
+    Yields the ``columns`` (that must all have the same length) sliced into
+    blocks of up to ``block_size`` rows.
+    """
+    nrows = len(columns[0]) if columns else 0
+
+    for start in range(0, nrows, block_size):
+        yield [column[start:start + block_size] for column in columns]
+
+
+def formatValues(values, float_format, delimiter):
+    """
+    Returns ``values`` written with ``float_format`` and separated by
+    ``delimiter`` as a single line (with trailing spaces and commas stripped).
+    """
+    values = getColumnValues(values)
+    text = ((getValueFormat(float_format) + delimiter) * len(values)) % tuple(values)
+
+    if float_format == shortest_float_format:
+        text = stripZeroFractions(text)
+
+    return text.rstrip(" ,") + "\n"
+
+
+def getRecordFormat(line_formats, delimiter, prefix=""):
+    """
+    Returns the format of one record written as one line per item of
+    ``line_formats``, each preceded by ``prefix``.
+    """
+    lines = []
+    for line_format in line_formats:
+        # A trailing delimiter that would be stripped is left out of the format
+        if delimiter and not delimiter.strip(" ,") and line_format.endswith(delimiter):
+            line_format = line_format[:-len(delimiter)]
+        lines.append(prefix.replace("%", "%%") + line_format + "\n")
+
+    return "".join(lines)
+
+
+def formatRecords(columns, line_formats, delimiter, prefix="", float_format=None):
+    """
+    Returns the text of one record for each row across ``columns``.
+
+    Each record is written as one line per item of ``line_formats``, which
+    take their values from the columns in order. As when values are written
+    one at a time, each line has trailing spaces and commas stripped and is
+    preceded by ``prefix``. If ``float_format`` is the shortest float format
+    then whole numbers are written without a fraction.
+    """
+    nrows = len(columns[0]) if columns else 0
+    values = tuple(itertools.chain.from_iterable(zip(*columns)))
+    return formatRecordValues(values, nrows, line_formats, delimiter, prefix, float_format)
+
+
+def formatRecordValues(values, nrecords, line_formats, delimiter, prefix="", float_format=None):
+    """
+    Returns the text of ``nrecords`` records written as for formatRecords,
+    taking the values of all the records in order from the flat sequence
+    ``values``.
+    """
+    text = (getRecordFormat(line_formats, delimiter, prefix) * nrecords) % tuple(values)
+
+    if float_format == shortest_float_format:
+        text = stripZeroFractions(text)
+
+    # Only strip line by line if a formatted value itself ends a line with a space or comma
+    if " \n" in text or ",\n" in text:
+        text = "".join([prefix + line[len(prefix):].rstrip(" ,") + "\n" for line in text.split("\n")[:-1]])
+
+    return text
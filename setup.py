@@ -58,7 +58,8 @@ setup(
     zip_safe=False,
     install_requires=read('requirements.txt').splitlines(),
     extras_require={
-        'netcdf_conversion': ['xarray']
+        'netcdf_conversion': ['xarray'],
+        'dask': ['dask[array]']
     },
     tests_require=read('requirements_dev.txt').splitlines(),
     test_suite='nose.collector',
@@ -68,6 +69,9 @@ setup(
             'na2nc=nappy.script.na2nc:na2nc',
             'nc2na=nappy.script.nc2na:nc2na',
             'nc2csv=nappy.script.nc2csv:nc2csv'
+        ],
+        'xarray.backends': [
+            'nasaames=nappy.nc_interface.xarray_backend:NASAAmesBackendEntrypoint'
         ]
     },
     classifiers=[
@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 
+import nappy
+
 TESTS_HOME = Path(os.path.abspath(os.path.dirname(__file__)))
 
 MINI_CEDA_CACHE_DIR = Path.home() / ".mini-ceda-archive"
@@ -15,3 +17,45 @@ cached_outputs = TESTS_HOME / "cached_outputs"
 if not os.path.isdir(test_outputs):
     os.makedirs(test_outputs)
 
+
+
+def as_lists(value):
+    """
+    Returns 'value' with any arrays (e.g. the N-D arrays read for FFI 2010)
+    converted to nested lists so that data items can be compared with '=='.
+    """
+    if isinstance(value, dict):
+        return {key: as_lists(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [as_lists(item) for item in value]
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return value
+
+
+def data_path(na_file):
+    "Returns the path of 'na_file', which is a path or the name of a file in the test data."
+    return os.path.join(data_files, na_file)
+
+
+def open_na_file(na_file, **kwargs):
+    "Opens 'na_file' (a path or the name of a file in the test data) with nappy.openNAFile."
+    return nappy.openNAFile(data_path(na_file), **kwargs)
+
+
+def read_na_file(na_file, **kwargs):
+    """
+    Opens 'na_file' (a path or the name of a file in the test data) and reads
+    its data, passing any keyword arguments to readData.
+    """
+    fin = open_na_file(na_file)
+    fin.readData(**kwargs)
+    return fin
+
+
+def data_items(fin, keys=("X", "V", "A")):
+    """
+    Returns a dictionary of the items named in 'keys' of the NASA Ames file
+    'fin', converted to lists so that they can be compared with '=='.
+    """
+    return as_lists({key: getattr(fin, key) for key in keys})
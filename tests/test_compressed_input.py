@@ -0,0 +1,89 @@
+"""
+test_compressed_input.py
+========================
+
+Tests for reading NASA Ames files compressed with gzip, bz2 or xz.
+
+"""
+
+# Import standard library modules
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+
+import pytest
+
+import nappy
+import nappy.utils.common_utils
+
+from .common import data_files, as_lists, read_na_file, open_na_file
+
+
+_COMPRESSORS = {"gz": gzip, "bz2": bz2, "xz": lzma}
+
+
+def _compress(tmpdir, na_file, extension):
+    "Writes a compressed copy of 'na_file' in 'tmpdir' and returns its path."
+    path = os.path.join(str(tmpdir), f"{na_file}.{extension}")
+
+    with open(os.path.join(data_files, na_file), "rb") as fin:
+        with _COMPRESSORS[extension].open(path, "wb") as fout:
+            shutil.copyfileobj(fin, fout)
+
+    return path
+
+
+@pytest.mark.parametrize("extension", sorted(_COMPRESSORS))
+@pytest.mark.parametrize("na_file", ("1001.na", "2010.na", "2110.na"))
+def test_read_compressed_file(tmpdir, na_file, extension):
+    path = _compress(tmpdir, na_file, extension)
+    assert nappy.utils.common_utils.getCompression(path) == _COMPRESSORS[extension].__name__
+    assert nappy.readFFI(path) == int(na_file[:4])
+
+    expected = read_na_file(na_file)
+    fin = read_na_file(path)
+    assert fin.NLHEAD == expected.NLHEAD
+    assert as_lists([fin.X, fin.V, fin.A]) == as_lists([expected.X, expected.V, expected.A])
+
+    # Records are found by seeking in the decompressed stream
+    assert as_lists(nappy.openNAFile(path, use_mmap=True).readRecord(2)) == \
+        as_lists(open_na_file(na_file).readRecord(2))
+
+
+@pytest.mark.parametrize("extension", sorted(_COMPRESSORS))
+def test_compression_found_from_open_file(tmpdir, monkeypatch, extension):
+    # The compression is read from the open file rather than by opening it again
+    path = _compress(tmpdir, "1001.na", extension)
+    monkeypatch.setattr(nappy.utils.common_utils, "getCompression", None)
+
+    with nappy.openNAFile(path) as fin:
+        assert fin.compression == _COMPRESSORS[extension].__name__
+        fin.readData()
+        assert as_lists(fin.V) == as_lists(read_na_file("1001.na").V)
+
+    with open_na_file("1001.na") as fin:
+        assert fin.compression is None
+
+
+def test_read_compressed_file_with_numpy_engine(tmpdir):
+    path = _compress(tmpdir, "1010.na", "gz")
+    assert as_lists(read_na_file(path, engine="numpy").V) == as_lists(read_na_file("1010.na").V)
+
+
+def test_scan_compressed_headers(tmpdir):
+    path = _compress(tmpdir, "1010.na", "bz2")
+    (result, expected) = nappy.scanHeaders([path, os.path.join(data_files, "1010.na")], workers=1)
+
+    assert result["error"] is None
+    assert result["FFI"] == 1010
+
+    # Records are counted from a sample, as for the uncompressed file
+    for key in ("data_size", "record_count", "record_count_exact"):
+        assert result[key] == expected[key]
+    assert result["record_count_exact"] is False
+
+    with nappy.openNAFile(path) as fin:
+        assert fin.scanDataSection(sample_size=None) == {"data_size": expected["data_size"],
+                                                         "record_count": 19, "record_count_exact": True}
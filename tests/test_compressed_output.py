@@ -0,0 +1,108 @@
+"""
+test_compressed_output.py
+=========================
+
+Tests for writing NASA Ames files compressed with gzip, bz2 or xz and for
+writing them atomically.
+
+"""
+
+# Import standard library modules
+import os
+
+import pytest
+
+import nappy
+import nappy.utils.common_utils
+
+from .common import as_lists, read_na_file
+
+
+def _write(path, na_dict, **kwargs):
+    fout = nappy.openNAFile(path, mode="w", na_dict=na_dict, **kwargs)
+    fout.write()
+    fout.close()
+
+
+@pytest.mark.parametrize("compression, extension, module_name", [("gzip", "gz", "gzip"),
+                                                                ("bz2", "bz2", "bz2"),
+                                                                ("xz", "xz", "lzma")])
+def test_write_compressed(tmpdir, compression, extension, module_name):
+    expected = read_na_file("1010.na")
+    paths = [os.path.join(tmpdir.strpath, name) for name in ("plain.na", "named.na", f"ext.na.{extension}")]
+
+    _write(paths[0], expected.getNADict())
+    _write(paths[1], expected.getNADict(), compression=compression)
+    _write(paths[2], expected.getNADict())
+
+    for path in paths[1:]:
+        assert nappy.utils.common_utils.getCompression(path) == module_name
+        assert os.path.getsize(path) < os.path.getsize(paths[0])
+
+        fin = read_na_file(path)
+        assert as_lists([fin.X, fin.V, fin.A]) == as_lists([expected.X, expected.V, expected.A])
+
+
+def test_unknown_compression(tmpdir):
+    with pytest.raises(Exception):
+        nappy.openNAFile(os.path.join(tmpdir.strpath, "out.na"), mode="w", na_dict={"FFI": 1001},
+                         compression="zip")
+
+
+def test_write_atomic(tmpdir):
+    na_dict = read_na_file("1001.na").getNADict()
+    (path, atomic_path) = [os.path.join(tmpdir.strpath, name) for name in ("plain.na", "atomic.na")]
+    _write(path, na_dict)
+
+    fout = nappy.openNAFile(atomic_path, mode="w", na_dict=na_dict, atomic=True)
+    fout.write()
+    assert not os.path.exists(atomic_path)
+
+    fout.close()
+    assert open(atomic_path).read() == open(path).read()
+    assert sorted(os.listdir(tmpdir.strpath)) == ["atomic.na", "plain.na"]
+
+
+def test_failed_atomic_write_leaves_no_file(tmpdir):
+    na_dict = read_na_file("1001.na").getNADict()
+    path = os.path.join(tmpdir.strpath, "atomic.na")
+    open(path, "w").write("previous content")
+    del na_dict["V"]
+
+    fout = nappy.openNAFile(path, mode="w", na_dict=na_dict, atomic=True)
+    with pytest.raises(Exception):
+        fout.write()
+
+    fout.close()
+    assert os.listdir(tmpdir.strpath) == ["atomic.na"]
+    assert open(path).read() == "previous content"
+
+
+def test_stream_compressed_and_atomic(tmpdir):
+    expected = read_na_file("1001.na")
+    na_dict = expected.getNADict()
+    path = os.path.join(tmpdir.strpath, "stream.na.gz")
+
+    with nappy.openNAStreamWriter(path, na_dict, atomic=True) as writer:
+        writer.append(na_dict["X"], na_dict["V"])
+        assert not os.path.exists(path)
+
+    fin = read_na_file(path)
+    assert as_lists([fin.X, fin.V]) == as_lists([expected.X, expected.V])
+
+    del na_dict["DX"]
+    with pytest.raises(Exception):
+        nappy.openNAStreamWriter(os.path.join(tmpdir.strpath, "nodx.na.gz"), na_dict)
+
+
+def test_stream_atomic_discarded_on_error(tmpdir):
+    na_dict = read_na_file("1010.na").getNADict()
+    del na_dict["DX"]
+    path = os.path.join(tmpdir.strpath, "stream.na")
+
+    with pytest.raises(ValueError):
+        with nappy.openNAStreamWriter(path, na_dict, atomic=True) as writer:
+            writer.append(na_dict["X"], na_dict["V"], na_dict["A"])
+            raise ValueError("stopped")
+
+    assert os.listdir(tmpdir.strpath) == []
@@ -0,0 +1,77 @@
+"""
+test_dask_arrays.py
+===================
+
+Tests for reading NASA Ames variables as dask arrays of record chunks.
+
+"""
+
+# Import standard library modules
+import os
+import sys
+
+import numpy as np
+import pytest
+import xarray as xr
+
+import nappy
+import nappy.nc_interface.dask_arrays as dask_arrays
+
+from .common import test_outputs, data_path, open_na_file
+
+
+def test_get_record_chunks():
+    fin = open_na_file("1010.na")
+    index = fin.buildRecordIndex()
+
+    chunks = dask_arrays.getRecordChunks(fin, 7)
+    assert [nrecords for (offset, nrecords) in chunks] == [7, 7, 5]
+    assert [offset for (offset, nrecords) in chunks] == [index.getOffset(m) for m in (0, 7, 14)]
+
+    chunks = dask_arrays.getRecordChunks(fin, 4, x_range=(52, 22))
+    assert chunks == [(index.getOffset(3), 4), (index.getOffset(7), 2)]
+
+
+@pytest.mark.parametrize("na_file", ("1010.na", "2010.na"))
+def test_read_chunk_matches_read_data(na_file):
+    expected = open_na_file(na_file)
+    expected.readData()
+
+    fin = open_na_file(na_file)
+    chunks = dask_arrays.getRecordChunks(fin, 2)
+    values = np.concatenate([dask_arrays.readChunk(fin.filename, 0, offset, nrecords, 0)
+                             for (offset, nrecords) in chunks])
+
+    assert np.array_equal(values, expected.getVariableValues(0), equal_nan=True)
+
+
+def test_dask_not_installed(monkeypatch):
+    monkeypatch.setitem(sys.modules, "dask", None)
+    fin = open_na_file("1001.na")
+
+    with pytest.raises(Exception, match="requires dask"):
+        dask_arrays.createDaskArray(fin, dask_arrays.getRecordChunks(fin, 5), 0)
+
+
+@pytest.mark.parametrize("na_file", ("1010.na", "2010.na"))
+def test_convert_with_dask_arrays(na_file):
+    pytest.importorskip("dask")
+
+    expected = nappy.readXarrayObjectsFromNA(data_path(na_file))
+    actual = nappy.readXarrayObjectsFromNA(data_path(na_file), chunk_size=3)
+
+    for (var, expected_var) in zip(actual[0] + actual[1], expected[0] + expected[1]):
+        assert var.chunks is not None
+        assert np.array_equal(var.values, expected_var.values, equal_nan=True)
+
+    # The NetCDF file written from dask arrays holds the same variables and values
+    outfiles = [os.path.join(test_outputs, f"{prefix}_{na_file[:-3]}.nc") for prefix in ("dask", "nodask")]
+    nappy.convertNAToNC(data_path(na_file), outfiles[0], chunk_size=3, time_warning=False)
+    nappy.convertNAToNC(data_path(na_file), outfiles[1], time_warning=False)
+
+    with xr.open_dataset(outfiles[0]) as ds, xr.open_dataset(outfiles[1]) as expected_ds:
+        assert sorted(ds.variables) == sorted(expected_ds.variables)
+
+        for name in expected_ds.variables:
+            assert ds[name].dims == expected_ds[name].dims
+            assert np.array_equal(ds[name].values, expected_ds[name].values, equal_nan=True)
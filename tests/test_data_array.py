@@ -0,0 +1,110 @@
+"""
+test_data_array.py
+==================
+
+Tests for the FloatArray class that holds the values read from NASA Ames files.
+
+"""
+
+# Import standard library modules
+import copy
+import json
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+import nappy
+import nappy.utils.data_array
+from nappy.utils.data_array import FloatArray
+
+from .common import data_files
+
+
+def test_float_array_behaves_like_list():
+    values = FloatArray([1.0, 2.5])
+    values.append(3)
+    values.extend([4.0])
+
+    assert values == [1.0, 2.5, 3.0, 4.0]
+    assert [1.0, 2.5, 3.0, 4.0] == values
+    assert values != [1.0]
+    assert values[1] == 2.5 and isinstance(values[1], float)
+    assert values[1:3] == [2.5, 3.0] and isinstance(values[1:3], FloatArray)
+    assert values.itemsize == 8
+
+
+def test_float_array_list_operations():
+    values = FloatArray([3.0, 1.0, 2.0])
+
+    values.sort()
+    assert values == [1.0, 2.0, 3.0] and isinstance(values, FloatArray)
+    values.sort(reverse=True)
+    assert values == [3.0, 2.0, 1.0]
+
+    assert values + [4.0] == [3.0, 2.0, 1.0, 4.0]
+    assert values + FloatArray([4.0]) == [3.0, 2.0, 1.0, 4.0]
+
+    values[0:2] = [1.0, 2.0]
+    assert values == [1.0, 2.0, 1.0]
+    values[1:] = []
+    assert values == [1.0]
+
+    values += [5.0]
+    assert values == [1.0, 5.0] and isinstance(values, FloatArray)
+
+
+def test_float_array_copies_and_pickles():
+    values = FloatArray([1.0, 2.0])
+
+    for other in (copy.copy(values), copy.deepcopy(values), pickle.loads(pickle.dumps(values))):
+        assert isinstance(other, FloatArray)
+        assert other == values
+
+
+def test_float_array_converts_to_numpy():
+    array = np.array(FloatArray([1.0, 2.0]))
+    assert array.dtype == np.float64
+    assert array.tolist() == [1.0, 2.0]
+
+
+def test_read_data_stores_float_arrays():
+    fin = nappy.openNAFile(os.path.join(data_files, "1010.na"))
+    fin.readData()
+
+    assert isinstance(fin.X, FloatArray)
+    assert all([isinstance(values, FloatArray) for values in fin.V + fin.A])
+
+
+def test_read_data_list_operations():
+    fin = nappy.openNAFile(os.path.join(data_files, "1010.na"))
+    fin.readData()
+    values = fin.V[0].tolist()
+
+    fin.V[0].sort()
+    assert fin.V[0] == sorted(values)
+    assert fin.V[0] + [1.0] == sorted(values) + [1.0]
+
+    fin.V[0][0:2] = [1.0, 2.0]
+    assert fin.V[0][0:2] == [1.0, 2.0]
+
+
+def test_as_lists_converts_arrays():
+    values = [FloatArray([1.0]), [np.array([[2.0, 3.0]]), "a"]]
+    assert nappy.utils.data_array.asLists(values) == [[1.0], [[[2.0, 3.0]], "a"]]
+
+
+@pytest.mark.parametrize("na_file", ("1010.na", "2010.na", "2110.na"))
+def test_get_na_dict_holds_lists(na_file):
+    fin = nappy.openNAFile(os.path.join(data_files, na_file))
+    fin.readData()
+    held = repr([fin.X, fin.V, fin.A])
+    na_dict = fin.getNADict()
+
+    assert json.loads(json.dumps(na_dict))["V"] == na_dict["V"]
+    assert "FloatArray" not in repr(na_dict)
+
+    # The data are only converted in the dictionary, not in the file object
+    assert repr([fin.X, fin.V, fin.A]) == held
+    assert "FloatArray" in held or "array(" in held
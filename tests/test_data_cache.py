@@ -0,0 +1,122 @@
+"""
+test_data_cache.py
+==================
+
+Tests for the on-disk cache of parsed NASA Ames files (openNAFile(cache_dir=...)).
+
+"""
+
+# Import standard library modules
+import os
+import shutil
+
+import pytest
+
+import nappy
+import nappy.na_file.na_file
+import nappy.na_file.na_file_1010
+import nappy.utils.data_cache
+
+from .common import data_files, as_lists
+
+
+_FILES = ("1001.na", "1010.na", "1020.na", "2010.na", "2110.na", "2160.na", "2310.na", "4010.na")
+
+
+def _copy(na_file, tmpdir):
+    path = os.path.join(str(tmpdir), na_file)
+    shutil.copy(os.path.join(data_files, na_file), path)
+    return path
+
+
+def _read_na_dict(path, **kwargs):
+    fin = nappy.openNAFile(path, **kwargs)
+    fin.readData()
+    na_dict = fin.getNADict()
+    fin.close()
+    return na_dict
+
+
+@pytest.mark.parametrize("na_file", _FILES)
+def test_cached_read_matches_parsed_read(na_file, tmpdir):
+    path = _copy(na_file, tmpdir)
+    cache_dir = os.path.join(str(tmpdir), "cache")
+    expected = _read_na_dict(path)
+
+    assert as_lists(_read_na_dict(path, cache_dir=cache_dir)) == as_lists(expected)
+    assert len(os.listdir(cache_dir)) == 1
+    assert as_lists(_read_na_dict(path, cache_dir=cache_dir)) == as_lists(expected)
+
+
+def test_cache_is_used_for_unchanged_file(tmpdir, monkeypatch):
+    path = _copy("1010.na", tmpdir)
+    cache_dir = os.path.join(str(tmpdir), "cache")
+    expected = _read_na_dict(path, cache_dir=cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("File was parsed instead of read from the cache.")
+
+    monkeypatch.setattr(nappy.na_file.na_file_1010.NAFile1010, "readHeader", fail)
+    monkeypatch.setattr(nappy.na_file.na_file.NAFile, "_readRecords", fail)
+
+    fin = nappy.openNAFile(path, cache_dir=cache_dir)
+    fin.readData(variables=[1], aux_variables=[])
+    assert fin.VNAME == expected["VNAME"]
+    assert fin.V[1] == expected["V"][1]
+    assert fin.V[0] == [] and fin.A == [[], []]
+
+
+def test_cache_adds_missing_variables(tmpdir):
+    path = _copy("1010.na", tmpdir)
+    cache_dir = os.path.join(str(tmpdir), "cache")
+    expected = _read_na_dict(path)
+
+    fin = nappy.openNAFile(path, cache_dir=cache_dir)
+    fin.readData(variables=[0])
+    fin.close()
+
+    # Variable 2 is not in the cache so the file is parsed and the cache entry extended
+    fin = nappy.openNAFile(path, cache_dir=cache_dir)
+    fin.readData(variables=[2])
+    assert fin.V[2] == expected["V"][2]
+    fin.close()
+
+    fin = nappy.openNAFile(path, cache_dir=cache_dir)
+    fin.readData(variables=[0, 2])
+    assert fin.V[0] == expected["V"][0] and fin.V[2] == expected["V"][2]
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_cache_entry_replaced_when_file_changes(tmpdir):
+    path = _copy("1001.na", tmpdir)
+    cache_dir = os.path.join(str(tmpdir), "cache")
+    _read_na_dict(path, cache_dir=cache_dir)
+    old_entries = os.listdir(cache_dir)
+
+    with open(path, "a") as fout:
+        fout.write("79230 1.0 2.0 3.0\n")
+
+    na_dict = _read_na_dict(path, cache_dir=cache_dir)
+    assert na_dict["X"][-1] == 79230.0
+    assert len(os.listdir(cache_dir)) == 1
+    assert os.listdir(cache_dir) != old_entries
+
+
+def test_cache_evicts_least_recently_used(tmpdir):
+    cache_dir = os.path.join(str(tmpdir), "cache")
+    cache_files = []
+
+    for (i, na_file) in enumerate(("1001.na", "1010.na", "2010.na")):
+        fin = nappy.openNAFile(_copy(na_file, tmpdir), cache_dir=cache_dir)
+        fin.readData()
+        cache_files.append(fin.data_cache.getCacheFileName(fin))
+        fin.close()
+
+    # Make the second entry the least recently used
+    for (cache_file, mtime) in zip(cache_files, (200, 100, 300)):
+        os.utime(cache_file, (mtime, mtime))
+
+    max_size = sum([os.path.getsize(cache_file) for cache_file in cache_files]) - 1
+    nappy.utils.data_cache.NADataCache(cache_dir, max_size).evict()
+
+    assert [os.path.isfile(cache_file) for cache_file in cache_files] == [True, False, True]
@@ -0,0 +1,86 @@
+"""
+test_file_like_input.py
+=======================
+
+Tests for reading NASA Ames content from open file handles and in-memory buffers.
+
+"""
+
+# Import standard library modules
+import gzip
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+import nappy
+import nappy.nc_interface.na_to_nc
+
+from .common import test_outputs, as_lists, data_items, data_path, open_na_file, read_na_file
+
+
+# The items compared when reading from file-like objects
+_ITEMS = ("NLHEAD", "X", "V", "A")
+
+
+def _content(na_file):
+    with open(data_path(na_file), "rb") as fin:
+        return fin.read()
+
+
+@pytest.mark.parametrize("na_file", ("1001.na", "1010.na", "2010.na", "2110.na", "2310.na", "4010.na"))
+def test_read_from_buffers(na_file):
+    expected = data_items(read_na_file(na_file), _ITEMS)
+    content = _content(na_file)
+
+    for buffer in (io.BytesIO(content), io.StringIO(content.decode("utf-8")),
+                   io.BytesIO(gzip.compress(content))):
+        fin = nappy.openNAFile(buffer)
+        assert fin.filename is None
+
+        fin.readData()
+        assert data_items(fin, _ITEMS) == expected
+
+
+def test_read_from_open_file():
+    expected = open_na_file("2010.na")
+
+    with open(data_path("2010.na"), "rb") as fh:
+        fin = nappy.openNAFile(fh)
+
+    # Records can still be read by offset once the handle has been closed
+    assert as_lists(fin.readRecord(3)) == as_lists(expected.readRecord(3))
+    assert fin.scanDataSection()["record_count"] == expected.scanDataSection()["record_count"]
+
+
+def test_read_from_pipe():
+    proc = subprocess.Popen([sys.executable, "-c", "import sys; sys.stdout.buffer.write(sys.stdin.buffer.read())"],
+                            stdin=open(data_path("1010.na"), "rb"), stdout=subprocess.PIPE)
+    try:
+        fin = nappy.openNAFile(proc.stdout)
+        fin.readData()
+        assert data_items(fin, _ITEMS) == data_items(read_na_file("1010.na"), _ITEMS)
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+
+def test_buffer_record_index_is_not_saved():
+    fin = nappy.openNAFile(io.BytesIO(_content("1001.na")))
+    assert len(fin.buildRecordIndex()) == len(open_na_file("1001.na").buildRecordIndex())
+
+    with pytest.raises(Exception):
+        fin.buildRecordIndex(save=True)
+
+
+def test_convert_buffer_to_nc():
+    nc_file = os.path.join(test_outputs, "1001_from_buffer.nc")
+    nappy.convertNAToNC(io.BytesIO(_content("1001.na")), nc_file=nc_file, time_warning=False)
+    assert os.path.isfile(nc_file)
+
+
+def test_convert_buffer_to_nc_needs_nc_file():
+    with pytest.raises(Exception, match="nc_file"):
+        nappy.convertNAToNC(io.BytesIO(_content("1001.na")), time_warning=False)
@@ -0,0 +1,62 @@
+"""
+test_header_scanner.py
+======================
+
+Tests for scanning the headers of many NASA Ames files with nappy.scanHeaders().
+
+"""
+
+# Import standard library modules
+import pytest
+
+import nappy
+import nappy.utils.header_scanner
+
+from .common import data_path
+
+
+_FILES = ("1001.na", "1010.na", "2010.na", "2110.na", "2160.na", "3010.na")
+
+
+@pytest.mark.parametrize("workers", (1, 2))
+def test_scan_headers_matches_open_na_file(workers):
+    records = nappy.scanHeaders([data_path(na_file) for na_file in _FILES], workers=workers)
+
+    assert [record["filename"] for record in records] == [data_path(na_file) for na_file in _FILES]
+
+    for record in records:
+        assert record["error"] is None
+
+        fin = nappy.openNAFile(record["filename"])
+        for key in nappy.utils.header_scanner.header_record_keys:
+            assert record[key] == getattr(fin, key)
+
+        fin.readData()
+        assert record["record_count"] == len(fin._getUnboundedX())
+        fin.close()
+
+
+def test_scan_header_estimates_record_count():
+    record = nappy.utils.header_scanner.scanHeader(data_path("1010.na"), sample_size=5)
+
+    assert record["record_count_exact"] is False
+    assert record["record_count"] == pytest.approx(19, abs=2)
+    assert record["data_size"] > 0
+
+
+def test_scan_header_uses_record_index():
+    fin = nappy.openNAFile(data_path("1010.na"))
+    fin.buildRecordIndex()
+    info = fin.scanDataSection(sample_size=5)
+    fin.close()
+
+    assert info["record_count"] == 19
+    assert info["record_count_exact"] is True
+
+
+def test_scan_headers_captures_errors():
+    records = nappy.scanHeaders([data_path("1001.na"), data_path("missing.na")], workers=1)
+
+    assert records[0]["error"] is None
+    assert records[1]["error"].startswith("FileNotFoundError")
+    assert "FFI" not in records[1]
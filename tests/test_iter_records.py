@@ -0,0 +1,65 @@
+"""
+test_iter_records.py
+====================
+
+Tests for streaming the data section with NAFile.iterRecords().
+
+"""
+
+# Import standard library modules
+import pytest
+
+from .common import as_lists, open_na_file
+
+
+_FFIS = (1001, 1010, 1020, 2010, 2110, 2160, 2310, 3010, 4010)
+
+
+@pytest.mark.parametrize("ffi", _FFIS)
+@pytest.mark.parametrize("chunk_size", (1, 3, 1000))
+def test_iter_records_matches_read_data(ffi, chunk_size):
+    expected = open_na_file(f"{ffi}.na")
+    expected.readData()
+
+    fin = open_na_file(f"{ffi}.na")
+    X, V, A = [], [[] for n in range(fin.NV)], [[] for a in range(fin.NAUXV or 0)]
+
+    for batch in fin.iterRecords(chunk_size=chunk_size):
+        if ffi in (2010, 3010, 4010):
+            assert batch["X"][1:] == expected.X[1:]
+            X.extend(batch["X"][0])
+        else:
+            X.extend(batch["X"])
+
+        for n in range(fin.NV):
+            V[n].extend(batch["V"][n])
+
+        for a in range(fin.NAUXV or 0):
+            A[a].extend(batch["A"][a])
+
+    if ffi in (2010, 3010, 4010):
+        assert X == expected.X[0]
+    else:
+        assert X == expected.X
+
+    assert as_lists(V) == as_lists(expected.V)
+    assert A == (expected.A or [])
+
+
+def test_iter_records_batch_sizes():
+    fin = open_na_file("1001.na")
+    sizes = [len(batch["X"]) for batch in fin.iterRecords(chunk_size=2)]
+
+    fin.readData()
+    assert sum(sizes) == len(fin.X)
+    assert sizes[0] == 2
+
+
+def test_iter_records_restores_attributes():
+    fin = open_na_file("2010.na")
+    X = fin.X
+
+    for batch in fin.iterRecords(chunk_size=2):
+        pass
+
+    assert fin.X is X
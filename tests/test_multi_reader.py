@@ -0,0 +1,52 @@
+"""
+test_multi_reader.py
+====================
+
+Tests for reading many NASA Ames files with nappy.readMany().
+
+"""
+
+# Import standard library modules
+import numpy as np
+import pytest
+
+import nappy
+
+from .common import as_lists, data_path
+
+
+_FILES = ("1001.na", "1010.na", "2010.na", "2110.na", "2310.na", "4010.na")
+
+
+@pytest.mark.parametrize("workers", (1, 3))
+def test_read_many_matches_serial_reads(workers):
+    results = nappy.readMany([data_path(na_file) for na_file in _FILES], workers=workers)
+
+    assert [result["filename"] for result in results] == [data_path(na_file) for na_file in _FILES]
+
+    for result in results:
+        assert result["error"] is None
+
+        fin = nappy.openNAFile(result["filename"])
+        fin.readData()
+        expected = fin.getNADict()
+        fin.close()
+
+        assert result["na_dict"]["X"] == expected["X"]
+        assert as_lists(result["na_dict"]["V"]) == as_lists(expected["V"])
+
+
+def test_read_many_passes_read_options():
+    results = nappy.readMany([data_path("1001.na"), data_path("1010.na")], workers=2, variables=[0], engine="numpy")
+
+    for result in results:
+        assert isinstance(result["na_dict"]["X"], np.ndarray)
+        assert result["na_dict"]["V"][1] == []
+
+
+def test_read_many_captures_errors():
+    results = nappy.readMany([data_path("missing.na"), data_path("1001.na")], workers=1)
+
+    assert results[0]["na_dict"] is None
+    assert results[0]["error"].startswith("FileNotFoundError")
+    assert results[1]["error"] is None
@@ -82,3 +82,19 @@ def test_na_file(ffi):
         fobj = nappy.openNAFile(foutname, mode="w", na_dict=na_dict)
         fobj.write()
         assert isinstance(fobj, nappy.na_file.na_file.NAFile)
+
+
+def test_get_variable_values_scales_and_masks():
+    import numpy as np
+
+    fin = nappy.openNAFile(os.path.join(data_files, "1010.na"))
+    fin.readData()
+    raw = np.array(fin.V[1])
+
+    values = fin.getVariableValues(1)
+    assert np.array_equal(np.isnan(values), raw == fin.VMISS[1])
+    assert np.allclose(values[~np.isnan(values)], raw[raw != fin.VMISS[1]] * fin.VSCAL[1])
+    assert np.array_equal(np.array(fin.V[1]), raw)
+
+    aux_values = fin.getAuxVariableValues(0, in_place=True)
+    assert fin.A[0] is aux_values
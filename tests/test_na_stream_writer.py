@@ -0,0 +1,100 @@
+"""
+test_na_stream_writer.py
+========================
+
+Tests for writing NASA Ames files record by record with NAStreamWriter.
+
+"""
+
+# Import standard library modules
+import copy
+import os
+
+import numpy as np
+import pytest
+
+import nappy
+import nappy.na_file.na_stream_writer
+
+from .common import as_lists, read_na_file
+
+
+def _batches(na_dict, size):
+    "Yields (X, V, A) for batches of up to 'size' records of 'na_dict'."
+    ffi = na_dict["FFI"]
+    X = na_dict["X"][0] if ffi in (2010, 3010, 4010) else na_dict["X"]
+    nvpm = na_dict["NVPM"] if ffi == 1020 else 1
+
+    for start in range(0, len(X), size):
+        end = start + size
+        yield (X[start:end], [v[start * nvpm:end * nvpm] for v in na_dict["V"]],
+               [a[start:end] for a in na_dict.get("A", [])])
+
+
+@pytest.mark.parametrize("na_file", ("1001.na", "1010.na", "1020.na", "2010.na", "2110.na", "2310.na", "4010.na"))
+def test_stream_matches_write(tmpdir, na_file):
+    na_dict = read_na_file(na_file).getNADict()
+    paths = [os.path.join(tmpdir.strpath, name) for name in ("full.na", "stream.na")]
+
+    fout = nappy.openNAFile(paths[0], mode="w", na_dict=copy.deepcopy(na_dict))
+    fout.write()
+    fout.close()
+
+    with nappy.openNAStreamWriter(paths[1], na_dict) as writer:
+        for (X, V, A) in _batches(na_dict, 2):
+            writer.append(X, V, A)
+
+    (full, stream) = [open(path).read() for path in paths]
+    assert stream == full
+
+
+def test_stream_sets_dx_on_close(tmpdir):
+    path = os.path.join(tmpdir.strpath, "stream.na")
+    na_dict = read_na_file("1010.na").getNADict()
+    del na_dict["DX"]
+
+    writer = nappy.openNAStreamWriter(path, na_dict)
+    for (X, V, A) in _batches(na_dict, 5):
+        writer.append(np.array(X), [np.array(v) for v in V], A)
+
+    assert writer.record_count == len(na_dict["X"])
+    writer.close()
+
+    fin = read_na_file(path)
+    assert fin.DX == [5.0]
+    assert as_lists([fin.X, fin.V, fin.A]) == as_lists([na_dict["X"], na_dict["V"], na_dict["A"]])
+
+    with pytest.raises(Exception):
+        writer.append(*next(_batches(na_dict, 1)))
+
+
+def test_stream_irregular_dx(tmpdir):
+    path = os.path.join(tmpdir.strpath, "stream.na")
+    na_dict = read_na_file("1001.na").getNADict()
+    na_dict["DX"] = [None]
+
+    with nappy.openNAStreamWriter(path, na_dict) as writer:
+        for (x, v) in zip([1, 2, 4], [[0.5, 1.5, 2], [2.5, 3.5, 4], [4.5, 5.5, 6]]):
+            writer.appendRecord(x, v)
+
+    fin = read_na_file(path)
+    assert fin.DX == [0.0]
+
+    # The DX value is padded with leading spaces to the width reserved for it
+    with open(path) as text:
+        assert text.readlines()[7] == "0".rjust(nappy.na_file.na_stream_writer.NAStreamWriter.dx_width) + "\n"
+    assert fin.X == [1.0, 2.0, 4.0]
+    assert fin.V == [[0.5, 2.5, 4.5], [1.5, 3.5, 5.5], [2.0, 4.0, 6.0]]
+
+
+def test_stream_2010_records(tmpdir):
+    path = os.path.join(tmpdir.strpath, "stream.na")
+    expected = read_na_file("2010.na")
+    na_dict = expected.getNADict()
+
+    with nappy.openNAStreamWriter(path, na_dict) as writer:
+        for m in range(len(expected.X[0])):
+            writer.appendRecord(expected.X[0][m], [v[m] for v in expected.V], [a[m] for a in expected.A])
+
+    fin = read_na_file(path)
+    assert as_lists([fin.X, fin.V, fin.A, fin.NX]) == as_lists([expected.X, expected.V, expected.A, expected.NX])
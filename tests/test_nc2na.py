@@ -123,6 +123,46 @@ def test_nc_to_na_1001_annotated():
     assert open(outfile).readlines()[0].startswith("Number of header lines;")
 
 
+def test_nc_to_na_1001_size_limit():
+    # nc2na.py -i test_outputs/1001.nc -o test_outputs/1001-from-nc-size-limit.na --size-limit=1
+    infile, _ = _get_paths(1001)
+    contents = []
+
+    for workers in (1, 2):
+        _, outfile = _get_paths(1001, label=f"size-limit-{workers}")
+
+        na = NCToNA(infile)
+        na.writeNAFiles(outfile, delimiter=DELIMITER, size_limit=1, workers=workers)
+
+        assert na.output_files_written == [f"{outfile[:-3]}-{ivol:03d}.na" for ivol in (1, 2, 3)]
+
+        for (ivol, file_name) in enumerate(na.output_files_written, 1):
+            n = openNAFile(file_name)
+            n.readData()
+            assert (n.IVOL, n.NVOL) == (ivol, 3)
+            contents.append((list(n.X), [list(v) for v in n.V]))
+
+    assert [x for (x, v) in contents[:3]] == [[79200.0], [79210.0], [79220.0]]
+    assert contents[:3] == contents[3:]
+
+
+def test_nc_to_na_1001_size_limit_compressed():
+    # nc2na.py -i test_outputs/1001.nc -o test_outputs/1001-from-nc-size-limit.na.gz --size-limit=1 --atomic
+    infile, outfile = _get_paths(1001, label="size-limit-gz", extension="na.gz")
+
+    na = NCToNA(infile)
+    na.writeNAFiles(outfile, delimiter=DELIMITER, size_limit=1, workers=1, atomic=True)
+
+    assert na.output_files_written == [f"{outfile[:-6]}-{ivol:03d}.na.gz" for ivol in (1, 2, 3)]
+
+    for (ivol, file_name) in enumerate(na.output_files_written, 1):
+        assert nappy.utils.common_utils.getCompression(file_name) == "gzip"
+
+        n = openNAFile(file_name)
+        n.readData()
+        assert (n.IVOL, n.NVOL) == (ivol, 3)
+
+
 def test_nc_to_na_1001_names_only():
     # nc2na.py -i test_outputs/1001.nc --names-only
     infile, _ = _get_paths(1001)
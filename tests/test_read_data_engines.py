@@ -0,0 +1,88 @@
+"""
+test_read_data_engines.py
+=========================
+
+Tests for the alternative data section parsers selected with readData(engine=...).
+
+"""
+
+# Import standard library modules
+import os
+
+import numpy as np
+import pytest
+
+import nappy
+import nappy.utils.list_manipulator
+
+from .common import data_files, read_na_file, open_na_file
+
+
+_NUMPY_FILES = ("1001.na", "1001_cb.na", "1001a.na", "1010.na", "1010a.na",
+                "1020.na", "1020a.na", "1020b.na")
+
+_BLOCK_FILES = ("2010.na", "2010a.na", "2010b.na", "3010.na", "4010.na")
+
+
+@pytest.mark.parametrize("na_file", _NUMPY_FILES)
+def test_numpy_engine_matches_python_engine(na_file):
+    expected = read_na_file(na_file)
+    actual = read_na_file(na_file, engine="numpy")
+
+    assert isinstance(actual.X, np.ndarray)
+    assert np.array_equal(actual.X, expected.X)
+    assert len(actual.V) == len(expected.V)
+
+    for n in range(actual.NV):
+        assert np.array_equal(actual.V[n], expected.V[n])
+
+    for a in range(actual.NAUXV or 0):
+        assert np.array_equal(actual.A[a], expected.A[a])
+
+
+@pytest.mark.parametrize("na_file", _BLOCK_FILES)
+def test_blocks_read_as_nd_arrays(na_file):
+    fin = read_na_file(na_file)
+    shape = tuple([len(fin.X[0])] + fin.NX)
+
+    for n in range(fin.NV):
+        assert isinstance(fin.V[n], np.ndarray)
+        assert fin.V[n].shape == shape
+
+    # Blocks are filled in the same order as the nested lists used to be
+    lines = open(os.path.join(data_files, na_file)).readlines()[fin.NLHEAD:]
+    items = " ".join(lines).split()
+    record_size = 1 + fin.NAUXV + fin.NV * fin.arraySize
+    block = items[1 + fin.NAUXV:1 + fin.NAUXV + fin.arraySize]
+    expected = nappy.utils.list_manipulator.recursiveListPopulator([], [float(item) for item in block], fin.NX)
+
+    assert len(items) == record_size * shape[0]
+    assert fin.V[0][0].tolist() == expected
+
+
+@pytest.mark.parametrize("na_file", _BLOCK_FILES)
+def test_numpy_engine_matches_python_engine_for_blocks(na_file):
+    expected = read_na_file(na_file)
+    actual = read_na_file(na_file, engine="numpy", variables=[expected.NV - 1])
+
+    assert np.array_equal(actual.X[0], expected.X[0])
+    assert actual.X[1:] == expected.X[1:]
+    assert np.array_equal(actual.V[-1], expected.V[-1])
+    assert all([actual.V[n] == [] for n in range(actual.NV - 1)])
+
+    for a in range(actual.NAUXV):
+        assert np.array_equal(actual.A[a], expected.A[a])
+
+
+def test_numpy_engine_not_supported():
+    fin = open_na_file("2110.na")
+
+    with pytest.raises(Exception, match="not supported for FFI 2110"):
+        fin.readData(engine="numpy")
+
+
+def test_unknown_engine():
+    fin = open_na_file("1001.na")
+
+    with pytest.raises(Exception, match="Unknown data engine"):
+        fin.readData(engine="fortran")
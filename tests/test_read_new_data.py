@@ -0,0 +1,126 @@
+"""
+test_read_new_data.py
+=====================
+
+Tests for reading the records appended to a growing file with readNewData().
+
+"""
+
+# Import standard library modules
+import os
+
+import pytest
+
+import nappy
+
+from .common import data_files, data_items, open_na_file, read_na_file
+
+
+_FILES = ("1001.na", "1010.na", "2010.na", "2110.na", "2160.na", "2310.na", "4010.na")
+_ITEMS = ("X", "V", "A", "NX", "DX")
+
+
+def _split_records(na_file):
+    "Returns the header and the text of each record of 'na_file' as bytes."
+    path = os.path.join(data_files, na_file)
+    offsets = list(nappy.openNAFile(path).buildRecordIndex().offsets)
+
+    with open(path, "rb") as fin:
+        content = fin.read()
+
+    header = content[:offsets[0]]
+    records = [content[start:end] for (start, end) in zip(offsets, offsets[1:] + [len(content)])]
+    return header, records
+
+
+@pytest.mark.parametrize("na_file", _FILES)
+def test_read_new_data_matches_full_read(tmpdir, na_file):
+    header, records = _split_records(na_file)
+    path = os.path.join(str(tmpdir), na_file)
+
+    with open(path, "wb") as fout:
+        fout.write(header + records[0])
+
+    fin = read_na_file(path)
+    assert len(fin._getUnboundedX()) == 1
+
+    # Add the rest of the records with the last one split part way through a line
+    rest = b"".join(records[1:])
+    with open(path, "ab") as fout:
+        fout.write(rest[:-5])
+
+    assert fin.readNewData() == len(records) - 2
+
+    complete_path = os.path.join(str(tmpdir), "complete.na")
+    with open(complete_path, "wb") as fout:
+        fout.write(header + b"".join(records[:-1]))
+
+    assert data_items(fin, _ITEMS) == data_items(read_na_file(complete_path), _ITEMS)
+
+    with open(path, "ab") as fout:
+        fout.write(rest[-5:])
+
+    assert fin.readNewData() == 1
+    assert fin.readNewData() == 0
+    assert data_items(fin, _ITEMS) == data_items(read_na_file(path), _ITEMS)
+
+
+def test_read_new_data_keeps_selection(tmpdir):
+    header, records = _split_records("1010.na")
+    path = os.path.join(str(tmpdir), "1010.na")
+
+    with open(path, "wb") as fout:
+        fout.write(header + b"".join(records[:3]))
+
+    fin = read_na_file(path, variables=[1], aux_variables=[])
+
+    with open(path, "ab") as fout:
+        fout.write(b"".join(records[3:]))
+
+    fin.readRecord(0, variables=[0])
+    assert fin.readNewData() == len(records) - 3
+
+    expected = read_na_file(path)
+    assert fin.X == expected.X
+    assert fin.V[1] == expected.V[1]
+    assert fin.V[0] == [] and fin.A == [[], []]
+
+
+def test_read_new_data_without_previous_read():
+    fin = open_na_file("1001.na")
+    expected = read_na_file("1001.na")
+
+    assert fin.readNewData() == len(expected.X)
+    assert fin.X == expected.X and fin.V == expected.V
+    assert fin.readNewData() == 0
+
+
+@pytest.mark.parametrize("engine", ("python", "numpy"))
+def test_read_new_data_after_line_without_ending(tmpdir, engine):
+    header, records = _split_records("1010.na")
+    path = os.path.join(str(tmpdir), "1010.na")
+
+    # The last line of the first record has no line ending when the data are first read
+    with open(path, "wb") as fout:
+        fout.write(header + records[0].rstrip(b"\r\n"))
+
+    fin = read_na_file(path, engine=engine)
+    assert len(fin.X) == 1
+
+    with open(path, "ab") as fout:
+        fout.write(b"\n" + b"".join(records[1:]))
+
+    assert fin.readNewData() == len(records) - 1
+    assert data_items(fin, _ITEMS) == data_items(read_na_file(path), _ITEMS)
+
+    # A line that is extended after it was read cannot be added to
+    with open(path, "ab") as fout:
+        fout.write(records[0].rstrip(b"\r\n"))
+
+    fin = read_na_file(path, engine=engine)
+    with open(path, "ab") as fout:
+        fout.write(b"0\n")
+
+    with pytest.raises(Exception):
+        fin.readNewData()
+    assert len(fin.X) == len(records) + 1
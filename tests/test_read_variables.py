@@ -0,0 +1,110 @@
+"""
+test_read_variables.py
+======================
+
+Tests for reading a subset of the variables with readData(variables=..., aux_variables=...).
+
+"""
+
+# Import standard library modules
+import os
+
+import numpy as np
+import pytest
+
+from .common import data_files, as_lists, read_na_file, open_na_file
+
+
+_ALL_FILES = ("1001.na", "1010.na", "1020.na", "2010.na", "2110.na",
+              "2160.na", "2310.na", "3010.na", "4010.na")
+
+
+@pytest.mark.parametrize("na_file", _ALL_FILES)
+def test_selected_variables_match_fullread_na_file(na_file):
+    expected = read_na_file(na_file)
+    last_var = expected.NV - 1
+    last_avar = (expected.NAUXV or 0) - 1
+    aux_variables = [last_avar] if last_avar >= 0 else []
+
+    actual = read_na_file(na_file, variables=[last_var], aux_variables=aux_variables)
+
+    assert actual.X == expected.X
+    assert as_lists(actual.V[last_var]) == as_lists(expected.V[last_var])
+
+    for n in range(last_var):
+        assert actual.V[n] == []
+
+    if last_avar >= 0:
+        assert actual.A[last_avar] == expected.A[last_avar]
+
+        for a in range(last_avar):
+            assert actual.A[a] == []
+
+
+def test_select_variables_by_name():
+    expected = read_na_file("1010.na")
+    actual = read_na_file("1010.na", variables=["Ozone concentration (cm-3)"],
+                   aux_variables=["Air concentration (cm-3)"])
+
+    assert actual.V[1] == expected.V[1]
+    assert actual.A[1] == expected.A[1]
+    assert actual.V[0] == actual.V[2] == actual.V[3] == actual.A[0] == []
+
+
+def test_select_no_aux_variables_keeps_nx():
+    expected = read_na_file("2110.na")
+    actual = read_na_file("2110.na", aux_variables=[])
+
+    assert actual.NX == expected.NX
+    assert actual.X == expected.X
+    assert actual.A == [[], []]
+
+
+@pytest.mark.parametrize("na_file", ("1001.na", "1010.na", "1020.na"))
+def test_numpy_engine_selected_variables(na_file):
+    expected = read_na_file(na_file, engine="numpy")
+    actual = read_na_file(na_file, engine="numpy", variables=[1], aux_variables=[0] if expected.NAUXV else None)
+
+    assert np.array_equal(actual.X, expected.X)
+    assert np.array_equal(actual.V[1], expected.V[1])
+    assert actual.V[0] == []
+
+    if expected.NAUXV:
+        assert np.array_equal(actual.A[0], expected.A[0])
+        assert actual.A[1] == []
+
+
+def test_iter_records_selected_variables():
+    fin = open_na_file("1001.na")
+    batches = list(fin.iterRecords(variables=[2]))
+
+    assert batches[0]["V"][0] == []
+    assert batches[0]["V"][2] == read_na_file("1001.na").V[2]
+
+
+def test_unknown_variable_name_raises():
+    fin = open_na_file("1001.na")
+
+    with pytest.raises(Exception, match="Variable name not known"):
+        fin.readData(variables=["not a variable"])
+
+    with pytest.raises(Exception, match="Variable number out of range"):
+        fin.readData(variables=[3])
+
+
+def test_na_to_xarray_reads_selected_variables():
+    import nappy.nc_interface.na_to_xarray
+
+    fin = open_na_file("1010.na")
+    convertor = nappy.nc_interface.na_to_xarray.NADictToXarrayObjects(
+        fin, variables=["Ozone concentration (cm-3)"], aux_variables=["Pressure (hPa)", "Not in file"])
+    (xr_vars, xr_aux_vars, global_attributes) = convertor.convert()
+
+    assert fin.V[0] == [] and fin.A[1] == []
+    assert len(xr_vars) == 1 and len(xr_aux_vars) == 1
+    expected = np.array(fin.V[1]) * float(fin.VSCAL[1])
+    expected[np.array(fin.V[1]) == fin.VMISS[1]] = np.nan
+    assert np.allclose(xr_vars[0].values, expected, equal_nan=True)
+
+    var = nappy.getXarrayVariableFromNA(os.path.join(data_files, "1010.na"), 1)
+    assert np.array_equal(var.values, xr_vars[0].values, equal_nan=True)
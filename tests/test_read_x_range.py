@@ -0,0 +1,72 @@
+"""
+test_read_x_range.py
+====================
+
+Tests for reading the records inside a range of the unbounded independent variable
+with readData(x_range=...).
+
+"""
+
+# Import standard library modules
+import os
+
+import numpy as np
+import pytest
+import xarray as xr
+
+import nappy
+import nappy.na_file.record_index
+
+from .common import data_files, test_outputs, as_lists, open_na_file
+
+
+@pytest.mark.parametrize("na_file, x_range, records", [
+    ("1001.na", (79210, 79220), (1, 3)),
+    ("1010.na", (22, 52), (3, 9)),
+    ("1010.na", (52, 22), (3, 9)),
+    ("2010.na", (20, 20), (1, 2)),
+    ("2110.na", (0, 35), (0, 4)),
+    ("2310.na", (35, 45), (4, 4)),
+    ("1010.na", (500, 600), (19, 19)),
+])
+@pytest.mark.parametrize("use_index", (False, True))
+def test_x_range_matches_records(na_file, x_range, records, use_index):
+    fin = open_na_file(na_file)
+    if use_index:
+        fin.buildRecordIndex()
+
+    expected = fin.readRecords(*records)
+    fin.readData(x_range=x_range)
+
+    assert fin.X == expected["X"]
+    assert as_lists(fin.V) == as_lists(expected["V"])
+    assert fin.A == expected["A"]
+
+
+@pytest.mark.parametrize("use_index", (False, True))
+def test_x_range_numpy_engine(use_index):
+    fin = open_na_file("1010.na")
+    if use_index:
+        fin.buildRecordIndex()
+
+    fin.readData(engine="numpy", x_range=(20, 30), variables=[0])
+
+    assert np.array_equal(fin.X, [20.0, 25.0, 30.0])
+    assert np.array_equal(fin.V[0], open_na_file("1010.na").readRecords(2, 5)["V"][0])
+
+
+def test_find_record_range_descending():
+    index = nappy.na_file.record_index.RecordIndex(offsets=[0, 10, 20, 30], x_values=[40, 30, 20, 10])
+
+    assert index.findRecordRange((15, 30)) == (1, 3)
+    assert index.findRecordRange((50, 60)) == (0, 0)
+    assert index.findRecordRange((0, 5)) == (4, 4)
+
+
+def test_convert_na_to_nc_x_range():
+    output_file = os.path.join(test_outputs, "test_x_range_1010.nc")
+    nappy.convertNAToNC(os.path.join(data_files, "1010.na"), output_file, x_range=(20, 30))
+
+    ds = xr.open_dataset(output_file)
+    assert ds[list(ds.dims)[0]].values.tolist() == [20.0, 25.0, 30.0]
+    ds.close()
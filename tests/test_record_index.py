@@ -0,0 +1,115 @@
+"""
+test_record_index.py
+====================
+
+Tests for random access to records through the record index.
+
+"""
+
+# Import standard library modules
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+import nappy
+
+from .common import data_files, as_lists, open_na_file
+
+
+_FFIS = (1001, 1010, 1020, 2010, 2110, 2160, 2310, 3010, 4010)
+
+
+@pytest.mark.parametrize("ffi", _FFIS)
+@pytest.mark.parametrize("use_mmap", (False, True))
+def test_read_record_matches_iter_records(ffi, use_mmap):
+    fin = open_na_file(f"{ffi}.na", use_mmap=use_mmap)
+    batches = list(fin.iterRecords(chunk_size=1))
+
+    index = fin.buildRecordIndex()
+    assert len(index) == len(batches)
+
+    for m in reversed(range(len(batches))):
+        assert as_lists(fin.readRecord(m)) == as_lists(batches[m])
+
+
+@pytest.mark.parametrize("ffi", (1001, 2010, 2110))
+def test_read_records_range(ffi):
+    expected = open_na_file(f"{ffi}.na")
+    expected.readData()
+
+    fin = open_na_file(f"{ffi}.na", use_mmap=True)
+    nrecords = len(fin.buildRecordIndex())
+    records = fin.readRecords(1, nrecords)
+
+    if ffi == 2010:
+        assert records["X"][0] == expected.X[0][1:]
+        assert as_lists(records["V"]) == as_lists([v[1:] for v in expected.V])
+    else:
+        assert records["X"] == expected.X[1:]
+        assert as_lists(records["V"]) == as_lists([v[1:] for v in expected.V])
+
+
+def test_record_index_offsets():
+    infile = os.path.join(data_files, "1001.na")
+    fin = nappy.openNAFile(infile)
+    index = fin.buildRecordIndex()
+
+    with open(infile, "rb") as fh:
+        content = fh.read()
+
+    for m in range(len(index)):
+        line = content[index.getOffset(m):].split(b"\n")[0].split()
+        assert float(line[0]) == index.x_values[m]
+
+    assert index.getOffset(len(index)) == len(content)
+
+
+def test_read_records_out_of_range():
+    fin = open_na_file("1001.na")
+
+    with pytest.raises(Exception, match="outside"):
+        fin.readRecords(0, 1000)
+
+
+@pytest.mark.parametrize("ffi", (1001, 2160))
+def test_record_index_sidecar(ffi, tmpdir):
+    infile = os.path.join(tmpdir.strpath, f"{ffi}.na")
+    shutil.copy(os.path.join(data_files, f"{ffi}.na"), infile)
+
+    fin = nappy.openNAFile(infile)
+    assert fin.record_index is None
+    index = fin.buildRecordIndex(save=True)
+    assert os.path.isfile(infile + ".naidx")
+
+    # Re-opening loads the saved index
+    fin = nappy.openNAFile(infile)
+    assert fin.record_index is not None
+    assert list(fin.record_index.offsets) == list(index.offsets)
+    assert fin.record_index.x_values == index.x_values
+    assert fin.record_index.end_offset == index.end_offset
+    assert as_lists(fin.readRecord(1)) == as_lists(nappy.openNAFile(infile).readRecord(1))
+
+    # Changing the file invalidates the index
+    with open(infile, "a") as fout:
+        fout.write("\n")
+
+    fin = nappy.openNAFile(infile)
+    assert fin.record_index is None
+
+
+def test_record_index_sidecar_from_path(tmpdir):
+    infile = Path(tmpdir.strpath) / "1001.na"
+    shutil.copy(os.path.join(data_files, "1001.na"), infile)
+
+    fin = nappy.openNAFile(infile)
+    assert fin.filename == str(infile)
+    index = fin.buildRecordIndex(save=True)
+    assert os.path.isfile(str(infile) + ".naidx")
+
+    fin = nappy.openNAFile(infile)
+    assert list(fin.record_index.offsets) == list(index.offsets)
+
+    fin.readData()
+    assert as_lists(fin.V) == as_lists(nappy.openNAFile(str(infile)).readRecords(0, len(index))["V"])
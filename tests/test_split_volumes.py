@@ -0,0 +1,131 @@
+"""
+test_split_volumes.py
+=====================
+
+Tests for splitting NASA Ames outputs into volumes along the unbounded
+independent variable by number of records or by size.
+
+"""
+
+# Import standard library modules
+import concurrent.futures
+import os
+
+import numpy as np
+import pytest
+import xarray as xr
+
+import nappy
+from nappy.nc_interface.nc_to_na import NCToNA
+from nappy.nc_interface.xarray_to_na import XarrayDatasetToNA, _getNAFileSize, _getNAFileSizes
+from nappy.utils.common_utils import getNADictRecordCount, sliceNADictRecords
+
+from .common import cached_outputs, test_outputs, as_lists, read_na_file
+
+
+def _records(fin):
+    "Returns the values of each record of 'fin' as lists, one list per record."
+    na_dict = fin.getNADict()
+    return [as_lists([sliceNADictRecords(na_dict, m, m + 1)[key] for key in ("X", "V", "A") if key in na_dict])
+            for m in range(getNADictRecordCount(na_dict))]
+
+
+@pytest.mark.parametrize("na_file", ("1001.na", "1010.na", "1020.na", "2010.na", "2110.na",
+                                     "2160.na", "2310.na", "3010.na", "4010.na"))
+def test_sliceNADictRecords(tmpdir, na_file):
+    expected = read_na_file(na_file)
+    na_dict = expected.getNADict()
+    nrecords = getNADictRecordCount(na_dict)
+    records = []
+
+    for (ivol, start) in enumerate(range(0, nrecords, 2), 1):
+        path = os.path.join(tmpdir.strpath, f"{ivol}.na")
+        fout = nappy.openNAFile(path, mode="w", na_dict=sliceNADictRecords(na_dict, start, start + 2, ivol, 9))
+        fout.write()
+        fout.close()
+
+        fin = read_na_file(path)
+        assert (fin.IVOL, fin.NVOL) == (ivol, 9)
+        records.extend(_records(fin))
+
+    assert records == _records(expected)
+
+
+@pytest.mark.parametrize("na_file", ("1001.na", "1010.na", "2010.na", "2110.na", "2160.na", "2310.na", "3010.na"))
+def test_get_na_file_sizes_in_blocks(na_file):
+    na_dict = read_na_file(na_file).getNADict()
+    (header_bytes, record_sizes) = _getNAFileSizes(na_dict, {}, block_size=2)
+
+    assert (header_bytes, record_sizes) == _getNAFileSizes(na_dict, {})
+    assert len(record_sizes) == getNADictRecordCount(na_dict)
+    assert sum(record_sizes) == _getNAFileSize(na_dict, {"no_header": True})
+
+
+@pytest.mark.parametrize("ffi_in, ffi_out", [(1001, None), (1010, None), (2010, None), (2010, 2110),
+                                             (2010, 2310), (3010, None)])
+def test_nc_to_na_max_records_and_bytes(ffi_in, ffi_out):
+    infile = os.path.join(cached_outputs, f"{ffi_in}.nc")
+    outfile = os.path.join(test_outputs, f"{ffi_in}-{ffi_out}-split.na")
+
+    na = NCToNA(infile, requested_ffi=ffi_out)
+    na.writeNAFiles(outfile, workers=1)
+    (whole,) = [read_na_file(path) for path in na.output_files_written]
+    nrecords = getNADictRecordCount(whole.getNADict())
+
+    max_bytes = os.path.getsize(na.output_files_written[0]) - 1
+    for (kwargs, nvol) in (({"max_records": 2}, -(-nrecords // 2)), ({"max_bytes": max_bytes}, None)):
+        na = NCToNA(infile, requested_ffi=ffi_out)
+        na.writeNAFiles(outfile, workers=1, **kwargs)
+
+        volumes = [read_na_file(path) for path in na.output_files_written]
+        assert [(fin.IVOL, fin.NVOL) for fin in volumes] == [(ivol, len(volumes)) for ivol in range(1, len(volumes) + 1)]
+        assert sum([_records(fin) for fin in volumes], []) == _records(whole)
+
+        if nvol is not None:
+            assert len(volumes) == nvol
+        else:
+            assert len(volumes) > 1
+            assert max([os.path.getsize(path) for path in na.output_files_written]) <= max_bytes
+
+
+def test_nc_to_na_split_in_this_process_by_default(monkeypatch):
+    # Worker processes are opt-in, so no process pool is started by default
+    def no_pool(*args, **kwargs):
+        raise AssertionError("a process pool was started")
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", no_pool)
+    infile = os.path.join(cached_outputs, "1001.nc")
+
+    na = NCToNA(infile)
+    na.writeNAFiles(os.path.join(test_outputs, "1001-default-split.na"), max_records=2)
+    volumes = [read_na_file(path) for path in na.output_files_written]
+    assert len(volumes) > 1
+    assert [(fin.IVOL, fin.NVOL) for fin in volumes] == [(ivol, len(volumes)) for ivol in range(1, len(volumes) + 1)]
+
+
+def test_nc_to_na_max_bytes_too_small():
+    na = NCToNA(os.path.join(cached_outputs, "1001.nc"))
+
+    with pytest.raises(Exception):
+        na.writeNAFiles(os.path.join(test_outputs, "1001-too-small.na"), max_bytes=100)
+
+
+def test_nc_to_na_max_bytes_long_records_between_samples():
+    # Long values in records that a sample of every tenth record would miss
+    values = np.zeros(1000)
+    values[500:700] = 1.23456789e-300
+    values[500:700:10] = 0
+
+    time = xr.DataArray(np.arange(1000.), dims="time", name="time",
+                        attrs={"units": "seconds since 2000-01-01 00:00:00"})
+    ds = xr.Dataset({"temp": xr.DataArray(values, coords={"time": time}, dims="time", attrs={"units": "K"})})
+
+    na = XarrayDatasetToNA(ds)
+    na.writeNAFiles(os.path.join(test_outputs, "1001-long-records-split.na"), workers=1, max_bytes=5000)
+
+    assert len(na.output_files_written) > 1
+    assert max([os.path.getsize(path) for path in na.output_files_written]) <= 5000
+
+    volumes = [read_na_file(path) for path in na.output_files_written]
+    assert sum([list(fin.V[0]) for fin in volumes], []) == values.tolist()
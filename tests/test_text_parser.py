@@ -0,0 +1,40 @@
+"""
+test_text_parser.py
+===================
+
+Tests for the text_parser.py module.
+
+"""
+
+import pytest
+
+from nappy.utils.text_parser import LineCursor, readItemsFromUnknownLines
+
+
+_LINES = ["1 2\n", "3\n", "4 5 6\n", "7 8 9 10\n"]
+
+
+def test_readItemsFromUnknownLines_list():
+    items, rest = readItemsFromUnknownLines(_LINES, 3, int)
+    assert items == [1, 2, 3]
+    assert rest == _LINES[2:]
+
+
+def test_readItemsFromUnknownLines_cursor():
+    cursor = LineCursor(_LINES)
+
+    assert readItemsFromUnknownLines(cursor, 3, float) == [1.0, 2.0, 3.0]
+    assert readItemsFromUnknownLines(cursor, 3, float) == [4.0, 5.0, 6.0]
+    assert len(cursor) == 1
+    assert cursor.readlines(1) == ["7 8 9 10\n"]
+    assert len(cursor) == 0
+
+
+def test_readItemsFromUnknownLines_bad_split():
+    with pytest.raises(Exception, match="Could not split"):
+        readItemsFromUnknownLines(LineCursor(_LINES), 4)
+
+
+def test_readItemsFromUnknownLines_end_of_input():
+    with pytest.raises(EOFError):
+        readItemsFromUnknownLines(LineCursor(_LINES), 20)
@@ -0,0 +1,135 @@
+"""
+test_text_writer.py
+===================
+
+Tests for the text_writer.py module and the block writers that use it.
+
+"""
+
+# Import standard library modules
+import copy
+import os
+import re
+
+import numpy as np
+import pytest
+
+import nappy
+from nappy.utils.text_writer import formatRecords, formatRecordValues, formatValues, getRowBlocks
+
+from .common import data_files, as_lists
+
+
+def _old_line(values, fmt, prefix=""):
+    "Formats a line as the writers did one value at a time."
+    return prefix + "".join([fmt % value for value in values]).rstrip(" ,") + "\n"
+
+
+@pytest.mark.parametrize("float_format, delimiter", [("%.10g", "    "), ("%.6f", ","), ("%g", "\t"),
+                                                     ("%-10.3f", ","), ("%5.1f", "\t ")])
+def test_formatRecords_matches_single_values(float_format, delimiter):
+    columns = [[1, 2.5, -3.25], [1e-7, 0.0, 12345.678], [-999, 4, 5]]
+    fmt = float_format + delimiter
+
+    for prefix in ("", "Data%s" % delimiter):
+        expected = "".join([_old_line(row[:1], fmt, prefix) + _old_line(row[1:], fmt, prefix)
+                            for row in zip(*columns)])
+        assert formatRecords(columns, [fmt, fmt * 2], delimiter, prefix) == expected
+
+
+def test_formatRecordValues():
+    text = formatRecordValues([1, 2, 3, 4, 5, 6], 2, ["%g,", "%g,%g,"], ",", prefix="Data,")
+    assert text == "Data,1\nData,2,3\nData,4\nData,5,6\n"
+
+
+def test_getRowBlocks():
+    blocks = list(getRowBlocks([list(range(5)), list(range(5, 10))], block_size=2))
+    assert blocks == [[[0, 1], [5, 6]], [[2, 3], [7, 8]], [[4], [9]]]
+    assert list(getRowBlocks([])) == []
+
+
+@pytest.mark.parametrize("na_file", ("1001.na", "1010.na"))
+def test_write_numpy_arrays(tmpdir, na_file):
+    fin = nappy.openNAFile(os.path.join(data_files, na_file))
+    fin.readData()
+    na_dict = fin.getNADict()
+
+    array_dict = copy.deepcopy(na_dict)
+    array_dict["X"] = np.array(array_dict["X"])
+    for key in ("V", "A"):
+        array_dict[key] = [np.array(values) for values in array_dict.get(key, [])]
+
+    paths = [os.path.join(tmpdir.strpath, name) for name in ("lists.na", "arrays.na")]
+    for (path, this_dict) in zip(paths, (na_dict, array_dict)):
+        fout = nappy.openNAFile(path, mode="w", na_dict=this_dict)
+        fout.write()
+        fout.close()
+
+    (lists, arrays) = [open(path).read() for path in paths]
+    assert lists == arrays
+
+
+def test_formatValues():
+    assert formatValues([1, 2.5, -3.25], "%.3f", ",") == "1.000,2.500,-3.250\n"
+    assert formatValues(np.array([0.1, 12.0, 1e-07, -40.0]), "shortest", " ") == "0.1 12 1e-07 -40\n"
+
+
+@pytest.mark.parametrize("na_file", ("1001.na", "1010.na", "2010.na", "2110.na"))
+def test_write_shortest_reads_back_exactly(tmpdir, na_file):
+    fin = nappy.openNAFile(os.path.join(data_files, na_file))
+    fin.readData()
+
+    path = os.path.join(tmpdir.strpath, na_file)
+    fout = nappy.openNAFile(path, mode="w", na_dict=fin.getNADict())
+    fout.write(float_format="shortest")
+    fout.close()
+
+    result = nappy.openNAFile(path)
+    result.readData()
+    assert as_lists([result.X, result.V, result.A]) == as_lists([fin.X, fin.V, fin.A])
+
+
+@pytest.mark.parametrize("na_file", ("2010.na", "3010.na", "4010.na"))
+def test_write_shortest_nd_without_zero_fractions(tmpdir, na_file):
+    fin = nappy.openNAFile(os.path.join(data_files, na_file))
+    fin.readData()
+
+    path = os.path.join(tmpdir.strpath, na_file)
+    fout = nappy.openNAFile(path, mode="w", na_dict=fin.getNADict())
+    fout.write(float_format="shortest", annotation=True)
+    fout.close()
+
+    # The values of the bounded independent variables in the header and the data section
+    with open(path) as text:
+        lines = [line for line in text if line.startswith(("Values of coordinate variable", "Data section"))]
+
+    assert len([line for line in lines if line.startswith("Values")]) == fin.NIV - 1
+    assert [line for line in lines if re.search(r"\d\.0\b", line)] == []
+
+
+@pytest.mark.parametrize("na_file", ("2010.na", "4010.na"))
+def test_write_nd_blocks(tmpdir, na_file):
+    fin = nappy.openNAFile(os.path.join(data_files, na_file))
+    fin.readData()
+    na_dict = fin.getNADict(as_lists=False)
+    header_items = copy.deepcopy([na_dict[key] for key in ("DX", "NX", "NXDEF", "XNAME")])
+
+    list_dict = dict(na_dict, V=[v.tolist() for v in na_dict["V"]])
+    paths = [os.path.join(tmpdir.strpath, name) for name in ("arrays.na", "lists.na", "again.na", "data.na")]
+
+    for (path, this_dict, kwargs) in zip(paths, (na_dict, list_dict, na_dict, na_dict),
+                                         ({}, {}, {}, {"no_header": True})):
+        fout = nappy.openNAFile(path, mode="w", na_dict=this_dict)
+        fout.write(**kwargs)
+        fout.close()
+
+    # Writing does not change the header items in the na_dict
+    assert [na_dict[key] for key in ("DX", "NX", "NXDEF", "XNAME")] == header_items
+
+    (arrays, lists, again, data) = [open(path).read() for path in paths]
+    assert arrays == lists == again
+    assert arrays.endswith(data) and arrays.count("\n") == data.count("\n") + fin.NLHEAD
+
+    result = nappy.openNAFile(paths[0])
+    result.readData()
+    assert as_lists([result.X, result.V, result.A]) == as_lists([fin.X, fin.V, fin.A])
@@ -0,0 +1,73 @@
+"""
+test_xarray_backend.py
+======================
+
+Tests for opening NASA Ames files with xr.open_dataset(engine="nasaames").
+
+"""
+
+# Import standard library modules
+import numpy as np
+import pytest
+import xarray as xr
+
+import nappy.nc_interface.dask_arrays as dask_arrays
+from nappy.nc_interface.na_to_xarray import NADictToXarrayObjects
+from nappy.nc_interface.xarray_backend import NASAAmesBackendEntrypoint
+
+from .common import data_path, open_na_file
+
+
+def _open(na_file, **kwargs):
+    return xr.open_dataset(data_path(na_file), engine=NASAAmesBackendEntrypoint, **kwargs)
+
+
+@pytest.fixture
+def chunk_reads(monkeypatch):
+    "Records the (var_number, nrecords) of each read made by the backend arrays."
+    reads = []
+    read_chunk = dask_arrays.readChunk
+
+    def recordingReadChunk(filename, ignore_header_lines, offset, nrecords, var_number, is_aux=False):
+        reads.append((var_number, nrecords))
+        return read_chunk(filename, ignore_header_lines, offset, nrecords, var_number, is_aux)
+
+    monkeypatch.setattr(dask_arrays, "readChunk", recordingReadChunk)
+    return reads
+
+
+@pytest.mark.parametrize("na_file", ("1001.na", "1010.na", "2010.na", "4010.na"))
+def test_open_dataset_matches_converter(na_file):
+    convertor = NADictToXarrayObjects(open_na_file(na_file), time_warning=False)
+    (xr_vars, xr_aux_vars, global_attributes) = convertor.convert()
+
+    ds = _open(na_file)
+    assert sorted(ds.data_vars) == sorted([var.name for var in xr_vars + xr_aux_vars])
+
+    for var in xr_vars + xr_aux_vars:
+        assert np.array_equal(ds[var.name].values, var.values, equal_nan=True)
+        assert np.array_equal(ds[var.name][::-2].values, var[::-2].values, equal_nan=True)
+        assert np.array_equal(ds[var.name][1].values, var[1].values, equal_nan=True)
+
+
+def test_open_dataset_is_lazy(chunk_reads):
+    ds = _open("1010.na", drop_variables=["ozone_concentration"])
+    assert chunk_reads == []
+    assert "ozone_concentration" not in ds
+
+    values = ds["air_concentration"][2:5].values
+    assert len(values) == 3
+    assert [nrecords for (var_number, nrecords) in chunk_reads] == [3]
+
+
+def test_open_dataset_x_range():
+    ds = _open("1010.na", x_range=(52, 22))
+    assert ds["altitude"].values.tolist() == [25.0, 30.0, 35.0, 40.0, 45.0, 50.0]
+    assert ds["air_concentration"].shape == (6,)
+
+
+def test_guess_can_open():
+    backend = NASAAmesBackendEntrypoint()
+    assert backend.guess_can_open(data_path("1001.na"))
+    assert not backend.guess_can_open("file.nc")
+    assert not backend.guess_can_open(object())